@@ -0,0 +1,5 @@
+"""Benchmarks of the fault tree generator.
+
+The benchmarks are standalone scripts run as modules, for example,
+python -m benchmarks.generator_scaling -o results.json
+"""
@@ -0,0 +1,223 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Calibration of the dry-run planner of the generator.
+
+The peak memory and the generation time are measured
+for every combination of the number of basic events
+and the average number of gate arguments
+against the number of nodes predicted by the planner,
+so the errors of the predicted shape are calibrated away as well.
+The edges are not fitted separately
+since their number stays close to the number of nodes in any fault tree.
+
+The peak memory (traced Python allocations of the memory benchmark)
+is fitted per node over the smallest RSS of the fresh interpreter.
+The generation time grows slightly faster than the number of nodes,
+so it is fitted with a power law on the log-log scale.
+The writing time per byte comes from the profile of the XML output.
+
+The resulting JSON is the --plan-calibration of the generator
+and the source of the defaults in generator.planner.
+"""
+
+import json
+import math
+import sys
+
+import argparse as ap
+
+from benchmarks import memory_usage
+from generator import fault_tree_generator
+from generator import planner
+from generator.profiler import Profile
+
+
+def _discard(*args):
+    """Prints nothing."""
+    del args
+
+
+def fit_per_node(samples):
+    """Fits the values proportional to the number of nodes.
+
+    Args:
+        samples: The list of (nodes, value) pairs.
+
+    Returns:
+        The least squares value per node.
+    """
+    return (sum(n * y for n, y in samples) /
+            sum(n * n for n, _ in samples))
+
+
+def fit_power_law(samples):
+    """Fits the values to a power of the number of nodes.
+
+    Args:
+        samples: The list of (nodes, value) pairs.
+
+    Returns:
+        The coefficient and the exponent of the power law
+        (linear if the number of nodes does not vary).
+    """
+    log_nodes = [math.log(n) for n, _ in samples]
+    log_values = [math.log(y) for _, y in samples]
+    mean_node = sum(log_nodes) / len(samples)
+    mean_value = sum(log_values) / len(samples)
+    variance = sum((x - mean_node)**2 for x in log_nodes)
+    if variance < 1e-6:
+        return fit_per_node(samples), 1
+    exponent = sum((x - mean_node) * (y - mean_value)
+                   for x, y in zip(log_nodes, log_values)) / variance
+    return math.exp(mean_value - exponent * mean_node), exponent
+
+
+def get_num_nodes(options):
+    """Predicts the number of nodes for the generator options."""
+    factors = fault_tree_generator.setup_factors(
+        fault_tree_generator.manage_cmd_args(options))
+    shape = planner.get_shape(factors)
+    return shape["num_gate"] + shape["num_basic"] + shape["num_house"]
+
+
+def time_run(options, repeat):
+    """Times the generation and the XML output.
+
+    Args:
+        options: The generator command-line options.
+        repeat: The number of timed runs.
+
+    Returns:
+        The best generation time, the best writing time per byte.
+    """
+    args = fault_tree_generator.manage_cmd_args(options)
+    factors = fault_tree_generator.setup_factors(args)
+    generation = []
+    writing = []
+    for _ in range(repeat):
+        profile = Profile()
+        fault_tree_generator.write_fault_tree(args, factors, _discard, profile)
+        generation.append(profile.phases["generation"]["wall"])
+        writing.append(profile.phases["writing"]["wall"] /
+                       profile.counters["bytes_written"])
+    return min(generation), min(writing)
+
+
+def calibrate(sizes, num_args, compact=False, repeat=3, log=None):
+    """Measures the calibration constants of the planner.
+
+    Args:
+        sizes: The numbers of basic events.
+        num_args: The average numbers of gate arguments.
+        compact: Calibrate the compact graph core.
+        repeat: The number of timed runs per setup.
+        log: The optional printer of the progress.
+
+    Returns:
+        The calibration constants of the fault tree model.
+    """
+    extra_options = ["--compact"] if compact else []
+    memory = []
+    base_bytes = []
+    times = []
+    writing = []
+    for report in memory_usage.run_benchmarks(["generator"], sizes, num_args,
+                                              extra_options):
+        nodes = get_num_nodes(report["options"])
+        peak = max(x["peak_traced"] for x in report["phases"].values())
+        memory.append((nodes, peak))
+        base_bytes.append(report["baseline_rss"])
+        generation, per_byte = time_run(report["options"], repeat)
+        times.append((nodes, generation))
+        writing.append(per_byte)
+        if log:
+            log(" ".join(report["options"]), ": ", peak, " B, ", generation,
+                " s")
+    time_coefficient, time_exponent = fit_power_law(times)
+    return {
+        "base_bytes": min(base_bytes),
+        "bytes_per_node": fit_per_node(memory),
+        "time_coefficient": time_coefficient,
+        "time_exponent": time_exponent,
+        "seconds_per_byte": min(writing)
+    }
+
+
+def manage_cmd_args(argv=None):
+    """Manages command-line description and arguments.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+
+    Returns:
+        Arguments that are collected from the command line.
+    """
+    parser = ap.ArgumentParser(
+        description="Calibration of the dry-run planner",
+        formatter_class=ap.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("-b",
+                        "--num-basic",
+                        type=int,
+                        nargs="+",
+                        default=[10000, 30000, 100000],
+                        metavar="int",
+                        help="# of basic events")
+    parser.add_argument("-a",
+                        "--num-args",
+                        type=float,
+                        nargs="+",
+                        default=[3.0],
+                        metavar="float",
+                        help="avg. # of gate arguments")
+    parser.add_argument("--repeat",
+                        type=int,
+                        default=3,
+                        metavar="int",
+                        help="# of timed runs per setup")
+    parser.add_argument("-o",
+                        "--out",
+                        type=str,
+                        metavar="path",
+                        help="a file to write the calibration in JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Calibrates the planner for the fault tree models.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+    """
+    args = manage_cmd_args(argv)
+
+    def _print(*values):
+        print(*values, sep='', file=sys.stderr)
+
+    calibration = {
+        model: calibrate(args.num_basic, args.num_args, model == "compact",
+                         args.repeat, _print)
+        for model in ("standard", "compact")
+    }
+    if args.out:
+        with open(args.out, "w") as out_file:
+            json.dump(calibration, out_file, indent=2)
+    else:
+        json.dump(calibration, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Scaling benchmark of fault tree generation.
+
+The generation (without the output) is timed
+for every factor regime and the number of basic events
+in powers of ten from 1e2 up to the maximum size (at most 1e7).
+The regimes are sets of the generator command-line options,
+so every benchmark can be reproduced on the command line.
+
+The results are written as JSON with the generator version
+to compare the runs across commits:
+the best times that are slower than the baseline by more than the tolerance
+are reported as regressions.
+"""
+
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import argparse as ap
+
+from generator import fault_tree_generator
+from generator import model_cache
+
+# The generator options of the factor regimes by the number of basic events.
+REGIMES = {
+    "default": lambda size: [],
+    "common_g": lambda size: ["--common-g", "0.4", "--parents-g", "3"],
+    "kn_heavy": lambda size: ["--weights-g", "1", "1", "4"],
+    "num_gate": lambda size: [
+        "--num-gate",
+        str(size * 4 // 5), "--weights-g", "1", "1", "1", "0.1", "0.1"
+    ],
+    "house_ccf": lambda size: [
+        "--num-house",
+        str(size // 10), "--num-ccf",
+        str(size // 20), "--weights-g", "1", "1", "1", "0.1", "0.1"
+    ],
+}
+
+MAX_SIZE = 10**7
+
+
+def get_sizes(max_size):
+    """Provides the benchmark sizes.
+
+    Args:
+        max_size: The maximum number of basic events.
+
+    Returns:
+        The numbers of basic events in powers of ten from 100.
+    """
+    sizes = []
+    size = 100
+    while size <= min(max_size, MAX_SIZE):
+        sizes.append(size)
+        size *= 10
+    return sizes
+
+
+def time_generation(options, repeat, compact=False):
+    """Times the generation of the fault tree.
+
+    Args:
+        options: The generator command-line options.
+        repeat: The number of timed runs.
+        compact: Generate into the compact graph core.
+
+    Returns:
+        The list of run times in seconds and the number of gates.
+    """
+    args = fault_tree_generator.manage_cmd_args(options)
+    factors = fault_tree_generator.setup_factors(args)
+    times = []
+    num_gates = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        fault_tree = fault_tree_generator.generate_fault_tree(
+            args.ft_name, args.root, factors, compact,
+            random.Random(args.seed))
+        times.append(time.perf_counter() - start_time)
+        num_gates = len(fault_tree.gates)
+        del fault_tree
+    return times, num_gates
+
+
+def get_commit():
+    """Returns the git commit of the working tree if any."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"],
+                              capture_output=True,
+                              text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(regimes, sizes, repeat=3, compact=False, time_limit=None,
+                   log=None):
+    """Runs the scaling benchmarks.
+
+    Args:
+        regimes: The names of the factor regimes.
+        sizes: The numbers of basic events.
+        repeat: The number of timed runs per benchmark.
+        compact: Generate into the compact graph core.
+        time_limit: The run time (in seconds) of a regime
+            after which its larger sizes are skipped.
+        log: The optional printer of the progress.
+
+    Returns:
+        The JSON-serializable document with the environment and results.
+    """
+    results = []
+    for regime in regimes:
+        for size in sizes:
+            options = ["-b", str(size)] + REGIMES[regime](size)
+            times, num_gates = time_generation(options, repeat, compact)
+            result = {
+                "regime": regime,
+                "size": size,
+                "options": options,
+                "num_gates": num_gates,
+                "times": times,
+                "best": min(times),
+                "median": statistics.median(times)
+            }
+            results.append(result)
+            if log:
+                log(regime, " ", size, ": ", result["best"], " s")
+            if time_limit is not None and min(times) > time_limit:
+                break
+    return {
+        "version": model_cache.get_version(),
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "compact": compact,
+        "repeat": repeat,
+        "results": results
+    }
+
+
+def find_regressions(baseline, current, tolerance):
+    """Compares the best times of the benchmarks with the baseline.
+
+    Args:
+        baseline: The benchmark document of the baseline.
+        current: The benchmark document to check.
+        tolerance: The allowed relative slowdown (e.g., 0.2 for 20%).
+
+    Returns:
+        The list of regressed benchmarks
+        with their baseline and current best times.
+    """
+    reference = {(x["regime"], x["size"]): x["best"]
+                 for x in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        key = (result["regime"], result["size"])
+        if key in reference and result["best"] > reference[key] * (
+                1 + tolerance):
+            regressions.append({
+                "regime": result["regime"],
+                "size": result["size"],
+                "baseline": reference[key],
+                "best": result["best"]
+            })
+    return regressions
+
+
+def manage_cmd_args(argv=None):
+    """Manages command-line description and arguments.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+
+    Returns:
+        Arguments that are collected from the command line.
+    """
+    parser = ap.ArgumentParser(
+        description="Scaling benchmark of fault tree generation",
+        formatter_class=ap.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("-o",
+                        "--out",
+                        type=str,
+                        metavar="path",
+                        help="a file to write the results in JSON")
+    parser.add_argument("--max-size",
+                        type=float,
+                        default=1e5,
+                        metavar="int",
+                        help="the max # of basic events (up to 1e7)")
+    parser.add_argument("--regimes",
+                        nargs="+",
+                        choices=sorted(REGIMES),
+                        default=list(REGIMES),
+                        help="the factor regimes to benchmark")
+    parser.add_argument("--repeat",
+                        type=int,
+                        default=3,
+                        metavar="int",
+                        help="# of timed runs per benchmark")
+    parser.add_argument("--compact",
+                        action="store_true",
+                        help="benchmark the compact graph core")
+    parser.add_argument("--time-limit",
+                        type=float,
+                        metavar="float",
+                        help="skip larger sizes of a regime "
+                        "after a run longer than this (seconds)")
+    parser.add_argument("--compare",
+                        type=str,
+                        metavar="path",
+                        help="a JSON file with the baseline results")
+    parser.add_argument("--tolerance",
+                        type=float,
+                        default=0.2,
+                        metavar="float",
+                        help="the allowed relative slowdown against baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the benchmarks and compares them with the baseline.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+
+    Returns:
+        The list of regressions against the baseline if any.
+    """
+    args = manage_cmd_args(argv)
+
+    def _print(*values):
+        print(*values, sep='', file=sys.stderr)
+
+    document = run_benchmarks(args.regimes, get_sizes(args.max_size),
+                              args.repeat, args.compact, args.time_limit,
+                              _print)
+    if args.out:
+        with open(args.out, "w") as out_file:
+            json.dump(document, out_file, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+    if not args.compare:
+        return []
+    with open(args.compare) as baseline_file:
+        regressions = find_regressions(json.load(baseline_file), document,
+                                       args.tolerance)
+    for regression in regressions:
+        _print("Regression in ", regression["regime"], " ",
+               regression["size"], ": ", regression["baseline"], " s -> ",
+               regression["best"], " s")
+    return regressions
+
+
+if __name__ == "__main__":
+    if main():
+        sys.exit(1)
@@ -0,0 +1,405 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Peak-memory benchmark of fault tree generation and output.
+
+The memory is measured for the fault tree models of the generator package
+and of the older src scripts
+with every combination of the number of basic events
+and the average number of gate arguments.
+Every measurement runs in a fresh process
+with tracemalloc tracing the Python allocations
+and a thread sampling the resident set size (RSS) of the process.
+
+The peaks are reported per phase:
+construction (the initialization of gates),
+house events, CCF groups, and serialization (the MEF XML output),
+together with the peak bytes per gate and per basic event,
+and the bytes per node retained by the generated fault tree.
+The phases of the generator package are delimited by its profile hooks,
+and the src functions are wrapped for lack of such hooks.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+import argparse as ap
+
+from generator import fault_tree_generator
+from generator.profiler import Profile
+
+MODELS = ("generator", "src")
+
+# The reported phases by the names of the profile phases.
+PHASES = {
+    "construction": "init_gates",
+    "house_events": "distribute_house_events",
+    "ccf": "generate_ccf_groups",
+    "serialization": "writing",
+}
+
+_SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "src")
+_SRC_OPTIONS = ["--ccf-size", "4"]  # required by src for CCF groups
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def get_rss():
+    """Returns the current resident set size of the process in bytes."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:  # the peak since the start on platforms without /proc
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler(threading.Thread):
+    """Background sampling of the peak resident set size.
+
+    Attributes:
+        interval: The time between samples in seconds.
+    """
+
+    def __init__(self, interval=0.005):
+        """Initializes the sampler without starting it.
+
+        Args:
+            interval: The time between samples in seconds.
+        """
+        super(RssSampler, self).__init__(daemon=True)
+        self.interval = interval
+        self.__peak = get_rss()
+        self.__stop = threading.Event()
+
+    def run(self):
+        while not self.__stop.wait(self.interval):
+            self.__peak = max(self.__peak, get_rss())
+
+    def stop(self):
+        """Stops the sampling."""
+        self.__stop.set()
+        self.join()
+
+    def reset(self):
+        """Restarts the peak from the current RSS.
+
+        Returns:
+            The peak RSS since the last reset.
+        """
+        rss = get_rss()
+        peak = max(self.__peak, rss)
+        self.__peak = rss
+        return peak
+
+
+class MemoryProfile(Profile):
+    """Profile with the peak memory of phases.
+
+    The phases may nest;
+    the peaks of nested phases are included into the enclosing phase.
+    Tracemalloc must be tracing.
+
+    Attributes:
+        memory: The peak traced and RSS bytes
+            and the traced bytes after the last run of phases by name.
+    """
+
+    def __init__(self, sampler):
+        """Initializes an empty profile.
+
+        Args:
+            sampler: The running RSS sampler.
+        """
+        super(MemoryProfile, self).__init__()
+        self.memory = {}
+        self.__sampler = sampler
+        self.__peaks = []  # the peaks of running phases [traced, rss]
+
+    def __fold(self, traced, rss):
+        """Accounts the peaks in the enclosing phase if any."""
+        if self.__peaks:
+            peaks = self.__peaks[-1]
+            peaks[0] = max(peaks[0], traced)
+            peaks[1] = max(peaks[1], rss)
+
+    @contextmanager
+    def phase(self, name):
+        with super(MemoryProfile, self).phase(name):
+            self.__fold(tracemalloc.get_traced_memory()[1],
+                        self.__sampler.reset())
+            self.__peaks.append([0, 0])
+            tracemalloc.reset_peak()
+            try:
+                yield
+            finally:
+                traced, rss = self.__peaks.pop()
+                current, peak = tracemalloc.get_traced_memory()
+                traced = max(traced, peak)
+                rss = max(rss, self.__sampler.reset())
+                record = self.memory.setdefault(name, {
+                    "peak_traced": 0,
+                    "peak_rss": 0
+                })
+                record["peak_traced"] = max(record["peak_traced"], traced)
+                record["peak_rss"] = max(record["peak_rss"], rss)
+                record["traced"] = current
+                self.__fold(traced, rss)
+                tracemalloc.reset_peak()
+
+
+def _discard(*args):
+    """Prints nothing."""
+    del args
+
+
+def wrap_phase(profile, name, function):
+    """Runs the function as a profile phase.
+
+    Args:
+        profile: The profile.
+        name: The name of the phase.
+        function: The function to wrap.
+
+    Returns:
+        The wrapped function.
+    """
+
+    def _phased(*args):
+        with profile.phase(name):
+            return function(*args)
+
+    return _phased
+
+
+def run_generator(options, profile):
+    """Generates and serializes the fault tree of the generator package.
+
+    Args:
+        options: The generator command-line options.
+        profile: The memory profile.
+
+    Returns:
+        The generated fault tree.
+    """
+    args = fault_tree_generator.manage_cmd_args(options)
+    factors = fault_tree_generator.setup_factors(args)
+    return fault_tree_generator.write_fault_tree(args, factors, _discard,
+                                                 profile)
+
+
+def run_src(options, profile):
+    """Generates and serializes the fault tree of the src scripts.
+
+    The src generation functions are wrapped into the profile phases.
+
+    Args:
+        options: The generator command-line options.
+        profile: The memory profile.
+
+    Returns:
+        The generated fault tree.
+    """
+    sys.path.insert(0, _SRC_DIR)
+    module = importlib.import_module("fault_tree_generator")
+    for name in ("init_gates", "distribute_house_events",
+                 "generate_ccf_groups"):
+        setattr(module, name, wrap_phase(profile, name,
+                                         getattr(module, name)))
+    args = module.manage_cmd_args(options + _SRC_OPTIONS)
+    factors = module.setup_factors(args)
+    with profile.phase("generation"):
+        fault_tree = module.generate_fault_tree(args.ft_name, args.root,
+                                                factors)
+    with profile.phase("writing"):
+        module.write_info(fault_tree, _discard, args.seed)
+        module.write_summary(fault_tree, _discard)
+        fault_tree.to_xml(_discard, args.nest)
+    return fault_tree
+
+
+def measure(model, options):
+    """Measures the memory of the fault tree generation and output.
+
+    Args:
+        model: The fault tree model ("generator" or "src").
+        options: The generator command-line options.
+
+    Returns:
+        The JSON-serializable report of the peak memory.
+    """
+    sampler = RssSampler()
+    sampler.start()
+    tracemalloc.start()
+    baseline_rss = get_rss()
+    profile = MemoryProfile(sampler)
+    start_time = time.perf_counter()
+    run = run_generator if model == "generator" else run_src
+    fault_tree = run(options, profile)
+    wall_time = time.perf_counter() - start_time
+    tracemalloc.stop()
+    sampler.stop()
+
+    num_gates = len(fault_tree.gates)
+    num_basic = len(fault_tree.basic_events)
+    num_nodes = num_gates + num_basic + len(fault_tree.house_events)
+    phases = {}
+    for phase, name in PHASES.items():
+        record = profile.memory.get(name)
+        if record:
+            phases[phase] = {
+                "peak_traced": record["peak_traced"],
+                "peak_rss": record["peak_rss"],
+                "bytes_per_gate": record["peak_traced"] / num_gates,
+                "bytes_per_basic": record["peak_traced"] / num_basic
+            }
+    retained = profile.memory["generation"]["traced"]
+    return {
+        "model": model,
+        "options": options,
+        "num_gates": num_gates,
+        "num_basic": num_basic,
+        "num_nodes": num_nodes,
+        "time": wall_time,
+        "baseline_rss": baseline_rss,
+        "retained_traced": retained,
+        "bytes_per_node": retained / num_nodes,
+        "phases": phases
+    }
+
+
+def run_benchmarks(models, num_basic, num_args, extra_options=()):
+    """Measures the memory for all the combinations of the setups.
+
+    Args:
+        models: The fault tree models to measure.
+        num_basic: The numbers of basic events.
+        num_args: The average numbers of gate arguments.
+        extra_options: Other generator options for all the measurements.
+
+    Returns:
+        The list of memory reports.
+    """
+    context = multiprocessing.get_context("spawn")  # clean processes
+    reports = []
+    for model, size, args in itertools.product(models, num_basic, num_args):
+        options = ["-b", str(size), "-a", str(args)] + list(extra_options)
+        with ProcessPoolExecutor(max_workers=1,
+                                 mp_context=context) as executor:
+            reports.append(executor.submit(measure, model, options).result())
+    return reports
+
+
+def write_table(reports, printer):
+    """Writes the summary of the memory reports.
+
+    Args:
+        reports: The memory reports.
+        printer: The output stream.
+    """
+    printer("model      options              nodes  B/node  ",
+            "  ".join("%s B/gate" % x[:5] for x in PHASES))
+    for report in reports:
+        phases = report["phases"]
+        printer("%-10s %-20s %5d  %6.0f  " %
+                (report["model"], " ".join(report["options"][:4]),
+                 report["num_nodes"], report["bytes_per_node"]),
+                "  ".join("%12.0f" % phases[x]["bytes_per_gate"]
+                          if x in phases else "%12s" % "-" for x in PHASES))
+
+
+def manage_cmd_args(argv=None):
+    """Manages command-line description and arguments.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+
+    Returns:
+        Arguments that are collected from the command line.
+    """
+    parser = ap.ArgumentParser(
+        description="Peak-memory benchmark of fault tree generation",
+        formatter_class=ap.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("-b",
+                        "--num-basic",
+                        type=int,
+                        nargs="+",
+                        default=[1000, 10000, 100000],
+                        metavar="int",
+                        help="# of basic events")
+    parser.add_argument("-a",
+                        "--num-args",
+                        type=float,
+                        nargs="+",
+                        default=[3.0],
+                        metavar="float",
+                        help="avg. # of gate arguments")
+    parser.add_argument("--num-house",
+                        type=int,
+                        default=0,
+                        metavar="int",
+                        help="# of house events")
+    parser.add_argument("--num-ccf",
+                        type=int,
+                        default=0,
+                        metavar="int",
+                        help="# of ccf groups")
+    parser.add_argument("--models",
+                        nargs="+",
+                        choices=MODELS,
+                        default=list(MODELS),
+                        help="the fault tree models to measure")
+    parser.add_argument("-o",
+                        "--out",
+                        type=str,
+                        metavar="path",
+                        help="a file to write the reports in JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the memory benchmarks and writes the reports.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+    """
+    args = manage_cmd_args(argv)
+    reports = run_benchmarks(args.models, args.num_basic, args.num_args, [
+        "--num-house",
+        str(args.num_house), "--num-ccf",
+        str(args.num_ccf), "--weights-g", "1", "1", "1", "0.1", "0.1"
+    ])
+
+    def _print(*values):
+        print(*values, sep='', file=sys.stderr)
+
+    write_table(reports, _print)
+    if args.out:
+        with open(args.out, "w") as out_file:
+            json.dump(reports, out_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 import sys
 import argparse
 
-import fault_tree_generator
-from fault_tree_generator import FactorError
+from generator import fault_tree_generator
+from generator.fault_tree_generator import FactorError
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,239 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Generation of corpora of many fault trees in a process pool.
+
+A model configuration is a mapping of the fault tree generator options
+(the command-line option names with dashes or underscores)
+to their values, for example, {"num-basic": 200, "seed": 42}.
+The options that are not given take the command-line defaults,
+and the output of every model is identical to the output
+of the single-model command line with the same options.
+
+The configurations are consumed lazily,
+and every worker writes its model directly into the output directory,
+so the corpus does not need to fit into memory.
+
+The command-line interface takes a file with one JSON configuration per line
+and writes the manifest of the corpus into the output directory.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import sys
+import time
+
+import argparse as ap
+
+from generator import bulk_writer
+from generator import fault_tree_generator
+from generator.fault_tree_generator import FactorError
+
+_PARSER = fault_tree_generator.make_parser()
+_DEFAULTS = vars(_PARSER.parse_args([]))
+
+# The options of the single-model command line that apply to the corpus.
+_CORPUS_OPTIONS = ("cache_dir", "cache_size", "cache_stats", "stats_json",
+                   "profile_json", "plan", "plan_calibration")
+
+
+def get_model_args(config, index, out_dir):
+    """Converts a model configuration into the generator arguments.
+
+    The configuration is parsed as the command line of the generator,
+    so the values get the same types and checks as the command-line options.
+
+    Args:
+        config: A mapping of the generator options to values.
+        index: The position of the model in the corpus.
+        out_dir: The directory for models without the output file option.
+
+    Returns:
+        The argument namespace for the fault tree generator.
+
+    Raises:
+        ArgumentTypeError: Unknown or corpus-level options
+            or invalid values in the configuration.
+    """
+    argv = []
+    for option, value in config.items():
+        name = option.lstrip("-").replace("-", "_")
+        if name not in _DEFAULTS:
+            raise ap.ArgumentTypeError("Unknown option in model %d: %s" %
+                                       (index, option))
+        if name in _CORPUS_OPTIONS:
+            raise ap.ArgumentTypeError(
+                "Option not supported per model in model %d: %s" %
+                (index, option))
+        option = "--" + name.replace("_", "-")
+        if value is True:
+            argv.append(option)
+        elif isinstance(value, (list, tuple)):
+            argv += [option] + [str(x) for x in value]
+        elif value is not None and value is not False:
+            argv.append("%s=%s" % (option, value))
+    try:
+        args = _PARSER.parse_args(argv)
+    except SystemExit:
+        raise ap.ArgumentTypeError("Invalid configuration of model %d: %s" %
+                                   (index, json.dumps(config))) from None
+    if not args.out:
+        args.out = os.path.join(out_dir, "fault_tree_%d.xml" % index)
+    return args
+
+
+def generate_model(index, args):
+    """Generates one model of the corpus into its output file.
+
+    Args:
+        index: The position of the model in the corpus.
+        args: The argument namespace for the fault tree generator.
+
+    Returns:
+        The manifest entry of the model.
+
+    Raises:
+        ArgumentTypeError: There are problems with the arguments.
+        FactorError: Invalid setup for factors.
+    """
+    start_time = time.perf_counter()
+    factors = fault_tree_generator.setup_factors(args)
+    with bulk_writer.open_writer(args.out) as printer:
+        fault_tree = fault_tree_generator.write_fault_tree(
+            args, factors, printer)
+    return {
+        "index": index,
+        "path": args.out,
+        "ft_name": args.ft_name,
+        "seed": args.seed,
+        "time": time.perf_counter() - start_time,
+        "metrics": fault_tree_generator.get_metrics(fault_tree)
+    }
+
+
+def generate_many(configs, workers=1, out_dir="."):
+    """Generates a corpus of fault trees.
+
+    The models are written in parallel processes,
+    but the manifest keeps the order of the configurations.
+    At most two models per worker are in flight at any time.
+
+    Args:
+        configs: An iterable of model configurations.
+        workers: The number of worker processes
+            (1 generates the models in this process).
+        out_dir: The directory for models without the output file option.
+
+    Returns:
+        The list of manifest entries with the output file, seed,
+        size metrics, and generation time (in seconds) of every model.
+
+    Raises:
+        ArgumentTypeError: There are problems with the arguments.
+        FactorError: Invalid setup for factors.
+    """
+    models = (get_model_args(config, i, out_dir)
+              for i, config in enumerate(configs))
+    if workers <= 1:
+        return [generate_model(i, args) for i, args in enumerate(models)]
+
+    manifest = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = deque()
+        for i, args in enumerate(models):
+            if len(futures) == 2 * workers:
+                manifest.append(futures.popleft().result())
+            futures.append(executor.submit(generate_model, i, args))
+        while futures:
+            manifest.append(futures.popleft().result())
+    return manifest
+
+
+def read_configs(file_path):
+    """Reads model configurations lazily from a JSON-lines file.
+
+    Args:
+        file_path: The path to the file with one JSON object per line.
+
+    Yields:
+        Model configurations.
+    """
+    with open(file_path) as config_file:
+        for line in config_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def manage_cmd_args(argv=None):
+    """Manages command-line description and arguments.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+
+    Returns:
+        Arguments that are collected from the command line.
+    """
+    parser = ap.ArgumentParser(
+        description="Generator of fault tree corpora",
+        formatter_class=ap.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("configs",
+                        type=str,
+                        metavar="path",
+                        help="a file with a JSON model configuration per line")
+    parser.add_argument("-o",
+                        "--out-dir",
+                        type=str,
+                        default=".",
+                        metavar="path",
+                        help="a directory to write the models and manifest")
+    parser.add_argument("-j",
+                        "--workers",
+                        type=int,
+                        default=os.cpu_count(),
+                        metavar="int",
+                        help="# of worker processes")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Generates the corpus and writes its manifest.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+
+    Raises:
+        ArgumentTypeError: There are problems with the arguments.
+        FactorError: Invalid setup for factors.
+    """
+    args = manage_cmd_args(argv)
+    os.makedirs(args.out_dir, exist_ok=True)
+    manifest = generate_many(read_configs(args.configs), args.workers,
+                             args.out_dir)
+    with open(os.path.join(args.out_dir, "manifest.json"), "w") as out_file:
+        json.dump(manifest, out_file, indent=2)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ap.ArgumentTypeError as err:
+        print("Argument Error:\n" + str(err))
+        sys.exit(2)
+    except FactorError as err:
+        print("Error in factors:\n" + str(err))
+        sys.exit(1)
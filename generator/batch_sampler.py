@@ -0,0 +1,134 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Batched sampling of the random attributes of fault tree nodes.
+
+Sampling gate operators, the number of gate arguments,
+and basic event probabilities one at a time
+with the random module costs several interpreter calls per node.
+The batch sampler draws these values in blocks with NumPy
+and hands them out from buffers.
+
+Every kind of value has its own independent stream
+spawned from the seed,
+so the results are deterministic for the seed and the block size.
+
+NumPy is an optional dependency needed only for this module.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def is_available():
+    """Checks if the optional NumPy dependency is installed."""
+    return np is not None
+
+
+class _Buffer:  # pylint: disable=too-few-public-methods
+    """Stack of pre-drawn values refilled by blocks."""
+
+    def __init__(self, refill):
+        """Initializes an empty buffer.
+
+        Args:
+            refill: A function returning a new list of values.
+        """
+        self.__refill = refill
+        self.__values = []
+
+    def pop(self):
+        """Returns the next value."""
+        if not self.__values:
+            self.__values = self.__refill()
+            self.__values.reverse()
+        return self.__values.pop()
+
+
+class BatchSampler:
+    """Sampler of random node attributes from pre-drawn blocks.
+
+    The distributions are the same as in the Factors sampling functions.
+    """
+
+    def __init__(self, seed, block_size, norm_weights, max_args, min_prob,
+                 max_prob):
+        """Initializes the streams of random values.
+
+        Args:
+            seed: The seed of the pseudo-random number generators.
+            block_size: The number of values drawn at once.
+            norm_weights: Normalized weights of gate operators.
+            max_args: The upper bound (with a fractional part)
+                for the number of gate arguments.
+            min_prob: The lower boundary for basic event probabilities.
+            max_prob: The upper boundary for basic event probabilities.
+
+        Raises:
+            ImportError: NumPy is not available.
+        """
+        if not is_available():
+            raise ImportError("Batch sampling requires NumPy")
+        assert block_size > 0
+        streams = [
+            np.random.default_rng(x)
+            for x in np.random.SeedSequence(seed).spawn(4)
+        ]
+        cum_dist = np.cumsum(norm_weights)
+        last_operator = max(i for i, x in enumerate(norm_weights) if x > 0)
+
+        def draw_operators(rng=streams[0]):
+            operators = np.searchsorted(cum_dist, rng.random(block_size),
+                                        side="right")
+            # Guards against rounding errors in the cumulative distribution.
+            return np.minimum(operators, last_operator).tolist()
+
+        def draw_max_args(rng):
+            """Deals with the fractional part of the max number of args."""
+            extra = rng.random(block_size) < (max_args - int(max_args))
+            return int(max_args) + extra
+
+        def draw_num_args(rng=streams[1]):
+            return rng.integers(2, draw_max_args(rng) + 1).tolist()
+
+        def draw_atleast_args(rng=streams[2]):
+            num_args = rng.integers(3, np.maximum(draw_max_args(rng), 3) + 1)
+            k_nums = rng.integers(2, num_args)
+            return list(zip(num_args.tolist(), k_nums.tolist()))
+
+        def draw_probabilities(rng=streams[3]):
+            return rng.uniform(min_prob, max_prob, block_size).tolist()
+
+        self.__operators = _Buffer(draw_operators)
+        self.__num_args = _Buffer(draw_num_args)
+        self.__atleast_args = _Buffer(draw_atleast_args)
+        self.__probabilities = _Buffer(draw_probabilities)
+
+    def operator(self):
+        """Returns the index of a random gate operator."""
+        return self.__operators.pop()
+
+    def num_args(self):
+        """Returns the number of arguments for AND/OR gates."""
+        return self.__num_args.pop()
+
+    def atleast_args(self):
+        """Returns the number of arguments and k_num for K/N gates."""
+        return self.__atleast_args.pop()
+
+    def probability(self):
+        """Returns the probability for a basic event."""
+        return self.__probabilities.pop()
@@ -1,14 +1,31 @@
-from ordered_set import OrderedSet
+from itertools import count
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from generator.event.gate import Gate
+
+_IDS = count()  # the source of unique event ids
 
 
 class Event(object):
     """Representation of a base class for an event in a fault tree.
 
+    Events are hashed and compared by identity,
+    so distinct events must not share the name within a fault tree.
+
     Attributes:
+        id: A unique integer id in the order of construction.
         name: A specific name that identifies this node.
-        parents: A set of parents of this node.
+        parents: Unique parents of this node in the order of addition
+            (a list while the node is under construction,
+            a tuple after freezing).
+        parent_index: An optional index to notify about new parents.
     """
 
+    __slots__ = ("id", "name", "parents", "parent_index")
+
     def __init__(self, name: str = None):
         """Constructs a new node with a unique name.
 
@@ -17,19 +34,14 @@ class Event(object):
         Args:
             name: Identifier for the node.
         """
+        self.id = next(_IDS)
         self.name: str = name
-        from generator.event.gate import Gate
-        self.parents: OrderedSet[Gate] = OrderedSet()
+        self.parents: 'Sequence[Gate]' = ()
+        self.parent_index = None
 
     def __str__(self):
         return self.name
 
-    def __hash__(self):
-        return hash(str(self))
-
-    def __eq__(self, other):
-        return self.name == other.name
-
     def is_common(self) -> bool:
         """Indicates if this node appears in several places."""
         return len(self.parents) > 1
@@ -49,4 +61,14 @@ class Event(object):
             gate: The gate where this node appears.
         """
         assert gate not in self.parents
-        self.parents.add(gate)
+        if self.parents:
+            self.parents.append(gate)
+        else:
+            self.parents = [gate]
+
+    def freeze(self):
+        """Makes the parents of the node immutable.
+
+        The node must not get new parents after freezing.
+        """
+        self.parents = tuple(self.parents)
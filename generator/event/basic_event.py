@@ -10,6 +10,8 @@ class BasicEvent(Event):
         probability: Probability of failure of this basic event.
     """
 
+    __slots__ = ("__probability",)
+
     def __init__(self, name: str, probability: Probability):
         """Initializes a basic event node.
 
@@ -20,11 +22,19 @@ class BasicEvent(Event):
         super(BasicEvent, self).__init__(name)
         self.__probability = probability
 
+    def get_xml(self):
+        """Produces the Open-PSA MEF XML definition of the basic event.
+
+        Returns:
+            The definition lines joined into one string
+            without the trailing newline.
+        """
+        return ('<define-basic-event name="' + self.name + '">\n' +
+                self.__probability.get_xml() + '\n</define-basic-event>')
+
     def to_xml(self, printer):
         """Produces the Open-PSA MEF XML definition of the basic event."""
-        printer('<define-basic-event name="', self.name, '">')
-        self.__probability.to_xml(printer)
-        printer('</define-basic-event>')
+        printer(self.get_xml())
 
     def to_aralia(self, printer):
         """Produces the Aralia definition of the basic event."""
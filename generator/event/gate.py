@@ -1,4 +1,7 @@
 from collections import deque
+from collections.abc import Iterable, Sequence
+import heapq
+
 from ordered_set import OrderedSet
 
 from generator.event.basic_event import BasicEvent
@@ -6,9 +9,73 @@ from generator.event.Event import Event
 from generator.event.house_event import HouseEvent
 
 
+# The formula tags by the operator (K/N gates get the min number on the fly).
+_TAGS = {
+    operator: ("<" + operator + ">\n", "</" + operator + ">")
+    for operator in ("and", "or", "atleast", "not", "xor")
+}
+_TAGS["null"] = ("", "")
+
+# The templates of argument references by the argument type:
+# the reference of the first name, the separator, and the end of the last.
+_HOUSE_REFS = ('<house-event name="', '"/>\n<house-event name="', '"/>\n')
+_BASIC_REFS = ('<basic-event name="', '"/>\n<basic-event name="', '"/>\n')
+_EVENT_REFS = ('<event name="', '"/>\n<event name="', '"/>\n')
+_GATE_REFS = ('<gate name="', '"/>\n<gate name="', '"/>\n')
+
+
+def _get_tags(gate):
+    """Provides the opening and closing tags of the gate formula."""
+    if gate.operator == "atleast":
+        return '<atleast min="' + str(gate.k_num) + '">\n', "</atleast>"
+    try:
+        return _TAGS[gate.operator]
+    except KeyError:
+        return "<" + gate.operator + ">\n", "</" + gate.operator + ">"
+
+
+def _append_names(parts, refs, args):
+    """Appends the references of the (non-empty) arguments of the same type."""
+    start, separator, end = refs
+    parts.append(start)
+    parts.append(separator.join([x.name for x in args]))
+    parts.append(end)
+
+
+def _append_refs(parts, gate):
+    """Appends the references of the event arguments of the gate."""
+    args = gate.h_arguments
+    if args:
+        _append_names(parts, _HOUSE_REFS, args)
+    args = gate.b_arguments
+    if args:
+        _append_names(parts, _BASIC_REFS, args)
+    args = gate.u_arguments
+    if args:
+        _append_names(parts, _EVENT_REFS, args)
+
+
+def _append_formula(parts, gate):
+    """Appends the formula of the gate with references to its arguments."""
+    open_tag, close_tag = _get_tags(gate)
+    parts.append(open_tag)
+    _append_refs(parts, gate)
+    args = gate.g_arguments
+    if args:
+        _append_names(parts, _GATE_REFS, args)
+    parts.append(close_tag)
+
+
 class Gate(Event):  # pylint: disable=too-many-instance-attributes
     """Representation of a fault tree gate.
 
+    The arguments are kept in plain lists per argument type
+    in the order of addition
+    (empty tuples until the first argument of the type),
+    which are converted into tuples by freezing the gate.
+    The ids of the arguments are kept in a set for duplicate checks
+    until the gate is frozen.
+
     Attributes:
         operator: Logical operator of this formula.
         k_num: Min number for the combination operator.
@@ -17,8 +84,16 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
         h_arguments: arguments that are house events.
         u_arguments: arguments that are undefined.
         mark: Marking for various algorithms like toposort.
+        rank: Topological rank greater than the ranks of parents
+            (maintained by add_argument).
+        stats: Generation statistics updated by add_argument if any.
+        stats_id: The number of the gate in the generation statistics.
     """
 
+    __slots__ = ("mark", "rank", "stats", "stats_id", "operator", "k_num",
+                 "g_arguments", "b_arguments", "h_arguments", "u_arguments",
+                 "__num_arguments", "__argument_ids")
+
     def __init__(self, name: str, operator, k_num=None):
         """Initializes a gate.
 
@@ -29,45 +104,54 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
         """
         super(Gate, self).__init__(name)
         self.mark = None
+        self.rank = 0
+        self.stats = None
+        self.stats_id = None
         self.operator = operator
         self.k_num = k_num
-        self.g_arguments: OrderedSet[Gate] = OrderedSet()
-        self.b_arguments: OrderedSet[BasicEvent] = OrderedSet()
-        self.h_arguments: OrderedSet[HouseEvent] = OrderedSet()
-        self.u_arguments: OrderedSet[Event] = OrderedSet()
+        self.g_arguments: Sequence[Gate] = ()
+        self.b_arguments: Sequence[BasicEvent] = ()
+        self.h_arguments: Sequence[HouseEvent] = ()
+        self.u_arguments: Sequence[Event] = ()
+        self.__num_arguments = 0
+        self.__argument_ids = set()
 
     def num_arguments(self):
         """Returns the number of arguments."""
-        return sum(
-            len(x) for x in (self.b_arguments, self.h_arguments,
-                             self.g_arguments, self.u_arguments))
+        return self.__num_arguments
+
+    def has_argument(self, argument):
+        """Checks if the event is an argument of the gate.
+
+        The check takes constant time until the gate is frozen.
+        """
+        if self.__argument_ids is None:
+            return self in argument.parents
+        return argument.id in self.__argument_ids
 
-    def add_basic_events(self, basic_events: OrderedSet[BasicEvent]):
+    def add_basic_events(self, basic_events: Iterable[BasicEvent]):
         for basic_event in basic_events:
-            basic_event.parents.add(self)
-        self.b_arguments.update(basic_events)
+            self.add_argument(basic_event)
 
     def add_basic_event(self, basic_event: BasicEvent):
-        basic_event.parents.add(self)
-        self.b_arguments.add(basic_event)
+        self.add_argument(basic_event)
 
     def add_house_event(self, house_event: HouseEvent):
-        house_event.parents.add(self)
-        self.h_arguments.add(house_event)
+        self.add_argument(house_event)
 
-    def add_gates(self, gates: OrderedSet['Gate']):
+    def add_gates(self, gates: Iterable['Gate']):
         for gate in gates:
-            gate.parents.add(self)
-        self.g_arguments.update(gates)
+            self.add_argument(gate)
 
     def add_gate(self, gate: 'Gate'):
-        gate.parents.add(self)
-        self.g_arguments.add(gate)
+        self.add_argument(gate)
 
     def add_argument(self, argument):
         """Adds argument into a collection of gate arguments.
 
-        Note that this function also updates the parent set of the argument.
+        Note that this function also updates the parent set of the argument,
+        the parent count index tracking the argument,
+        and the generation statistics if any.
         Duplicate arguments are ignored.
         The logic of the Boolean operator is not taken into account
         upon adding arguments to the gate.
@@ -77,16 +161,105 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
         Args:
             argument: Gate, HouseEvent, BasicEvent, or Event argument.
         """
-        argument.parents.add(self)
+        argument_ids = self.__argument_ids
+        if argument.id in argument_ids:
+            return
+        argument_ids.add(argument.id)
+        parents = argument.parents
+        if parents:
+            parents.append(self)
+        else:
+            argument.parents = [self]
+        self.__num_arguments += 1
+        if argument.parent_index is not None:
+            argument.parent_index.update(argument)
+        if self.stats is not None:
+            self.__update_stats(argument)
         if isinstance(argument, Gate):
-            self.g_arguments.add(argument)
+            if argument.rank <= self.rank:
+                argument.rank = self.rank + 1
+                if argument.g_arguments:
+                    argument.propagate_rank()
+            if self.g_arguments:
+                self.g_arguments.append(argument)
+            else:
+                self.g_arguments = [argument]
         elif isinstance(argument, BasicEvent):
-            self.b_arguments.add(argument)
+            if self.b_arguments:
+                self.b_arguments.append(argument)
+            else:
+                self.b_arguments = [argument]
         elif isinstance(argument, HouseEvent):
-            self.h_arguments.add(argument)
+            if self.h_arguments:
+                self.h_arguments.append(argument)
+            else:
+                self.h_arguments = [argument]
         else:
             assert isinstance(argument, Event)
-            self.u_arguments.add(argument)
+            if self.u_arguments:
+                self.u_arguments.append(argument)
+            else:
+                self.u_arguments = [argument]
+
+    def remove_argument(self, argument):
+        """Removes the argument and this gate from the argument parents.
+
+        The generation statistics are not updated.
+
+        Args:
+            argument: An existing argument of the gate.
+        """
+        argument.parents.remove(self)
+        self.__argument_ids.discard(argument.id)
+        if isinstance(argument, Gate):
+            self.g_arguments.remove(argument)
+        elif isinstance(argument, BasicEvent):
+            self.b_arguments.remove(argument)
+        elif isinstance(argument, HouseEvent):
+            self.h_arguments.remove(argument)
+        else:
+            self.u_arguments.remove(argument)
+        self.__num_arguments -= 1
+
+    def freeze(self):
+        """Makes the arguments and parents of the gate immutable.
+
+        The gate must not get new arguments or parents after freezing.
+        """
+        super(Gate, self).freeze()
+        self.g_arguments = tuple(self.g_arguments)
+        self.b_arguments = tuple(self.b_arguments)
+        self.h_arguments = tuple(self.h_arguments)
+        self.u_arguments = tuple(self.u_arguments)
+        self.__argument_ids = None
+
+    def __update_stats(self, argument):
+        """Registers the new argument in the generation statistics."""
+        parents = argument.parents
+        first_parent = parents[0].stats_id if len(parents) == 2 else None
+        if isinstance(argument, Gate):
+            self.stats.add_gate_argument(self.stats_id, len(parents),
+                                         first_parent)
+        elif isinstance(argument, BasicEvent):
+            self.stats.add_basic_argument(self.stats_id, len(parents),
+                                          first_parent)
+        else:
+            self.stats.add_argument(self.stats_id)
+
+    def propagate_rank(self):
+        """Raises the ranks of descendants to be greater than parent ranks.
+
+        Only descendants that break the rank order get updated,
+        so the cost is proportional to the affected sub-graph.
+        The graph must be acyclic.
+        """
+        gates = [self]  # to avoid recursion
+        while gates:
+            gate = gates.pop()
+            for arg in gate.g_arguments:
+                if arg.rank <= gate.rank:
+                    arg.rank = gate.rank + 1
+                    gates.append(arg)
 
     def get_ancestors(self):
         """Collects ancestors from this gate.
@@ -103,52 +276,43 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
                 parents.extend(parent.parents)
         return ancestors
 
-    def to_xml(self, printer, nest=False):
+    def get_xml(self, nest=False):
         """Produces the Open-PSA MEF XML definition of the gate.
 
+        The NOT arguments of non-NOT gates are inlined with nesting
+        (one level, with the arguments of the NOT gate as references).
+
         Args:
-            printer: The output stream.
             nest: Nesting of NOT connectives in formulas.
-        """
 
-        def arg_to_xml(type_str, arg):
-            """Produces XML string representation of an argument."""
-            return "<%s name=\"%s\"/>\n" % (type_str, arg.name)
-
-        def args_to_xml(type_str, args):
-            """Produces XML string representation of arguments."""
-            return "".join(arg_to_xml(type_str, arg) for arg in args)
-
-        def convert_formula(gate, nest=False):
-            """Converts the formula of a gate into XML representation."""
-            mef_xml = ""
-            if gate.operator != "null":
-                mef_xml += "<" + gate.operator
-                if gate.operator == "atleast":
-                    mef_xml += " min=\"" + str(gate.k_num) + "\""
-                mef_xml += ">\n"
-            mef_xml += args_to_xml("house-event", gate.h_arguments)
-            mef_xml += args_to_xml("basic-event", gate.b_arguments)
-            mef_xml += args_to_xml("event", gate.u_arguments)
-
-            def converter(arg_gate):
-                """Converter for single nesting NOT connective."""
-                if gate.operator != "not" and arg_gate.operator == "not":
-                    return convert_formula(arg_gate)
-                return arg_to_xml("gate", arg_gate)
-
-            if nest:
-                mef_xml += "".join(converter(x) for x in gate.g_arguments)
-            else:
-                mef_xml += args_to_xml("gate", gate.g_arguments)
+        Returns:
+            The definition lines joined into one string
+            without the trailing newline.
+        """
+        parts = ['<define-gate name="', self.name, '">\n']
+        if nest and self.operator != "not":
+            open_tag, close_tag = _get_tags(self)
+            parts.append(open_tag)
+            _append_refs(parts, self)
+            for arg in self.g_arguments:
+                if arg.operator == "not":
+                    _append_formula(parts, arg)
+                else:
+                    parts.append('<gate name="' + arg.name + '"/>\n')
+            parts.append(close_tag)
+        else:
+            _append_formula(parts, self)
+        parts.append("\n</define-gate>")
+        return "".join(parts)
 
-            if gate.operator != "null":
-                mef_xml += "</" + gate.operator + ">"
-            return mef_xml
+    def to_xml(self, printer, nest=False):
+        """Produces the Open-PSA MEF XML definition of the gate.
 
-        printer('<define-gate name="', self.name, '">')
-        printer(convert_formula(self, nest))
-        printer('</define-gate>')
+        Args:
+            printer: The output stream.
+            nest: Nesting of NOT connectives in formulas.
+        """
+        printer(self.get_xml(nest))
 
     def to_aralia(self, printer):
         """Produces the Aralia definition of the gate.
@@ -190,3 +354,47 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
         line.append(div.join(args))
         line.append(line_end)
         printer("".join(line))
+
+
+class LazyAncestors:
+    """Ancestors of a gate discovered on demand in the order of decreasing rank.
+
+    Gate ranks strictly increase from parents to arguments,
+    so a gate with a rank not lower than the rank of the descendant
+    cannot be its ancestor,
+    and other gates need only the ancestors ranked above them discovered.
+    Membership checks for gates ranked higher than the last checked one
+    are answered without any further graph traversal.
+
+    The ancestors of the gate must not change while this object is in use.
+    """
+
+    def __init__(self, gate):
+        """Starts the discovery from the given gate.
+
+        Args:
+            gate: The gate whose ancestors are queried.
+        """
+        self.__gate = gate
+        self.__discovered = {gate}
+        self.__queue = [(-gate.rank, gate.id, gate)]  # max-heap of ranks
+
+    def num_discovered(self):
+        """Returns the number of gates discovered so far."""
+        return len(self.__discovered)
+
+    def __contains__(self, other):
+        """Checks if the gate is the gate itself or one of its ancestors."""
+        if other is self.__gate:
+            return True
+        if other.rank >= self.__gate.rank:
+            return False
+        queue = self.__queue
+        discovered = self.__discovered
+        while queue and -queue[0][0] > other.rank:
+            _, _, gate = heapq.heappop(queue)
+            for parent in gate.parents:
+                if parent not in discovered:
+                    discovered.add(parent)
+                    heapq.heappush(queue, (-parent.rank, parent.id, parent))
+        return other in discovered
@@ -8,6 +8,8 @@ class HouseEvent(Event):
         state: State of the house event ("true" or "false").
     """
 
+    __slots__ = ("state",)
+
     def __init__(self, name, state):
         """Initializes a house event node.
 
@@ -18,11 +20,20 @@ class HouseEvent(Event):
         super(HouseEvent, self).__init__(name)
         self.state = state
 
+    def get_xml(self):
+        """Produces the Open-PSA MEF XML definition of the house event.
+
+        Returns:
+            The definition lines joined into one string
+            without the trailing newline.
+        """
+        return ('<define-house-event name="' + self.name +
+                '">\n<constant value="' + str(self.state).lower() +
+                '"/>\n</define-house-event>')
+
     def to_xml(self, printer):
         """Produces the Open-PSA MEF XML definition of the house event."""
-        printer('<define-house-event name="', self.name, '">')
-        printer('<constant value="', str(self.state).lower(), '"/>')
-        printer('</define-house-event>')
+        printer(self.get_xml())
 
     def to_aralia(self, printer):
         """Produces the Aralia definition of the house event."""
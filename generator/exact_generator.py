@@ -0,0 +1,279 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Generation of fault trees with the exact numbers of gates and basic events.
+
+The regular generation initializes gates breadth-first
+until the basic events run out,
+so the number of gates only follows the estimates of the factors,
+and constraining it (Factors.constrain_num_gate)
+rewrites the common event factors heuristically.
+
+The exact generation budgets the edges (gate arguments) up front.
+The numbers of arguments of the gates add up
+to the average number of arguments times the number of gates
+(more if needed to give every gate and basic event a parent).
+The edges over one parent per node are split
+between common gates and common basic events
+in the proportion implied by common_b/g and parents_b/g.
+
+The gates are numbered in a topological order:
+every gate takes its parents among the argument slots
+of the gates with smaller numbers,
+so no cycle can appear, and every gate is reachable from the top gate.
+The remaining slots are filled with the basic events.
+The achieved factors may deviate from the requested ones
+(see get_deviations), but the counts never do.
+"""
+
+_MAX_TRIES = 8  # the number of tries to find a new parent for a common gate
+_MIN_ARGS = {"and": 2, "or": 2, "atleast": 3, "not": 1, "xor": 2}
+
+
+def spread(total, count):
+    """Splits the total into nearly equal integer parts.
+
+    Args:
+        total: The non-negative integer to split.
+        count: The number of parts.
+
+    Returns:
+        The list of parts that add up to the total.
+    """
+    base, rest = divmod(total, count)
+    return [base + 1] * rest + [base] * (count - rest)
+
+
+def take(slots, index):
+    """Removes the slot from the unordered list of slots.
+
+    Args:
+        slots: The list of argument slots (the numbers of their gates).
+        index: The position of the slot to remove.
+
+    Returns:
+        The number of the gate of the slot.
+    """
+    gate = slots[index]
+    slots[index] = slots[-1]
+    slots.pop()
+    return gate
+
+
+def get_extra_share(common, parents):
+    """Computes the extra parents per single-parent node.
+
+    Args:
+        common: The fraction of common nodes among the arguments.
+        parents: The average number of parents of common nodes.
+
+    Returns:
+        The number of edges over one parent per node
+        divided by the number of nodes.
+    """
+    extra = common * (parents - 1) / parents  # per edge
+    return extra / (1 - extra)
+
+
+def get_num_args(gates, factors, rng):
+    """Samples the numbers of gate arguments with the exact total.
+
+    A gate gets at most as many arguments as there are basic events
+    (unless the operator needs more),
+    so any gate can be filled with distinct basic events.
+    The K/N gates get their min numbers as well.
+
+    Args:
+        gates: The gates in the topological order.
+        factors: The fault tree generation factors.
+        rng: The source of random numbers.
+
+    Returns:
+        The list of the numbers of arguments of the gates.
+    """
+    min_args = [_MIN_ARGS[x.operator] for x in gates]
+    max_args = [
+        max(factors.num_basic, x) if gate.operator not in ("not", "xor") else x
+        for gate, x in zip(gates, min_args)
+    ]
+    counts = [
+        min(factors.get_num_args(gate, rng), x)
+        for gate, x in zip(gates, max_args)
+    ]
+    num_edges = max(min(round(factors.num_args * len(gates)), sum(max_args)),
+                    len(gates) - 1 + factors.num_basic, sum(min_args))
+    growable = [i for i, x in enumerate(counts) if x < max_args[i]]
+    for _ in range(num_edges - sum(counts)):
+        index = rng.randrange(len(growable))
+        i = growable[index]
+        counts[i] += 1
+        if counts[i] == max_args[i]:
+            take(growable, index)
+    reducible = [i for i, x in enumerate(counts) if x > min_args[i]]
+    for _ in range(sum(counts) - num_edges):
+        index = rng.randrange(len(reducible))
+        i = reducible[index]
+        counts[i] -= 1
+        if counts[i] == min_args[i]:
+            take(reducible, index)
+    for gate, count in zip(gates, counts):
+        if gate.operator == "atleast":
+            gate.k_num = min(gate.k_num, count - 1)
+    return counts
+
+
+def attach_gates(counts, num_extra, factors, rng):
+    """Attaches the gates to the argument slots of their predecessors.
+
+    Args:
+        counts: The numbers of arguments of the gates.
+        num_extra: The number of edges to common gates over one parent.
+        factors: The fault tree generation factors.
+        rng: The source of random numbers.
+
+    Returns:
+        The gate arguments (numbers) of the gates
+        and the slots (the numbers of their gates) left for basic events.
+    """
+    num_gate = len(counts)
+    extra_parents = [0] * num_gate
+    if num_extra and num_gate > 1:
+        num_common = min(num_gate - 1,
+                         max(1, round(num_extra / (factors.parents_g - 1))))
+        for i, extra in zip(rng.sample(range(1, num_gate), num_common),
+                            spread(num_extra, num_common)):
+            extra_parents[i] = extra
+    g_args = [[] for _ in range(num_gate)]
+    slots = [0] * counts[0]
+    for i in range(1, num_gate):
+        parents = [take(slots, rng.randrange(len(slots)))]
+        for _ in range(extra_parents[i]):
+            for _ in range(_MAX_TRIES):
+                if not slots:
+                    break
+                index = rng.randrange(len(slots))
+                if slots[index] not in parents:
+                    parents.append(take(slots, index))
+                    break
+        for parent in parents:
+            g_args[parent].append(i)
+        slots.extend([i] * counts[i])
+    return g_args, slots
+
+
+def fill_basic_events(slots, num_gate, factors, rng):
+    """Distributes the basic events to the argument slots.
+
+    Every basic event gets a slot,
+    and the rest of the slots go to common basic events.
+
+    Args:
+        slots: The argument slots (the numbers of their gates).
+        num_gate: The number of gates.
+        factors: The fault tree generation factors.
+        rng: The source of random numbers.
+
+    Returns:
+        The basic event arguments (numbers) of the gates.
+    """
+    num_basic = factors.num_basic
+    num_parents = [1] * num_basic
+    num_extra = len(slots) - num_basic
+    if num_extra:
+        num_common = min(num_basic,
+                         max(1, round(num_extra / (factors.parents_b - 1))))
+        for i, extra in zip(rng.sample(range(num_basic), num_common),
+                            spread(num_extra, num_common)):
+            num_parents[i] += extra
+    events = [i for i, count in enumerate(num_parents) for _ in range(count)]
+    rng.shuffle(events)
+    b_args = [[] for _ in range(num_gate)]
+    for gate, event in zip(slots, events):
+        args = b_args[gate]
+        if len(args) == num_basic:
+            continue  # too few basic events for the operator
+        while event in args:  # another parent instead of the duplicate
+            event = rng.randrange(num_basic)
+        args.append(event)
+    return b_args
+
+
+def init_gates(fault_tree, num_gate):
+    """Initializes the gates and basic events with the exact counts.
+
+    Args:
+        fault_tree: The fault tree container with only the top gate.
+        num_gate: The number of gates including the top gate.
+    """
+    factors = fault_tree.factors
+    rng = fault_tree.rng
+    gates = [fault_tree.top_gate]
+    gates.extend(fault_tree.construct_gate() for _ in range(num_gate - 1))
+    counts = get_num_args(gates, factors, rng)
+    num_extra = sum(counts) - (num_gate - 1) - factors.num_basic
+    share_b = factors.num_basic * get_extra_share(factors.common_b,
+                                                  factors.parents_b)
+    share_g = (num_gate - 1) * get_extra_share(factors.common_g,
+                                               factors.parents_g)
+    num_extra_g = round(num_extra * share_g / (share_b + share_g))
+    g_args, slots = attach_gates(counts, num_extra_g, factors, rng)
+    b_args = fill_basic_events(slots, num_gate, factors, rng)
+    basic_events = [
+        fault_tree.construct_basic_event() for _ in range(factors.num_basic)
+    ]
+    for gate, gate_args, basic_args in zip(gates, g_args, b_args):
+        for i in gate_args:
+            gate.add_argument(gates[i])
+        for i in basic_args:
+            gate.add_argument(basic_events[i])
+
+
+def get_deviations(factors, metrics):
+    """Compares the achieved factors with the requested ones.
+
+    Args:
+        factors: The requested factors.
+        metrics: The metrics of the generated fault tree.
+
+    Returns:
+        A dictionary of the requested and achieved values by the factor name
+        (JSON-serializable).
+    """
+    return {
+        name: {
+            "requested": requested,
+            "achieved": metrics[metric]
+        } for name, metric, requested in (
+            ("num_basic", "num_basic", factors.num_basic),
+            ("num_gate", "num_gate", factors.get_num_gate()),
+            ("num_args", "avg_num_args", factors.num_args),
+            ("common_b", "common_b", factors.common_b),
+            ("common_g", "common_g", factors.common_g),
+            ("parents_b", "parents_b", factors.parents_b),
+            ("parents_g", "parents_g", factors.parents_g))
+    }
+
+
+def write_deviations(deviations, printer):
+    """Writes the deviations of the achieved factors from the requested ones.
+
+    Args:
+        deviations: The requested and achieved factors (see get_deviations).
+        printer: The output stream.
+    """
+    printer('<!--\nThe achieved factors against the requested ones:\n')
+    for name, values in deviations.items():
+        printer(name, ': ', values["achieved"], ' (requested ',
+                values["requested"], ')')
+    printer('-->\n')
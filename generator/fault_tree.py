@@ -14,13 +14,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Fault tree classes and common facilities."""
 
-# from ordered_set import OrderedSet
-
 from collections import deque
 
-from event.basic_event import BasicEvent
-from event.gate import Gate
-from event.house_event import HouseEvent
+from ordered_set import OrderedSet
+
+from generator import profiler
+from generator.bulk_writer import write_many
+from generator.event.basic_event import BasicEvent
+from generator.event.gate import Gate
+from generator.event.house_event import HouseEvent
 
 
 class CcfGroup:  # pylint: disable=too-few-public-methods
@@ -46,31 +48,32 @@ class CcfGroup:  # pylint: disable=too-few-public-methods
         self.model = None
         self.factors = []
 
-    def to_xml(self, printer):
-        """Produces the Open-PSA MEF XML definition of the CCF group."""
-        printer('<define-CCF-group name="', self.name, '"', ' model="',
-                self.model, '">')
-        printer('<members>')
-        for member in self.members:
-            printer('<basic-event name="', member.name, '"/>')
-        printer('</members>')
-
-        printer('<distribution>')
-        printer('<float value="', self.prob, '"/>')
-        printer('</distribution>')
+    def get_xml(self):
+        """Produces the Open-PSA MEF XML definition of the CCF group.
 
-        printer('<factors>')
+        Returns:
+            The definition lines joined into one string
+            without the trailing newline.
+        """
         assert self.model == "MGL"
         assert self.factors
-        level = 2
-        for factor in self.factors:
-            printer('<factor level="', level, '">')
-            printer('<float value="', factor, '"/>')
-            printer('</factor>')
-            level += 1
-        printer('</factors>')
+        parts = [
+            '<define-CCF-group name="', self.name, '" model="', self.model,
+            '">\n<members>\n'
+        ]
+        for member in self.members:
+            parts += ('<basic-event name="', member.name, '"/>\n')
+        parts += ('</members>\n<distribution>\n<float value="',
+                  str(self.prob), '"/>\n</distribution>\n<factors>\n')
+        for level, factor in enumerate(self.factors, start=2):
+            parts += ('<factor level="', str(level), '">\n<float value="',
+                      str(factor), '"/>\n</factor>\n')
+        parts.append('</factors>\n</define-CCF-group>')
+        return "".join(parts)
 
-        printer('</define-CCF-group>')
+    def to_xml(self, printer):
+        """Produces the Open-PSA MEF XML definition of the CCF group."""
+        printer(self.get_xml())
 
 
 class FaultTree(object):  # pylint: disable=too-many-instance-attributes
@@ -85,6 +88,7 @@ class FaultTree(object):  # pylint: disable=too-many-instance-attributes
         house_events: A list of all house events created for the fault tree.
         ccf_groups: A collection of created CCF groups.
         non_ccf_events: A list of basic events that are not in CCF groups.
+        profile: The optional profile of the generation and output phases.
     """
 
     def __init__(self, name=None):
@@ -101,6 +105,7 @@ class FaultTree(object):  # pylint: disable=too-many-instance-attributes
         self.house_events: OrderedSet[HouseEvent] = OrderedSet()
         self.ccf_groups: OrderedSet[CcfGroup] = OrderedSet()
         self.non_ccf_events = OrderedSet()  # must be assigned directly.
+        self.profile = None
 
     def __getstate__(self):
         return {
@@ -123,6 +128,7 @@ class FaultTree(object):  # pylint: disable=too-many-instance-attributes
         self.house_events: OrderedSet[HouseEvent] = state['house_events']
         self.ccf_groups: OrderedSet[CcfGroup] = state['ccf_groups']
         self.non_ccf_events = state['non_ccf_events']
+        self.profile = None
 
     def to_xml(self, printer, nest=False):
         """Produces the Open-PSA MEF XML definition of the fault tree.
@@ -138,19 +144,14 @@ class FaultTree(object):  # pylint: disable=too-many-instance-attributes
         printer('<opsa-mef>')
         printer('<define-fault-tree name="', self.name, '">')
 
-        for gate in self.gates:
-            gate.to_xml(printer, nest)
-
-        for ccf_group in self.ccf_groups:
-            ccf_group.to_xml(printer)
+        write_many(printer, (x.get_xml(nest) for x in self.gates))
+        write_many(printer, (x.get_xml() for x in self.ccf_groups))
         printer('</define-fault-tree>')
 
         printer('<model-data>')
-        for basic_event in (self.non_ccf_events if self.ccf_groups else self.basic_events):
-            basic_event.to_xml(printer)
-
-        for house_event in self.house_events:
-            house_event.to_xml(printer)
+        write_many(printer, (x.get_xml() for x in (
+            self.non_ccf_events if self.ccf_groups else self.basic_events)))
+        write_many(printer, (x.get_xml() for x in self.house_events))
         printer('</model-data>')
         printer('</opsa-mef>')
 
@@ -162,6 +163,19 @@ class FaultTree(object):  # pylint: disable=too-many-instance-attributes
                 self.house_events.update(gate.h_arguments)
                 self.add_gates(gates=gate.g_arguments, shallow=False)
 
+    def freeze(self):
+        """Makes the arguments and parents of all events immutable.
+
+        The events are compacted after the construction of the fault tree
+        is complete.
+        """
+        for event in self.gates:
+            event.freeze()
+        for event in self.basic_events:
+            event.freeze()
+        for event in self.house_events:
+            event.freeze()
+
     def to_aralia(self, printer):
         """Produces the Aralia definition of the fault tree.
 
@@ -177,7 +191,8 @@ class FaultTree(object):  # pylint: disable=too-many-instance-attributes
         printer(self.name)
         printer()
 
-        sorted_gates = toposort_gates([self.top_gate], self.gates)
+        with profiler.phase(self.profile, "toposort_gates"):
+            sorted_gates = toposort_gates([self.top_gate], self.gates)
         for gate in sorted_gates:
             gate.to_aralia(printer)
 
@@ -197,8 +212,8 @@ class FaultTree(object):  # pylint: disable=too-many-instance-attributes
             if gate.num_parents() > 1:
                 print('Unexpected number of parents for gate ' + gate.name)
             elif gate.num_parents() > 0:
-                parent: Gate = gate.parents.pop()
-                parent.g_arguments.remove(gate)
+                parent: Gate = gate.parents[0]
+                parent.remove_argument(gate)
                 for x in gate.g_arguments:
                     parent.add_argument(x)
                 for x in gate.b_arguments:
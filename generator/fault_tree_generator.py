@@ -41,18 +41,29 @@ guaranteed to be preserved and used as they are.
 
 # pylint: disable=too-many-lines
 
-from collections import deque
+import copy
+import json
 import random
-import sys
 
 import argparse as ap
-# from generator.probability.point_estimate import PointEstimate
-#
-# from generator.event.basic_event import BasicEvent
-# from generator.event.house_event import HouseEvent
-# from generator.event.gate import Gate
 
-from fault_tree import CcfGroup, FaultTree
+from generator import exact_generator
+from generator import generation_steps
+from generator import sharded_generator
+from generator import streaming_generator
+from generator import batch_sampler
+from generator import bulk_writer
+from generator import model_cache
+from generator import planner
+from generator import profiler
+from generator.probability.point_estimate import PointEstimate
+from generator.event.basic_event import BasicEvent
+from generator.event.house_event import HouseEvent
+from generator.event.gate import Gate, LazyAncestors
+from generator.fault_tree import CcfGroup, FaultTree
+from generator.generation_stats import GenerationStats
+from generator.graph_core import CompactFaultTree
+from generator.parent_count_index import ParentCountIndex
 
 
 class FactorError(Exception):
@@ -108,6 +119,11 @@ class Factors:  # pylint: disable=too-many-instance-attributes
         # Special case with the constrained number of gates
         self.__num_gate = None  # If set, all other factors get affected.
 
+        # Optional batch sampling of node attributes
+        self.__batch_seed = None
+        self.__batch_size = 0
+        self.__sampler = None  # set up upon calculation
+
     def set_min_max_prob(self, min_value, max_value):
         """Sets the probability boundaries for basic events.
 
@@ -214,6 +230,94 @@ class Factors:  # pylint: disable=too-many-instance-attributes
         return ((2 * num_args - sum(var_contrib) - 2 * sum(const_contrib)) /
                 sum(var_weights))
 
+    def set_batch_sampling(self, seed, block_size):
+        """Enables sampling of node attributes in NumPy pre-drawn blocks.
+
+        Gate operators, the number of gate arguments, K/N min numbers,
+        and basic event probabilities are drawn from their own streams
+        instead of the given sources of random numbers.
+        Since the streams belong to the factors,
+        the factors with batch sampling must not be shared
+        by concurrent generations.
+
+        Args:
+            seed: The seed of the batch sampler.
+            block_size: The number of values drawn at once (0 to disable).
+
+        Raises:
+            FactorError: Invalid values or NumPy is not available.
+        """
+        if block_size < 0:
+            raise FactorError("Batch size can't be negative.")
+        if block_size and not batch_sampler.is_available():
+            raise FactorError("Batch sampling requires NumPy.")
+        self.__batch_seed = seed
+        self.__batch_size = block_size
+
+    def split(self, num_shards, shard, seed=None):
+        """Provides the factors for one of sub-trees of equal size.
+
+        The basic events, house events, and constrained gates
+        are distributed among the shards;
+        CCF groups are left for the whole fault tree.
+        The shard factors must be calculated before use.
+
+        Args:
+            num_shards: The number of sub-trees.
+            shard: The index of the sub-tree in [0, num_shards).
+            seed: The seed for the batch sampling of the shard if enabled.
+
+        Returns:
+            A shallow copy of the factors with the share of the sizes.
+
+        Raises:
+            FactorError: Too many shards for the number of basic events.
+        """
+        if num_shards > self.num_basic:
+            raise FactorError("Too many shards for the # of basic events.")
+
+        def get_share(total):
+            """Splits the total as evenly as possible."""
+            return total // num_shards + (shard < total % num_shards)
+
+        shard_factors = copy.copy(self)
+        shard_factors.num_basic = get_share(self.num_basic)
+        shard_factors.num_house = get_share(self.num_house)
+        shard_factors.num_ccf = 0
+        if self.__num_gate:
+            shard_factors.__num_gate = max(get_share(self.__num_gate), 1)
+        shard_factors.__batch_seed = seed
+        shard_factors.__sampler = None
+        return shard_factors
+
+    def get_state(self):
+        """Provides the normalized setup of the factors.
+
+        The factors with equal states generate the same fault trees
+        from the same random numbers.
+        The values keep their types (e.g., 2 and 2.0 differ)
+        since the types show up in the output.
+
+        Returns:
+            A dictionary of the setup values (JSON-serializable).
+        """
+        return {
+            "min_prob": self.min_prob,
+            "max_prob": self.max_prob,
+            "num_basic": self.num_basic,
+            "num_house": self.num_house,
+            "num_ccf": self.num_ccf,
+            "common_b": self.common_b,
+            "common_g": self.common_g,
+            "num_args": self.num_args,
+            "parents_b": self.parents_b,
+            "parents_g": self.parents_g,
+            "weights_g": self.__weights_g[:],
+            "num_gate": self.__num_gate,
+            "batch_seed": self.__batch_seed if self.__batch_size else None,
+            "batch_size": self.__batch_size
+        }
+
     def calculate(self):
         """Calculates any derived factors from the setup.
 
@@ -221,6 +325,11 @@ class Factors:  # pylint: disable=too-many-instance-attributes
         """
         self.__max_args = Factors.__calculate_max_args(self.num_args,
                                                        self.__norm_weights)
+        self.__sampler = None
+        if self.__batch_size:
+            self.__sampler = batch_sampler.BatchSampler(
+                self.__batch_seed, self.__batch_size, self.__norm_weights,
+                self.__max_args, self.min_prob, self.max_prob)
         g_factor = 1 - self.common_g + self.common_g / self.parents_g
         self.__ratio = self.num_args * g_factor - 1
         self.__percent_basic = self.__ratio / (1 + self.__ratio)
@@ -269,19 +378,24 @@ class Factors:  # pylint: disable=too-many-instance-attributes
         for i in range(1, len(self.__cum_dist)):
             self.__cum_dist[i] += self.__cum_dist[i - 1]
 
-    def get_random_operator(self):
+    def get_random_operator(self, rng=random):
         """Samples the gate operator.
 
+        Args:
+            rng: The source of random numbers.
+
         Returns:
             A randomly chosen gate operator.
         """
-        r_num = random.random()
+        if self.__sampler:
+            return Factors.__OPERATORS[self.__sampler.operator()]
+        r_num = rng.random()
         bin_num = 1
         while self.__cum_dist[bin_num] <= r_num:
             bin_num += 1
         return Factors.__OPERATORS[bin_num - 1]
 
-    def get_num_args(self, gate):
+    def get_num_args(self, gate, rng=random):
         """Randomly selects the number of arguments for the given gate type.
 
         This function has a side effect.
@@ -290,6 +404,7 @@ class Factors:  # pylint: disable=too-many-instance-attributes
 
         Args:
             gate: The parent gate for arguments.
+            rng: The source of random numbers.
 
         Returns:
             Random number of arguments.
@@ -299,19 +414,35 @@ class Factors:  # pylint: disable=too-many-instance-attributes
         if gate.operator == "xor":
             return 2
 
+        if self.__sampler:
+            if gate.operator == "atleast":
+                num_args, gate.k_num = self.__sampler.atleast_args()
+                return num_args
+            return self.__sampler.num_args()
+
         max_args = int(self.__max_args)
         # Dealing with the fractional part.
-        if random.random() < (self.__max_args - max_args):
+        if rng.random() < (self.__max_args - max_args):
             max_args += 1
 
         if gate.operator == "atleast":
             if max_args < 3:
                 max_args = 3
-            num_args = random.randint(3, max_args)
-            gate.k_num = random.randint(2, num_args - 1)
+            num_args = rng.randint(3, max_args)
+            gate.k_num = rng.randint(2, num_args - 1)
             return num_args
 
-        return random.randint(2, max_args)
+        return rng.randint(2, max_args)
+
+    def get_random_probability(self, rng=random):
+        """Samples the probability for a basic event.
+
+        Args:
+            rng: The source of random numbers.
+        """
+        if self.__sampler:
+            return self.__sampler.probability()
+        return rng.uniform(self.min_prob, self.max_prob)
 
     def get_percent_gate(self):
         """Returns the percentage of gates that should be in arguments."""
@@ -367,6 +498,21 @@ class Factors:  # pylint: disable=too-many-instance-attributes
         return int(self.common_g * self.__percent_gate * self.num_args *
                    num_gate / self.parents_g)
 
+    def fix_num_gate(self, num_gate):
+        """Fixes the number of gates for the exact generation.
+
+        Unlike constrain_num_gate, the other factors are not changed.
+
+        Args:
+            num_gate: The total number of gates in the future fault tree
+
+        Raises:
+            FactorError: Invalid number of gates.
+        """
+        if num_gate < 1:
+            raise FactorError("# of gates can't be less than 1.")
+        self.__num_gate = num_gate
+
     def constrain_num_gate(self, num_gate):
         """Constrains the number of gates.
 
@@ -404,20 +550,38 @@ class GeneratorFaultTree(FaultTree):
 
     The construction of fault tree members are handled through this object.
     It is assumed that no removal is going to happen after construction.
+    The nodes of the generation steps (see generator.generation_steps)
+    are the event objects.
 
-    Args:
+    Attributes:
         factors: The fault tree generation factors.
+        rng: The source of random numbers for this fault tree only.
+        house_targets: Gates that can get house events
+            (not the top gate and not NOT/XOR gates).
+        exhaustion_targets: Gates that can get gates
+            upon the exhaustion of the queue (not common or NOT/XOR gates).
+        stats: The running statistics of the generation.
     """
 
-    def __init__(self, name, factors):
+    def __init__(self, name, factors, rng=random):
         """Initializes an empty fault tree.
 
         Args:
             name: The name of the system described by the fault tree container.
             factors: Fully configured generation factors.
+            rng: A random.Random instance (the shared random module if omitted).
         """
         super(GeneratorFaultTree, self).__init__(name)
         self.factors = factors
+        self.rng = rng
+        self.house_targets = []
+        self.exhaustion_targets = []
+        self.stats = GenerationStats()
+
+    def __track(self, gate):
+        """Registers the new gate in the generation statistics."""
+        gate.stats = self.stats
+        gate.stats_id = self.stats.add_gate(gate.operator)
 
     def construct_top_gate(self, root_name):
         """Constructs and assigns a new gate suitable for being a root.
@@ -426,21 +590,31 @@ class GeneratorFaultTree(FaultTree):
             root_name: Unique name for the root gate.
         """
         assert not self.top_gate and not self.top_gates
-        operator = self.factors.get_random_operator()
+        operator = self.factors.get_random_operator(self.rng)
         while operator in ("xor", "not"):
-            operator = self.factors.get_random_operator()
+            operator = self.factors.get_random_operator(self.rng)
         self.top_gate = Gate(root_name, operator)
         self.gates.append(self.top_gate)
+        self.__track(self.top_gate)
+        self.exhaustion_targets.append(self.top_gate)
 
-    def construct_gate(self):
+    def construct_gate(self, common=False):
         """Constructs a new gate.
 
+        Args:
+            common: True if the gate is going to be common.
+
         Returns:
             A fully initialized gate with random attributes.
         """
         gate = Gate("G" + str(len(self.gates) + 1),
-                    self.factors.get_random_operator())
+                    self.factors.get_random_operator(self.rng))
         self.gates.append(gate)
+        self.__track(gate)
+        if gate.operator not in ("not", "xor"):
+            self.house_targets.append(gate)
+            if not common:
+                self.exhaustion_targets.append(gate)
         return gate
 
     def construct_basic_event(self):
@@ -451,7 +625,7 @@ class GeneratorFaultTree(FaultTree):
         """
         basic_event = BasicEvent(
             "B" + str(len(self.basic_events) + 1),
-            PointEstimate(value=random.uniform(self.factors.min_prob, self.factors.max_prob)))
+            PointEstimate(value=self.factors.get_random_probability(self.rng)))
         self.basic_events.append(basic_event)
         return basic_event
 
@@ -462,7 +636,7 @@ class GeneratorFaultTree(FaultTree):
             A fully initialized house event with a random state.
         """
         house_event = HouseEvent("H" + str(len(self.house_events) + 1),
-                                 random.choice(["true", "false"]))
+                                 self.rng.choice(["true", "false"]))
         self.house_events.append(house_event)
         return house_event
 
@@ -479,226 +653,141 @@ class GeneratorFaultTree(FaultTree):
         ccf_group = CcfGroup("CCF" + str(len(self.ccf_groups) + 1))
         self.ccf_groups.append(ccf_group)
         ccf_group.members = members
-        ccf_group.prob = random.uniform(self.factors.min_prob,
-                                        self.factors.max_prob)
+        ccf_group.prob = self.rng.uniform(self.factors.min_prob,
+                                          self.factors.max_prob)
         ccf_group.model = "MGL"
-        levels = random.randint(2, len(members))
-        ccf_group.factors = [random.uniform(0.1, 1) for _ in range(levels - 1)]
+        levels = self.rng.randint(2, len(members))
+        ccf_group.factors = [
+            self.rng.uniform(0.1, 1) for _ in range(levels - 1)
+        ]
         return ccf_group
 
+    @property
+    def top_node(self):
+        """The root gate for the generation steps."""
+        return self.top_gate
 
-def candidate_gates(common_gate):
-    """Lazy generator of candidates for common gates.
-
-    Args:
-        common_gate: A list of common gates.
-
-    Yields:
-        A next gate candidate from common gates container.
-    """
-    orphans = [x for x in common_gate if not x.parents]
-    random.shuffle(orphans)
-    for i in orphans:
-        yield i
-
-    single_parent = [x for x in common_gate if len(x.parents) == 1]
-    random.shuffle(single_parent)
-    for i in single_parent:
-        yield i
-
-    multi_parent = [x for x in common_gate if len(x.parents) > 1]
-    random.shuffle(multi_parent)
-    for i in multi_parent:
-        yield i
-
-
-def correct_for_exhaustion(gates_queue, common_gate, fault_tree):
-    """Corrects the generation for queue exhaustion.
-
-    Corner case when not enough new basic events initialized,
-    but there are no more intermediate gates to use
-    due to a big ratio or just random accident.
-
-    Args:
-        gates_queue: A deque of gates to be initialized.
-        common_gate: A list of common gates.
-        fault_tree: The fault tree container of all events and constructs.
-    """
-    if gates_queue:
-        return
-    if len(fault_tree.basic_events) < fault_tree.factors.num_basic:
-        # Initialize one more gate
-        # by randomly choosing places in the fault tree.
-        random_gate = random.choice(fault_tree.gates)
-        while (random_gate.operator == "not" or random_gate.operator == "xor" or
-               random_gate in common_gate):
-            random_gate = random.choice(fault_tree.gates)
-        new_gate = fault_tree.construct_gate()
-        random_gate.add_argument(new_gate)
-        gates_queue.append(new_gate)
+    def get_num_args(self, gate):
+        """Samples the number of arguments for the gate (see Factors)."""
+        return self.factors.get_num_args(gate, self.rng)
 
+    @staticmethod
+    def num_arguments(gate):
+        """Returns the number of arguments of the gate."""
+        return gate.num_arguments()
 
-def choose_basic_event(s_common, common_basic, fault_tree):
-    """Creates a new basic event or uses a common one for gate arguments.
+    @staticmethod
+    def num_parents(gate):
+        """Returns the number of parents of the gate."""
+        return gate.num_parents()
 
-    Args:
-        s_common: Sampled factor to choose common basic events.
-        common_basic: A list of common basic events to choose from.
-        fault_tree: The fault tree container of all events and constructs.
+    @staticmethod
+    def has_gate_argument(gate, arg):
+        """Checks if the gate has the other gate as an argument."""
+        return gate.has_argument(arg)
 
-    Returns:
-        Basic event argument for a gate.
-    """
-    if s_common >= fault_tree.factors.common_b or not common_basic:
-        return fault_tree.construct_basic_event()
+    @staticmethod
+    def add_gate_argument(gate, arg):
+        """Adds the other gate into the arguments of the gate."""
+        gate.add_argument(arg)
 
-    orphans = [x for x in common_basic if not x.parents]
-    if orphans:
-        return random.choice(orphans)
+    @staticmethod
+    def add_basic_argument(gate, basic_event):
+        """Adds the basic event into the arguments of the gate."""
+        gate.add_argument(basic_event)
 
-    single_parent = [x for x in common_basic if len(x.parents) == 1]
-    if single_parent:
-        return random.choice(single_parent)
+    @staticmethod
+    def add_house_argument(gate, house_event):
+        """Adds the house event into the arguments of the gate."""
+        gate.add_argument(house_event)
 
-    return random.choice(common_basic)
+    @staticmethod
+    def get_ancestors(gate):
+        """Provides lazy ancestors of the gate for cycle checks."""
+        return LazyAncestors(gate)
 
+    @staticmethod
+    def finalize_gate(gate):
+        """Processes the gate with all the arguments.
 
-def init_gates(gates_queue, common_basic, common_gate, fault_tree):
-    """Initializes gates and other basic events.
+        The gates keep the ids of their arguments until freezing.
+        """
+        del gate
 
-    Args:
-        gates_queue: A deque of gates to be initialized.
-        common_basic: A list of common basic events.
-        common_gate: A list of common gates.
-        fault_tree: The fault tree container of all events and constructs.
-    """
-    # Get an intermediate gate to initialize breadth-first
-    gate = gates_queue.popleft()
-
-    num_arguments = fault_tree.factors.get_num_args(gate)
-
-    ancestors = None  # needed for cycle prevention
-    max_tries = len(common_gate)  # the number of maximum tries
-    num_tries = 0  # the number of tries to get a common gate
-
-    # pylint: disable=too-many-nested-blocks
-    # This code is both hot and coupled for performance reasons.
-    # There may be a better solution than the current approach.
-    while gate.num_arguments() < num_arguments:
-        s_percent = random.random()  # sample percentage of gates
-        s_common = random.random()  # sample the reuse frequency
-
-        # Case when the number of basic events is already satisfied
-        if len(fault_tree.basic_events) == fault_tree.factors.num_basic:
-            s_common = 0  # use only common nodes
-
-        if s_percent < fault_tree.factors.get_percent_gate():
-            # Create a new gate or use a common one
-            if s_common < fault_tree.factors.common_g and num_tries < max_tries:
-                # Lazy evaluation of ancestors
-                if not ancestors:
-                    ancestors = gate.get_ancestors()
-
-                for random_gate in candidate_gates(common_gate):
-                    num_tries += 1
-                    if num_tries >= max_tries:
-                        break
-                    if random_gate in gate.g_arguments or random_gate is gate:
-                        continue
-                    if (not random_gate.g_arguments or
-                            random_gate not in ancestors):
-                        if not random_gate.parents:
-                            gates_queue.append(random_gate)
-                        gate.add_argument(random_gate)
-                        break
-            else:
-                new_gate = fault_tree.construct_gate()
-                gate.add_argument(new_gate)
-                gates_queue.append(new_gate)
-        else:
-            gate.add_argument(
-                choose_basic_event(s_common, common_basic, fault_tree))
+    def index_common_events(self, basic_events, gates):
+        """Tracks common basic events and gates by their number of parents.
 
-    correct_for_exhaustion(gates_queue, common_gate, fault_tree)
+        Args:
+            basic_events: An iterable of common basic events.
+            gates: An iterable of common gates.
 
+        Returns:
+            Parent count indexes of the common basic events and gates
+            updated by the events.
+        """
+        return (ParentCountIndex(basic_events, rng=self.rng),
+                ParentCountIndex(gates, rng=self.rng))
 
-def distribute_house_events(fault_tree):
-    """Distributes house events to already initialized gates.
+    def basic_event_nodes(self):
+        """Returns a new list of all the basic events."""
+        return list(self.basic_events)
 
-    Args:
-        fault_tree: The fault tree container of all events and constructs.
-    """
-    while len(fault_tree.house_events) < fault_tree.factors.num_house:
-        target_gate = random.choice(fault_tree.gates)
-        if (target_gate is not fault_tree.top_gate and
-                target_gate.operator != "xor" and
-                target_gate.operator != "not"):
-            target_gate.add_argument(fault_tree.construct_house_event())
+    def set_non_ccf_events(self, members):
+        """Assigns the basic events that are not in CCF groups.
 
+        Args:
+            members: A list of basic events.
+        """
+        self.non_ccf_events = members
 
-def generate_ccf_groups(fault_tree):
-    """Creates CCF groups from the existing basic events.
 
-    Args:
-        fault_tree: The fault tree container of all events and constructs.
-    """
-    if fault_tree.factors.num_ccf:
-        members = fault_tree.basic_events[:]
-        random.shuffle(members)
-        first_mem = 0
-        last_mem = 0
-        while len(fault_tree.ccf_groups) < fault_tree.factors.num_ccf:
-            max_args = int(2 * fault_tree.factors.num_args - 2)
-            group_size = random.randint(2, max_args)
-            last_mem = first_mem + group_size
-            if last_mem > len(members):
-                break
-            fault_tree.construct_ccf_group(members[first_mem:last_mem])
-            first_mem = last_mem
-        fault_tree.non_ccf_events = members[first_mem:]
-
-
-def generate_fault_tree(ft_name, root_name, factors):
+def generate_fault_tree(ft_name, root_name, factors, compact=False,
+                        rng=random, workers=1, profile=None, exact=False):
     """Generates a fault tree of specified complexity.
 
     The Factors class attributes are used as parameters for complexity.
+    Generations with separate random.Random instances
+    share no state other than the factors,
+    so they can run concurrently (e.g., in a thread pool)
+    unless the factors use batch sampling.
 
     Args:
         ft_name: The name of the fault tree.
         root_name: The name for the root gate of the fault tree.
         factors: Factors for fault tree generation.
+        compact: Build into the array-backed graph core
+            (CompactFaultTree) instead of the event objects.
+            The same random numbers produce the same fault tree.
+        rng: A random.Random instance to draw random numbers from
+            instead of the shared random module.
+        workers: The number of sub-trees generated in parallel processes
+            and stitched into the compact fault tree.
+            The result depends on the number of workers.
+        profile: The optional profile to record the generation phases
+            (not recorded for workers).
+        exact: Generate exactly the estimated number of gates
+            (see exact_generator) into the event objects.
 
     Returns:
         Top gate of the created fault tree.
+
+    Raises:
+        FactorError: Too many workers for the number of basic events.
+        ValueError: The exact generation with the compact graph or workers.
     """
-    fault_tree = GeneratorFaultTree(ft_name, factors)
-    fault_tree.construct_top_gate(root_name)
-
-    # Estimating the parameters
-    num_gate = factors.get_num_gate()
-    num_common_basic = factors.get_num_common_basic(num_gate)
-    num_common_gate = factors.get_num_common_gate(num_gate)
-    common_basic = [
-        fault_tree.construct_basic_event() for _ in range(num_common_basic)
-    ]
-    common_gate = [fault_tree.construct_gate() for _ in range(num_common_gate)]
-
-    # Container for not yet initialized gates
-    # A deque is used to traverse the tree breadth-first
-    gates_queue = deque()
-    gates_queue.append(fault_tree.top_gate)
-    while gates_queue:
-        init_gates(gates_queue, common_basic, common_gate, fault_tree)
-
-    assert (not [x for x in fault_tree.basic_events if x.is_orphan()])
-    assert (not [
-        x for x in fault_tree.gates
-        if x.is_orphan() and x is not fault_tree.top_gate
-    ])
-
-    distribute_house_events(fault_tree)
-    generate_ccf_groups(fault_tree)
-    return fault_tree
+    if exact and (compact or workers > 1):
+        raise ValueError("The exact generation needs the event objects.")
+    if workers > 1:
+        return sharded_generator.generate_fault_tree(ft_name, root_name,
+                                                     factors, workers, rng)
+    if compact:
+        fault_tree = CompactFaultTree(ft_name, root_name, factors, rng)
+        fault_tree.construct_top_gate()
+    else:
+        fault_tree = GeneratorFaultTree(ft_name, factors, rng)
+        fault_tree.construct_top_gate(root_name)
+    fault_tree.profile = profile
+    return generation_steps.generate(fault_tree, exact)
 
 
 def write_info(fault_tree, printer, seed):
@@ -734,31 +823,12 @@ def write_info(fault_tree, printer, seed):
     printer('-->')
 
 
-def get_size_summary(fault_tree, printer):
-    """Gathers information about the size of the fault tree.
-
-    Args:
-        fault_tree: A full, valid, well-formed fault tree.
-        printer: The output stream.
-    """
-    gate_count = {'and': 0, 'or': 0, 'atleast': 0, 'not': 0, 'xor': 0}
-    for gate in fault_tree.gates:
-        gate_count[gate.operator] = gate_count[gate.operator] + 1
-
-    printer('The number of basic events: ', len(fault_tree.basic_events))
-    printer('The number of house events: ', len(fault_tree.house_events))
-    printer('The number of CCF groups: ', len(fault_tree.ccf_groups))
-    printer('The number of gates: ', len(fault_tree.gates))
-    printer('    AND gates: ', gate_count['and'])
-    printer('    OR gates: ', gate_count['or'])
-    printer('    K/N gates: ', gate_count['atleast'])
-    printer('    NOT gates: ', gate_count['not'])
-    printer('    XOR gates: ', gate_count['xor'])
-
-
 def calculate_complexity_factors(fault_tree):
     """Computes complexity factors of the generated fault tree.
 
+    The running statistics of the generation are used if available.
+    Otherwise, the fault tree is traversed.
+
     Args:
         fault_tree: A full, valid, well-formed fault tree.
 
@@ -767,6 +837,8 @@ def calculate_complexity_factors(fault_tree):
         common_b: fraction of common basic events in basic events per gate
         common_g: fraction of common gates in gates per gate
     """
+    if fault_tree.stats is not None:
+        return fault_tree.stats.get_complexity_factors()
     frac_b = 0
     common_b = 0
     common_g = 0
@@ -780,38 +852,107 @@ def calculate_complexity_factors(fault_tree):
         if gate.g_arguments:
             num_common_g = len([x for x in gate.g_arguments if x.is_common()])
             common_g += num_common_g / num_g_arguments
-    common_b /= len([x for x in fault_tree.gates if x.b_arguments])
-    common_g /= len([x for x in fault_tree.gates if x.g_arguments])
+    with_b = len([x for x in fault_tree.gates if x.b_arguments])
+    with_g = len([x for x in fault_tree.gates if x.g_arguments])
+    common_b = common_b / with_b if with_b else 0
+    common_g = common_g / with_g if with_g else 0
     frac_b /= len(fault_tree.gates)
     return frac_b, common_b, common_g
 
 
-def get_complexity_summary(fault_tree, printer):
-    """Gathers information about the complexity factors of the fault tree.
+def get_metrics(fault_tree):
+    """Computes the size and complexity metrics of the generated fault tree.
+
+    The running statistics of the generation are used if available.
+    Otherwise, the fault tree is traversed.
 
     Args:
         fault_tree: A full, valid, well-formed fault tree.
-        printer: The output stream.
+
+    Returns:
+        A dictionary of the metrics (JSON-serializable).
+        The average number of parents is None without common events.
     """
+    stats = fault_tree.stats
+    if stats is not None:
+        gate_count = dict(stats.gate_count)
+        num_arguments = stats.num_arguments
+        num_common_b = stats.num_common_basic
+        num_common_g = stats.num_common_gate
+        sum_parents_b = stats.sum_parents_basic
+        sum_parents_g = stats.sum_parents_gate
+    else:
+        gate_count = {'and': 0, 'or': 0, 'atleast': 0, 'not': 0, 'xor': 0}
+        for gate in fault_tree.gates:
+            gate_count[gate.operator] += 1
+        num_arguments = sum(x.num_arguments() for x in fault_tree.gates)
+        shared_b = [x for x in fault_tree.basic_events if x.is_common()]
+        shared_g = [x for x in fault_tree.gates if x.is_common()]
+        num_common_b = len(shared_b)
+        num_common_g = len(shared_g)
+        sum_parents_b = sum(x.num_parents() for x in shared_b)
+        sum_parents_g = sum(x.num_parents() for x in shared_g)
+    num_gate = len(fault_tree.gates)
     frac_b, common_b, common_g = calculate_complexity_factors(fault_tree)
-    shared_b = [x for x in fault_tree.basic_events if x.is_common()]
-    shared_g = [x for x in fault_tree.gates if x.is_common()]
-    printer('Basic events to gates ratio: ',
-            (len(fault_tree.basic_events) / len(fault_tree.gates)))
-    printer('The average number of gate arguments: ',
-            (sum(x.num_arguments() for x in fault_tree.gates) /
-             len(fault_tree.gates)))
-    printer('The number of common basic events: ', len(shared_b))
-    printer('The number of common gates: ', len(shared_g))
-    printer('Percentage of common basic events per gate: ', common_b)
-    printer('Percentage of common gates per gate: ', common_g)
-    printer('Percentage of arguments that are basic events per gate: ', frac_b)
-    if shared_b:
+    return {
+        "num_basic": len(fault_tree.basic_events),
+        "num_house": len(fault_tree.house_events),
+        "num_ccf": len(fault_tree.ccf_groups),
+        "num_gate": num_gate,
+        "gates": gate_count,
+        "basic_to_gate_ratio": len(fault_tree.basic_events) / num_gate,
+        "avg_num_args": num_arguments / num_gate,
+        "num_common_basic": num_common_b,
+        "num_common_gate": num_common_g,
+        "common_b": common_b,
+        "common_g": common_g,
+        "frac_b": frac_b,
+        "parents_b": sum_parents_b / num_common_b if num_common_b else None,
+        "parents_g": sum_parents_g / num_common_g if num_common_g else None
+    }
+
+
+def get_size_summary(metrics, printer):
+    """Gathers information about the size of the fault tree.
+
+    Args:
+        metrics: The metrics of the fault tree (see get_metrics).
+        printer: The output stream.
+    """
+    gate_count = metrics["gates"]
+    printer('The number of basic events: ', metrics["num_basic"])
+    printer('The number of house events: ', metrics["num_house"])
+    printer('The number of CCF groups: ', metrics["num_ccf"])
+    printer('The number of gates: ', metrics["num_gate"])
+    printer('    AND gates: ', gate_count['and'])
+    printer('    OR gates: ', gate_count['or'])
+    printer('    K/N gates: ', gate_count['atleast'])
+    printer('    NOT gates: ', gate_count['not'])
+    printer('    XOR gates: ', gate_count['xor'])
+
+
+def get_complexity_summary(metrics, printer):
+    """Gathers information about the complexity factors of the fault tree.
+
+    Args:
+        metrics: The metrics of the fault tree (see get_metrics).
+        printer: The output stream.
+    """
+    printer('Basic events to gates ratio: ', metrics["basic_to_gate_ratio"])
+    printer('The average number of gate arguments: ', metrics["avg_num_args"])
+    printer('The number of common basic events: ', metrics["num_common_basic"])
+    printer('The number of common gates: ', metrics["num_common_gate"])
+    printer('Percentage of common basic events per gate: ',
+            metrics["common_b"])
+    printer('Percentage of common gates per gate: ', metrics["common_g"])
+    printer('Percentage of arguments that are basic events per gate: ',
+            metrics["frac_b"])
+    if metrics["parents_b"] is not None:
         printer('The avg. number of parents for common basic events: ',
-                (sum(x.num_parents() for x in shared_b) / len(shared_b)))
-    if shared_g:
+                metrics["parents_b"])
+    if metrics["parents_g"] is not None:
         printer('The avg. number of parents for common gates: ',
-                (sum(x.num_parents() for x in shared_g) / len(shared_g)))
+                metrics["parents_g"])
 
 
 def write_summary(fault_tree, printer):
@@ -821,24 +962,18 @@ def write_summary(fault_tree, printer):
         fault_tree: A full, valid, well-formed fault tree.
         printer: The output stream.
     """
+    metrics = get_metrics(fault_tree)
     printer('<!--\nThe generated fault tree has the following metrics:\n')
-    get_size_summary(fault_tree, printer)
-    get_complexity_summary(fault_tree, printer)
+    get_size_summary(metrics, printer)
+    get_complexity_summary(metrics, printer)
     printer('-->\n')
 
 
-def manage_cmd_args(argv=None):
-    """Manages command-line description and arguments.
-
-    Args:
-        argv: An optional list containing the command-line arguments.
-            If None, the command-line arguments from sys will be used.
+def make_parser():
+    """Creates the parser of the command-line arguments.
 
     Returns:
-        Arguments that are collected from the command line.
-
-    Raises:
-        ArgumentTypeError: There are problems with the arguments.
+        The argument parser of the generator options.
     """
     # #lizard forgives the function length
     parser = ap.ArgumentParser(description="Complex-Fault-Tree Generator",
@@ -901,7 +1036,12 @@ def manage_cmd_args(argv=None):
                         type=int,
                         default=0,
                         metavar="int",
-                        help="# of gates (discards parents-b/g and common-b/g)")
+                        help="# of gates (discards parents-b/g and common-b/g "
+                        "unless --exact)")
+    parser.add_argument("--exact",
+                        action="store_true",
+                        help="generate the exact # of basic events and gates "
+                        "and report the achieved common factors")
     parser.add_argument("--max-prob",
                         type=float,
                         default=0.1,
@@ -933,7 +1073,73 @@ def manage_cmd_args(argv=None):
     parser.add_argument("--nest",
                         action="store_true",
                         help="nest NOT connectives in Boolean formulae")
-    args = parser.parse_args(argv)
+    parser.add_argument("--batch-size",
+                        type=int,
+                        default=0,
+                        metavar="int",
+                        help="draw random node attributes in NumPy blocks "
+                        "of this size (0 disables)")
+    parser.add_argument("--compact",
+                        action="store_true",
+                        help="use the array-backed graph for large trees")
+    parser.add_argument("-j",
+                        "--workers",
+                        type=int,
+                        default=1,
+                        metavar="int",
+                        help="# of sub-trees generated in parallel processes "
+                        "(implies --compact)")
+    parser.add_argument("--stream",
+                        action="store_true",
+                        help="write the fault tree during the generation "
+                        "(implies --compact)")
+    parser.add_argument("--stats-json",
+                        type=str,
+                        metavar="path",
+                        help="a file to write the metrics of the fault tree")
+    parser.add_argument("--profile-json",
+                        type=str,
+                        metavar="path",
+                        help="a file to write the times of generation phases "
+                        "and counts of events")
+    parser.add_argument("--cache-dir",
+                        type=str,
+                        metavar="path",
+                        help="a directory to cache the generated models")
+    parser.add_argument("--cache-size",
+                        type=float,
+                        default=1024,
+                        metavar="float",
+                        help="the size limit of the cache in MiB")
+    parser.add_argument("--cache-stats",
+                        action="store_true",
+                        help="report the use of the cache and exit")
+    parser.add_argument("--plan",
+                        action="store_true",
+                        help="report the expected size, memory, and time "
+                        "of the generation and exit")
+    parser.add_argument("--plan-calibration",
+                        type=str,
+                        metavar="path",
+                        help="a file with the calibration constants "
+                        "for the plan (see benchmarks.calibrate_planner)")
+    return parser
+
+
+def manage_cmd_args(argv=None):
+    """Manages command-line description and arguments.
+
+    Args:
+        argv: An optional list containing the command-line arguments.
+            If None, the command-line arguments from sys will be used.
+
+    Returns:
+        Arguments that are collected from the command line.
+
+    Raises:
+        ArgumentTypeError: There are problems with the arguments.
+    """
+    args = make_parser().parse_args(argv)
     return args
 
 
@@ -950,7 +1156,6 @@ def setup_factors(args):
         ArgumentTypeError: Problems with the arguments.
         FactorError: Invalid setup for factors.
     """
-    random.seed(args.seed)
     factors = Factors()
     factors.set_min_max_prob(args.min_prob, args.max_prob)
     factors.set_common_event_factors(args.common_b, args.common_g,
@@ -958,12 +1163,132 @@ def setup_factors(args):
     factors.set_num_factors(args.num_args, args.num_basic, args.num_house,
                             args.num_ccf)
     factors.set_gate_weights([float(i) for i in args.weights_g])
+    factors.set_batch_sampling(args.seed, args.batch_size)
     if args.num_gate:
-        factors.constrain_num_gate(args.num_gate)
+        if args.exact:
+            factors.fix_num_gate(args.num_gate)
+        else:
+            factors.constrain_num_gate(args.num_gate)
     factors.calculate()
     return factors
 
 
+def write_fault_tree(args, factors, printer, profile=None):
+    """Generates and writes the fault tree as requested on the command line.
+
+    Args:
+        args: Command-line arguments.
+        factors: Fully initialized Factors object.
+        printer: The output stream.
+        profile: The optional profile of the generation and output phases.
+
+    Returns:
+        The generated fault tree.
+
+    Raises:
+        ArgumentTypeError: There are problems with the arguments.
+        FactorError: Invalid setup for factors.
+    """
+    if profile is not None:
+        printer = profile.wrap_printer(printer)
+    if args.exact and (args.stream or args.compact or args.workers > 1):
+        raise ap.ArgumentTypeError("The exact generation is not supported "
+                                   "with --stream, --compact, or --workers")
+    if args.stream:
+        if args.aralia or args.nest or args.workers > 1:
+            raise ap.ArgumentTypeError("Streaming is not supported "
+                                       "with --aralia, --nest, or --workers")
+        with profiler.phase(profile, "generation"):  # with the output
+            fault_tree = streaming_generator.generate_fault_tree(
+                args.ft_name,
+                args.root,
+                factors,
+                printer,
+                random.Random(args.seed),
+                write_header=lambda x: write_info(x, printer, args.seed))
+        write_summary(fault_tree, printer)
+        return fault_tree
+    with profiler.phase(profile, "generation"):
+        fault_tree = generate_fault_tree(args.ft_name, args.root, factors,
+                                         args.compact,
+                                         random.Random(args.seed),
+                                         args.workers, profile, args.exact)
+    with profiler.phase(profile, "writing"):
+        if args.aralia:
+            fault_tree.to_aralia(printer)
+        else:
+            write_info(fault_tree, printer, args.seed)
+            write_summary(fault_tree, printer)
+            if args.exact:
+                exact_generator.write_deviations(
+                    exact_generator.get_deviations(factors,
+                                                   get_metrics(fault_tree)),
+                    printer)
+            fault_tree.to_xml(printer, args.nest)
+    return fault_tree
+
+
+def write_plan(args, factors, printer):
+    """Plans the fault tree generation requested on the command line.
+
+    The plan is written into the statistics file if requested.
+
+    Args:
+        args: Command-line arguments.
+        factors: Fully initialized Factors object.
+        printer: The output stream.
+    """
+    calibration = None
+    if args.plan_calibration:
+        calibration = planner.load_calibration(args.plan_calibration)
+    plan = planner.get_plan(factors, args.ft_name,
+                            args.compact or args.stream or args.workers > 1,
+                            args.aralia, calibration)
+    planner.write_plan(plan, printer)
+    if args.stats_json:
+        with open(args.stats_json, "w") as stats_file:
+            json.dump(plan, stats_file, indent=2)
+
+
+def get_cache_key(args, factors):
+    """Computes the cache key of the fault tree requested on the command line.
+
+    Args:
+        args: Command-line arguments.
+        factors: Fully initialized Factors object.
+
+    Returns:
+        The key for the model cache.
+    """
+    return model_cache.make_key({
+        "factors": factors.get_state(),
+        "seed": args.seed,
+        "ft_name": args.ft_name,
+        "root": args.root,
+        "aralia": args.aralia,
+        "nest": args.nest,
+        "stream": args.stream,
+        "workers": args.workers,
+        "exact": args.exact
+    })
+
+
+def write_cache_stats(cache, printer):
+    """Writes the report on the use of the model cache.
+
+    Args:
+        cache: The model cache.
+        printer: The output stream.
+    """
+    stats = cache.get_stats()
+    printer('The number of cache hits: ', stats["hits"])
+    printer('The number of cache misses: ', stats["misses"])
+    printer('The number of evicted models: ', stats["evictions"])
+    printer('The number of cached models: ', stats["entries"])
+    printer('The size of cached models (bytes): ', stats["size"])
+    printer('The generation time saved (hours): ', stats["time_saved"] / 3600)
+
+
 def main(argv=None):
     """The main function of the fault tree generator.
 
@@ -976,22 +1301,45 @@ def main(argv=None):
         FactorError: Invalid setup for factors.
     """
     args = manage_cmd_args(argv)
+    if args.cache_stats:
+        if not args.cache_dir:
+            raise ap.ArgumentTypeError("--cache-stats requires --cache-dir")
+        with get_printer() as printer:
+            write_cache_stats(model_cache.ModelCache(args.cache_dir, 0),
+                              printer)
+        return
     factors = setup_factors(args)
-    fault_tree = generate_fault_tree(args.ft_name, args.root, factors)
-    printer = get_printer(args.out)
-    if args.aralia:
-        fault_tree.to_aralia(printer)
-    else:
-        write_info(fault_tree, printer, args.seed)
-        write_summary(fault_tree, printer)
-        fault_tree.to_xml(printer, args.nest)
+    if args.plan:
+        with get_printer() as printer:
+            write_plan(args, factors, printer)
+        return
+    profile = profiler.Profile() if args.profile_json else None
+    with profiler.phase(profile, "total"):
+        if args.cache_dir:
+            cache = model_cache.ModelCache(args.cache_dir,
+                                           args.cache_size * 2**20)
+            metrics = cache.write_model(
+                get_cache_key(args, factors), args.out, lambda x: get_metrics(
+                    write_fault_tree(args, factors, x, profile)))
+        else:
+            with get_printer(args.out) as printer:
+                fault_tree = write_fault_tree(args, factors, printer, profile)
+            metrics = get_metrics(fault_tree) if args.stats_json else None
+    if args.exact and metrics is not None:
+        metrics["deviations"] = exact_generator.get_deviations(
+            factors, metrics)
+    if args.stats_json:
+        with open(args.stats_json, "w") as stats_file:
+            json.dump(metrics, stats_file, indent=2)
+    if args.profile_json:
+        with open(args.profile_json, "w") as profile_file:
+            json.dump(profile.get_report(), profile_file, indent=2)
 
 
 def get_printer(file_path=None):
-    """Returns printer to stream output."""
-    destination = open(file_path, 'w') if file_path else sys.stdout
-
-    def _print(*args):
-        print(*args, file=destination, sep='')
+    """Returns printer to stream output.
 
-    return _print
+    The printer buffers the output
+    and must be closed (it is a context manager).
+    """
+    return bulk_writer.open_writer(file_path)
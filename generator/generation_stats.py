@@ -0,0 +1,185 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Running statistics of fault tree generation.
+
+The statistics are updated upon every new gate argument,
+so the metrics of the generated fault tree are available
+without traversing the fault tree.
+
+The per-gate complexity factors (e.g., the fraction of common basic events
+among the basic event arguments of a gate)
+are averaged from histograms of gates by their argument counts.
+The histograms have as many bins as distinct argument counts,
+so the averaging does not depend on the size of the fault tree.
+"""
+
+from array import array
+from collections import Counter
+
+_SHIFT = 32  # the bit shift of the first count in histogram keys
+_MASK = (1 << _SHIFT) - 1
+
+
+class GenerationStats:  # pylint: disable=too-many-instance-attributes
+    """Running counters of the fault tree under generation.
+
+    The gates are identified by their numbers in the order of addition.
+
+    Attributes:
+        gate_count: The number of gates by operator.
+        num_arguments: The total number of gate arguments.
+        num_common_basic: The number of basic events with several parents.
+        num_common_gate: The number of gates with several parents.
+        sum_parents_basic: The total number of parents of common basic events.
+        sum_parents_gate: The total number of parents of common gates.
+    """
+
+    def __init__(self):
+        """Initializes the statistics of an empty fault tree."""
+        self.gate_count = {'and': 0, 'or': 0, 'atleast': 0, 'not': 0, 'xor': 0}
+        self.num_arguments = 0
+        self.num_common_basic = 0
+        self.num_common_gate = 0
+        self.sum_parents_basic = 0
+        self.sum_parents_gate = 0
+        # Per-gate counts of basic event and gate arguments
+        # and common ones among them.
+        self.__num_b = array('i')
+        self.__num_g = array('i')
+        self.__common_b = array('i')
+        self.__common_g = array('i')
+        # Histograms of gates by pairs of their counts
+        # packed into integer keys (first << _SHIFT | second).
+        self.__b_g = Counter()  # (num_b, num_g)
+        self.__common_b_b = Counter()  # (common_b, num_b)
+        self.__common_g_g = Counter()  # (common_g, num_g)
+
+    def add_gate(self, operator):
+        """Registers a new gate without arguments.
+
+        Args:
+            operator: The operator of the gate.
+
+        Returns:
+            The number of the gate.
+        """
+        self.gate_count[operator] += 1
+        for counts in (self.__num_b, self.__num_g, self.__common_b,
+                       self.__common_g):
+            counts.append(0)
+        self.__b_g[0] += 1
+        self.__common_b_b[0] += 1
+        self.__common_g_g[0] += 1
+        return len(self.__num_b) - 1
+
+    def add_argument(self, gate):
+        """Registers a new house event or undefined argument of the gate."""
+        del gate  # not in the complexity factors
+        self.num_arguments += 1
+
+    def add_basic_argument(self, gate, num_parents, first_parent=None):
+        """Registers a new basic event argument of the gate.
+
+        Args:
+            gate: The number of the gate.
+            num_parents: The number of parents of the basic event
+                including the gate.
+            first_parent: The number of the first parent of the basic event
+                (only needed for two parents).
+        """
+        self.num_arguments += 1
+        num_b = self.__num_b[gate]
+        num_g = self.__num_g[gate]
+        common = self.__common_b[gate]
+        is_common = num_parents > 1
+        self.__num_b[gate] = num_b + 1
+        self.__common_b[gate] = common + is_common
+        self.__b_g[num_b << _SHIFT | num_g] -= 1
+        self.__b_g[(num_b + 1) << _SHIFT | num_g] += 1
+        self.__common_b_b[common << _SHIFT | num_b] -= 1
+        self.__common_b_b[(common + is_common) << _SHIFT | num_b + 1] += 1
+        if not is_common:
+            return
+        if num_parents == 2:
+            self.num_common_basic += 1
+            self.sum_parents_basic += 2
+            common = self.__common_b[first_parent]
+            num_b = self.__num_b[first_parent]
+            self.__common_b[first_parent] = common + 1
+            self.__common_b_b[common << _SHIFT | num_b] -= 1
+            self.__common_b_b[(common + 1) << _SHIFT | num_b] += 1
+        else:
+            self.sum_parents_basic += 1
+
+    def add_gate_argument(self, gate, num_parents, first_parent=None):
+        """Registers a new gate argument of the gate.
+
+        Args:
+            gate: The number of the parent gate.
+            num_parents: The number of parents of the argument gate
+                including the parent gate.
+            first_parent: The number of the first parent of the argument gate
+                (only needed for two parents).
+        """
+        self.num_arguments += 1
+        num_b = self.__num_b[gate]
+        num_g = self.__num_g[gate]
+        common = self.__common_g[gate]
+        is_common = num_parents > 1
+        self.__num_g[gate] = num_g + 1
+        self.__common_g[gate] = common + is_common
+        self.__b_g[num_b << _SHIFT | num_g] -= 1
+        self.__b_g[num_b << _SHIFT | num_g + 1] += 1
+        self.__common_g_g[common << _SHIFT | num_g] -= 1
+        self.__common_g_g[(common + is_common) << _SHIFT | num_g + 1] += 1
+        if not is_common:
+            return
+        if num_parents == 2:
+            self.num_common_gate += 1
+            self.sum_parents_gate += 2
+            common = self.__common_g[first_parent]
+            num_g = self.__num_g[first_parent]
+            self.__common_g[first_parent] = common + 1
+            self.__common_g_g[common << _SHIFT | num_g] -= 1
+            self.__common_g_g[(common + 1) << _SHIFT | num_g] += 1
+        else:
+            self.sum_parents_gate += 1
+
+    def get_complexity_factors(self):
+        """Computes the complexity factors of the fault tree.
+
+        The common fractions are 0
+        if no gate has arguments of the corresponding type.
+
+        Returns:
+            frac_b: fraction of basic events in arguments per gate
+            common_b: fraction of common basic events in basic events per gate
+            common_g: fraction of common gates in gates per gate
+        """
+        num_gates = len(self.__num_b)
+        b_g = [(x >> _SHIFT, x & _MASK, n) for x, n in self.__b_g.items() if n]
+        frac_b = sum(
+            n * num_b / (num_b + num_g) for num_b, num_g, n in b_g
+            if num_b + num_g)
+        common_b = sum(n * (x >> _SHIFT) / (x & _MASK)
+                       for x, n in self.__common_b_b.items()
+                       if n and x & _MASK)
+        common_g = sum(n * (x >> _SHIFT) / (x & _MASK)
+                       for x, n in self.__common_g_g.items()
+                       if n and x & _MASK)
+        with_b = num_gates - sum(n for num_b, _, n in b_g if not num_b)
+        with_g = num_gates - sum(n for _, num_g, n in b_g if not num_g)
+        return (frac_b / num_gates, common_b / with_b if with_b else 0,
+                common_g / with_g if with_g else 0)
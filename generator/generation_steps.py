@@ -0,0 +1,274 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Steps of the fault tree generation shared by the fault tree models.
+
+The steps work with nodes only through the fault tree under construction,
+so the same code generates the event objects (GeneratorFaultTree)
+and the array-backed graph core (CompactFaultTree)
+from the same random numbers.
+The node interface of the fault tree consists of:
+
+    - top_node, the root gate,
+    - construct_gate(common), construct_basic_event(),
+      construct_house_event(), construct_ccf_group(members),
+    - get_num_args(gate), num_arguments(gate), num_parents(gate),
+    - has_gate_argument(gate, arg), get_ancestors(gate), finalize_gate(gate),
+    - add_gate_argument(gate, arg), add_basic_argument(gate, basic_event),
+      add_house_argument(gate, house_event),
+    - index_common_events(basic_events, gates),
+    - basic_event_nodes(), set_non_ccf_events(members), freeze(),
+
+together with the factors, rng, profile, basic_events, house_events,
+ccf_groups, house_targets, and exhaustion_targets attributes.
+"""
+
+from collections import deque
+
+from generator import exact_generator
+from generator import profiler
+
+
+def candidate_gates(common_gate):
+    """Lazy generator of candidates for common gates.
+
+    Orphan gates are yielded first, then single-parent gates,
+    and then the rest of common gates, each group in random order.
+
+    Args:
+        common_gate: A parent count index of common gates.
+
+    Returns:
+        An iterator over gate candidates from common gates container.
+    """
+    return common_gate.candidates()
+
+
+def correct_for_exhaustion(gates_queue, common_gate, fault_tree):
+    """Corrects the generation for queue exhaustion.
+
+    Corner case when not enough new basic events initialized,
+    but there are no more intermediate gates to use
+    due to a big ratio or just random accident.
+
+    Args:
+        gates_queue: A deque of gates to be initialized.
+        common_gate: A parent count index of common gates.
+        fault_tree: The fault tree container of all events and constructs.
+    """
+    if gates_queue:
+        return
+    if len(fault_tree.basic_events) < fault_tree.factors.num_basic:
+        # Initialize one more gate
+        # by randomly choosing places in the fault tree.
+        # The top gate is always a target, so the choice never fails.
+        random_gate = fault_tree.rng.choice(fault_tree.exhaustion_targets)
+        assert random_gate not in common_gate
+        new_gate = fault_tree.construct_gate()
+        fault_tree.add_gate_argument(random_gate, new_gate)
+        gates_queue.append(new_gate)
+        if fault_tree.profile is not None:
+            fault_tree.profile.count("exhaustion_corrections")
+
+
+def choose_basic_event(s_common, common_basic, fault_tree):
+    """Creates a new basic event or uses a common one for gate arguments.
+
+    Common basic events with fewer parents are preferred:
+    orphans first, then single-parent ones, then any other.
+
+    Args:
+        s_common: Sampled factor to choose common basic events.
+        common_basic: A parent count index of common basic events.
+        fault_tree: The fault tree container of all events and constructs.
+
+    Returns:
+        Basic event argument for a gate.
+    """
+    if s_common >= fault_tree.factors.common_b or not common_basic:
+        return fault_tree.construct_basic_event()
+
+    return common_basic.choice()
+
+
+def init_gates(gates_queue, common_basic, common_gate, fault_tree):
+    """Initializes gates and other basic events.
+
+    Args:
+        gates_queue: A deque of gates to be initialized.
+        common_basic: A parent count index of common basic events.
+        common_gate: A parent count index of common gates.
+        fault_tree: The fault tree container of all events and constructs.
+
+    Returns:
+        The initialized gate.
+    """
+    # Get an intermediate gate to initialize breadth-first
+    gate = gates_queue.popleft()
+
+    factors = fault_tree.factors
+    rng = fault_tree.rng
+    num_arguments = fault_tree.get_num_args(gate)
+
+    ancestors = None  # needed for cycle prevention
+    max_tries = len(common_gate)  # the number of maximum tries
+    num_tries = 0  # the number of tries to get a common gate
+    num_rejected = 0  # the number of common gates rejected as arguments
+
+    # pylint: disable=too-many-nested-blocks
+    # This code is both hot and coupled for performance reasons.
+    # There may be a better solution than the current approach.
+    while fault_tree.num_arguments(gate) < num_arguments:
+        s_percent = rng.random()  # sample percentage of gates
+        s_common = rng.random()  # sample the reuse frequency
+
+        # Case when the number of basic events is already satisfied
+        if len(fault_tree.basic_events) == factors.num_basic:
+            s_common = 0  # use only common nodes
+
+        if s_percent < factors.get_percent_gate():
+            # Create a new gate or use a common one
+            if s_common < factors.common_g and num_tries < max_tries:
+                # Lazy evaluation of ancestors
+                if ancestors is None:
+                    ancestors = fault_tree.get_ancestors(gate)
+
+                for random_gate in candidate_gates(common_gate):
+                    num_tries += 1
+                    if num_tries >= max_tries:
+                        break
+                    if (random_gate == gate or
+                            fault_tree.has_gate_argument(gate, random_gate)):
+                        num_rejected += 1
+                        continue
+                    if (not fault_tree.num_arguments(random_gate) or
+                            random_gate not in ancestors):
+                        if not fault_tree.num_parents(random_gate):
+                            gates_queue.append(random_gate)
+                        fault_tree.add_gate_argument(gate, random_gate)
+                        break
+                    num_rejected += 1
+            else:
+                new_gate = fault_tree.construct_gate()
+                fault_tree.add_gate_argument(gate, new_gate)
+                gates_queue.append(new_gate)
+        else:
+            fault_tree.add_basic_argument(
+                gate, choose_basic_event(s_common, common_basic, fault_tree))
+
+    if fault_tree.profile is not None:
+        profiler.count_tries(fault_tree.profile, num_tries, num_rejected,
+                             ancestors)
+    return gate
+
+
+def distribute_house_events(fault_tree):
+    """Distributes house events to already initialized gates.
+
+    The top gate gets the house events
+    only if there are no other gates that can take them.
+
+    Args:
+        fault_tree: The fault tree container of all events and constructs.
+    """
+    targets = fault_tree.house_targets or [fault_tree.top_node]
+    while len(fault_tree.house_events) < fault_tree.factors.num_house:
+        target_gate = fault_tree.rng.choice(targets)
+        fault_tree.add_house_argument(target_gate,
+                                      fault_tree.construct_house_event())
+
+
+def generate_ccf_groups(fault_tree):
+    """Creates CCF groups from the existing basic events.
+
+    Args:
+        fault_tree: The fault tree container of all events and constructs.
+    """
+    if fault_tree.factors.num_ccf:
+        members = fault_tree.basic_event_nodes()
+        fault_tree.rng.shuffle(members)
+        first_mem = 0
+        last_mem = 0
+        while len(fault_tree.ccf_groups) < fault_tree.factors.num_ccf:
+            max_args = int(2 * fault_tree.factors.num_args - 2)
+            group_size = fault_tree.rng.randint(2, max_args)
+            last_mem = first_mem + group_size
+            if last_mem > len(members):
+                break
+            fault_tree.construct_ccf_group(members[first_mem:last_mem])
+            first_mem = last_mem
+        fault_tree.set_non_ccf_events(members[first_mem:])
+
+
+def construct_common_events(fault_tree):
+    """Constructs the estimated number of common basic events and gates.
+
+    Args:
+        fault_tree: The fault tree container with the top gate only.
+
+    Returns:
+        Parent count indexes of the common basic events and gates.
+    """
+    factors = fault_tree.factors
+    num_gate = factors.get_num_gate()
+    num_common_basic = factors.get_num_common_basic(num_gate)
+    num_common_gate = factors.get_num_common_gate(num_gate)
+    return fault_tree.index_common_events(
+        [fault_tree.construct_basic_event() for _ in range(num_common_basic)],
+        [
+            fault_tree.construct_gate(common=True)
+            for _ in range(num_common_gate)
+        ])
+
+
+def generate(fault_tree, exact=False):
+    """Generates the fault tree from its top gate.
+
+    Args:
+        fault_tree: The fault tree container with the top gate only.
+        exact: Generate exactly the estimated number of gates
+            (see exact_generator, the event objects only).
+
+    Returns:
+        The frozen fault tree.
+    """
+    profile = fault_tree.profile
+    if exact:
+        with profiler.phase(profile, "init_gates"):
+            exact_generator.init_gates(fault_tree,
+                                       fault_tree.factors.get_num_gate())
+    else:
+        common_basic, common_gate = construct_common_events(fault_tree)
+
+        # Container for not yet initialized gates
+        # A deque is used to traverse the tree breadth-first
+        gates_queue = deque()
+        gates_queue.append(fault_tree.top_node)
+        with profiler.phase(profile, "init_gates"):
+            while gates_queue:
+                fault_tree.finalize_gate(
+                    init_gates(gates_queue, common_basic, common_gate,
+                               fault_tree))
+                correct_for_exhaustion(gates_queue, common_gate, fault_tree)
+
+    assert all(x.num_parents() for x in fault_tree.basic_events)
+    assert all(x.num_parents() or x == fault_tree.top_gate
+               for x in fault_tree.gates)
+
+    with profiler.phase(profile, "distribute_house_events"):
+        distribute_house_events(fault_tree)
+    with profiler.phase(profile, "generate_ccf_groups"):
+        generate_ccf_groups(fault_tree)
+    fault_tree.freeze()
+    return fault_tree
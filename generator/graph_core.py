@@ -0,0 +1,952 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Array-backed (struct-of-arrays) representation of fault trees.
+
+Every node of the object model (see generator.event)
+carries several OrderedSet containers,
+which costs kilobytes per node.
+The graph core instead identifies nodes with integers per node kind
+and keeps their attributes in flat typed arrays.
+
+While the graph is under construction,
+the arguments and parents of nodes are singly linked lists of edges
+threaded through edge arrays (in insertion order).
+Once the construction is over,
+the graph is frozen into the compressed sparse row (CSR) layout.
+
+The CompactFaultTree adapter exposes the graph
+through light-weight views with the object model interface,
+so that the existing writers (to_xml, to_aralia) keep working,
+and implements the node interface of the generation steps
+(see generator.generation_steps) with integer node ids.
+"""
+
+from array import array
+import heapq
+import random
+
+from generator import profiler
+from generator.event.gate import Gate
+from generator.event.house_event import HouseEvent
+from generator.fault_tree import CcfGroup, FaultTree
+from generator.generation_stats import GenerationStats
+from generator.parent_count_index import ParentCountIndex
+from generator.probability.point_estimate import PointEstimate
+
+OPERATORS = ("and", "or", "atleast", "not", "xor")  # the order matters
+OPERATOR_CODES = {operator: code for code, operator in enumerate(OPERATORS)}
+
+# Node kinds
+GATE = 0
+BASIC = 1
+HOUSE = 2
+
+_KIND_BITS = 2  # the low bits of a node reference keep its kind
+_KIND_MASK = (1 << _KIND_BITS) - 1
+_NONE = -1  # the null edge
+_WIDE_GATE = 32  # the number of arguments to index for duplicate checks
+
+
+def make_ref(kind, node):
+    """Encodes the node of the given kind into a single integer reference."""
+    return (node << _KIND_BITS) | kind
+
+
+def ref_kind(ref):
+    """Decodes the kind of the node from its reference."""
+    return ref & _KIND_MASK
+
+
+def ref_node(ref):
+    """Decodes the node id from its reference."""
+    return ref >> _KIND_BITS
+
+
+def _csr(keys, values, num_keys):
+    """Groups values by keys into the compressed sparse row layout.
+
+    The grouping is stable, so the values keep their order for every key.
+
+    Args:
+        keys: An array of keys in [0, num_keys).
+        values: An array of values with the same length as the keys.
+        num_keys: The number of unique keys.
+
+    Returns:
+        The offsets array of (num_keys + 1) elements
+        and the array of values grouped by keys.
+    """
+    offsets = array('i', [0]) * (num_keys + 1)
+    for key in keys:
+        offsets[key + 1] += 1
+    for i in range(num_keys):
+        offsets[i + 1] += offsets[i]
+    grouped = array('i', [0]) * len(values)
+    fill = offsets[:-1]
+    for key, value in zip(keys, values):
+        grouped[fill[key]] = value
+        fill[key] += 1
+    return offsets, grouped
+
+
+class GraphCore:  # pylint: disable=too-many-instance-attributes
+    """Fault tree graph with integer node ids and array attributes.
+
+    Gates, basic events, and house events are numbered separately from 0.
+    Gate arguments are referenced with integers encoding the kind and the id
+    (see make_ref).
+
+    Attributes:
+        operators: Operator codes of gates (indices into OPERATORS).
+        k_nums: Min numbers of K/N gates (0 for other gates).
+        ranks: Topological ranks of gates
+            greater than the ranks of their parents.
+        num_args: The number of arguments of gates.
+        num_parents: The number of parents of nodes per node kind.
+        probabilities: Probabilities of basic events.
+        states: Boolean states of house events.
+        stats: Generation statistics updated by add_argument if any.
+    """
+
+    def __init__(self):
+        """Initializes an empty graph open for construction."""
+        self.operators = array('b')
+        self.k_nums = array('i')
+        self.ranks = array('i')
+        self.num_args = array('i')
+        self.num_parents = (array('i'), array('i'), array('i'))
+        self.probabilities = array('d')
+        self.states = array('b')
+
+        # Linked lists of edges for the construction.
+        self.__arg_head = array('i')  # the first argument edge of gates
+        self.__arg_tail = array('i')  # the last argument edge of gates
+        self.__parent_head = (array('i'), array('i'), array('i'))
+        self.__parent_tail = (array('i'), array('i'), array('i'))
+        self.__edge_parent = array('i')  # the parent gate of edges
+        self.__edge_child = array('i')  # the argument reference of edges
+        self.__next_arg = array('i')  # the next edge of the same parent
+        self.__next_parent = array('i')  # the next edge of the same argument
+        self.__arg_sets = {}  # argument references of wide gates
+
+        # The CSR layout after freezing.
+        self.__arg_offsets = None
+        self.__args = None
+        self.__parent_offsets = None  # per node kind
+        self.__parents = None  # per node kind
+
+        self.__parent_indexes = [None, None, None]  # per node kind
+        self.stats = None
+
+    @classmethod
+    def from_edges(cls, operators, k_nums, probabilities, states, edge_parent,
+                   edge_child):
+        """Creates a frozen graph from the node attributes and edges.
+
+        The ranks of gates are not computed.
+
+        Args:
+            operators: An array of gate operator codes.
+            k_nums: An array of K/N gate min numbers.
+            probabilities: An array of basic event probabilities.
+            states: An array of house event states.
+            edge_parent: An array of parent gate ids of edges.
+            edge_child: An array of argument references of edges.
+
+        Returns:
+            A new graph in the CSR layout.
+        """
+        core = cls()
+        core.operators = operators
+        core.k_nums = k_nums
+        core.ranks = array('i', [0]) * len(operators)
+        core.probabilities = probabilities
+        core.states = states
+        core.num_args = array('i', [0]) * len(operators)
+        core.num_parents = tuple(
+            array('i', [0]) * x
+            for x in (len(operators), len(probabilities), len(states)))
+        for parent, ref in zip(edge_parent, edge_child):
+            core.num_args[parent] += 1
+            core.num_parents[ref_kind(ref)][ref_node(ref)] += 1
+        core.__edge_parent = edge_parent
+        core.__edge_child = edge_child
+        core.freeze()
+        return core
+
+    def num_nodes(self, kind):
+        """Returns the number of nodes of the given kind."""
+        return len(self.num_parents[kind])
+
+    def num_edges(self):
+        """Returns the number of gate-argument edges."""
+        if self.__args is not None:
+            return len(self.__args)
+        return len(self.__edge_child)
+
+    def is_frozen(self):
+        """Indicates if the graph is in the final CSR layout."""
+        return self.__args is not None
+
+    def __add_node(self, kind):
+        """Appends the common attributes of a new node of the given kind."""
+        self.num_parents[kind].append(0)
+        self.__parent_head[kind].append(_NONE)
+        self.__parent_tail[kind].append(_NONE)
+        return len(self.num_parents[kind]) - 1
+
+    def add_gate(self, operator, k_num=0):
+        """Adds a gate without arguments.
+
+        Args:
+            operator: The operator code of the gate.
+            k_num: Min number for the combination operator.
+
+        Returns:
+            The id of the new gate.
+        """
+        assert not self.is_frozen()
+        self.operators.append(operator)
+        self.k_nums.append(k_num)
+        self.ranks.append(0)
+        self.num_args.append(0)
+        self.__arg_head.append(_NONE)
+        self.__arg_tail.append(_NONE)
+        return self.__add_node(GATE)
+
+    def add_basic_event(self, probability):
+        """Adds a basic event with the probability of failure.
+
+        Returns:
+            The id of the new basic event.
+        """
+        assert not self.is_frozen()
+        self.probabilities.append(probability)
+        return self.__add_node(BASIC)
+
+    def add_house_event(self, state):
+        """Adds a house event with the Boolean state.
+
+        Returns:
+            The id of the new house event.
+        """
+        assert not self.is_frozen()
+        self.states.append(state)
+        return self.__add_node(HOUSE)
+
+    def track(self, kind, parent_index):
+        """Registers the parent count index to notify about new parents.
+
+        Args:
+            kind: The kind of nodes tracked by the index.
+            parent_index: ParentCountIndex of node ids of the given kind.
+        """
+        self.__parent_indexes[kind] = parent_index
+
+    def has_argument(self, gate, ref):
+        """Checks if the referenced node is an argument of the gate.
+
+        The arguments of the gate are scanned
+        unless the gate is wide and not yet finalized.
+        """
+        if self.__arg_sets:
+            arg_set = self.__arg_sets.get(gate)
+            if arg_set is not None:
+                return ref in arg_set
+        return ref in self.arguments(gate)
+
+    def finalize(self, gate):
+        """Releases the construction index of the initialized gate.
+
+        The gate may still get arguments,
+        but the duplicate checks scan its arguments afterwards.
+
+        Args:
+            gate: The id of the gate.
+        """
+        if self.__arg_sets:
+            self.__arg_sets.pop(gate, None)
+
+    def add_argument(self, gate, ref):
+        """Adds the referenced node into the arguments of the gate.
+
+        Duplicate arguments are ignored as in Gate.add_argument.
+        The ranks of gate arguments are kept greater than the parent ranks.
+
+        Args:
+            gate: The id of the parent gate.
+            ref: The argument reference.
+
+        Returns:
+            False if the argument is a duplicate.
+        """
+        assert not self.is_frozen()
+        if self.has_argument(gate, ref):
+            return False
+        kind = ref_kind(ref)
+        node = ref_node(ref)
+        edge = len(self.__edge_child)
+        self.__edge_parent.append(gate)
+        self.__edge_child.append(ref)
+        self.__next_arg.append(_NONE)
+        self.__next_parent.append(_NONE)
+
+        if self.__arg_tail[gate] == _NONE:
+            self.__arg_head[gate] = edge
+        else:
+            self.__next_arg[self.__arg_tail[gate]] = edge
+        self.__arg_tail[gate] = edge
+        self.num_args[gate] += 1
+        if gate in self.__arg_sets:
+            self.__arg_sets[gate].add(ref)
+        elif self.num_args[gate] == _WIDE_GATE:
+            self.__arg_sets[gate] = set(self.arguments(gate))
+
+        parent_tail = self.__parent_tail[kind]
+        if parent_tail[node] == _NONE:
+            self.__parent_head[kind][node] = edge
+        else:
+            self.__next_parent[parent_tail[node]] = edge
+        parent_tail[node] = edge
+        self.num_parents[kind][node] += 1
+
+        parent_index = self.__parent_indexes[kind]
+        if parent_index is not None and node in parent_index:
+            parent_index.update(node)
+
+        if self.stats is not None:
+            num_parents = self.num_parents[kind][node]
+            first_parent = (self.__edge_parent[self.__parent_head[kind][node]]
+                            if num_parents == 2 else None)
+            if kind == GATE:
+                self.stats.add_gate_argument(gate, num_parents, first_parent)
+            elif kind == BASIC:
+                self.stats.add_basic_argument(gate, num_parents, first_parent)
+            else:
+                self.stats.add_argument(gate)
+
+        if kind == GATE and self.ranks[node] <= self.ranks[gate]:
+            self.ranks[node] = self.ranks[gate] + 1
+            self.propagate_rank(node)
+        return True
+
+    def propagate_rank(self, gate):
+        """Raises the ranks of descendants to be greater than parent ranks.
+
+        Only descendants that break the rank order get updated.
+        The graph must be acyclic.
+        """
+        ranks = self.ranks
+        gates = [gate]  # to avoid recursion
+        while gates:
+            gate = gates.pop()
+            for ref in self.arguments(gate):
+                if ref_kind(ref) != GATE:
+                    continue
+                arg = ref_node(ref)
+                if ranks[arg] <= ranks[gate]:
+                    ranks[arg] = ranks[gate] + 1
+                    gates.append(arg)
+
+    def arguments(self, gate):
+        """Generates argument references of the gate in insertion order."""
+        if self.__args is not None:
+            offsets = self.__arg_offsets
+            yield from self.__args[offsets[gate]:offsets[gate + 1]]
+            return
+        edge = self.__arg_head[gate]
+        while edge != _NONE:
+            yield self.__edge_child[edge]
+            edge = self.__next_arg[edge]
+
+    def parents(self, kind, node):
+        """Generates parent gate ids of the node in insertion order."""
+        if self.__parents is not None:
+            offsets = self.__parent_offsets[kind]
+            yield from self.__parents[kind][offsets[node]:offsets[node + 1]]
+            return
+        edge = self.__parent_head[kind][node]
+        while edge != _NONE:
+            yield self.__edge_parent[edge]
+            edge = self.__next_parent[edge]
+
+    def freeze(self):
+        """Converts the graph into the read-only CSR layout.
+
+        The linked lists of edges are released.
+        """
+        assert not self.is_frozen()
+        self.__arg_offsets, self.__args = _csr(self.__edge_parent,
+                                               self.__edge_child,
+                                               self.num_nodes(GATE))
+        parent_offsets = []
+        parents = []
+        for kind in (GATE, BASIC, HOUSE):
+            keys = array('i')
+            values = array('i')
+            for parent, ref in zip(self.__edge_parent, self.__edge_child):
+                if ref_kind(ref) == kind:
+                    keys.append(ref_node(ref))
+                    values.append(parent)
+            offsets, grouped = _csr(keys, values, self.num_nodes(kind))
+            parent_offsets.append(offsets)
+            parents.append(grouped)
+        self.__parent_offsets = tuple(parent_offsets)
+        self.__parents = tuple(parents)
+
+        self.__arg_head = self.__arg_tail = None
+        self.__parent_head = self.__parent_tail = None
+        self.__edge_parent = self.__edge_child = None
+        self.__next_arg = self.__next_parent = None
+        self.__arg_sets = None
+        self.__parent_indexes = [None, None, None]
+
+    def release(self):
+        """Releases the edges of the graph without the CSR conversion.
+
+        Only the nodes with their numbers of arguments and parents remain,
+        so the graph is closed for construction and traversal.
+        This is meant for graphs that have already been written out.
+        """
+        assert not self.is_frozen()
+        self.__arg_head = self.__arg_tail = None
+        self.__parent_head = self.__parent_tail = None
+        self.__edge_parent = self.__edge_child = None
+        self.__next_arg = self.__next_parent = None
+        self.__arg_sets = None
+        self.__parent_indexes = [None, None, None]
+
+    def toposort(self, root):
+        """Sorts gates reachable from the root topologically.
+
+        The order is the same as the order of toposort_gates
+        for the object model.
+
+        Args:
+            root: The id of the root gate.
+
+        Returns:
+            A list of sorted gate ids.
+        """
+        visited = array('b', bytes(self.num_nodes(GATE)))
+        postorder = []
+        stack = [(root, self.arguments(root))]  # to avoid recursion
+        visited[root] = 1
+        while stack:
+            gate, args = stack[-1]
+            for ref in args:
+                if ref_kind(ref) != GATE:
+                    continue
+                arg = ref_node(ref)
+                assert visited[arg] != 1  # a cycle
+                if not visited[arg]:
+                    visited[arg] = 1
+                    stack.append((arg, self.arguments(arg)))
+                    break
+            else:
+                stack.pop()
+                visited[gate] = 2
+                postorder.append(gate)
+        postorder.reverse()
+        return postorder
+
+    def ancestors(self, gate):
+        """Provides lazy ancestors of the gate for cycle checks.
+
+        Args:
+            gate: The id of the gate.
+
+        Returns:
+            LazyCoreAncestors of the gate.
+        """
+        return LazyCoreAncestors(self, gate)
+
+
+class LazyCoreAncestors:
+    """Ancestors of a graph core gate discovered in decreasing rank order.
+
+    This is the integer counterpart of generator.event.gate.LazyAncestors.
+    The ancestors of the gate must not change while this object is in use.
+    """
+
+    def __init__(self, core, gate):
+        """Starts the discovery from the given gate.
+
+        Args:
+            core: The graph core under construction.
+            gate: The id of the gate whose ancestors are queried.
+        """
+        self.__core = core
+        self.__gate = gate
+        self.__discovered = {gate}
+        self.__queue = [(-core.ranks[gate], gate)]  # max-heap of ranks
+
+    def num_discovered(self):
+        """Returns the number of gates discovered so far."""
+        return len(self.__discovered)
+
+    def __contains__(self, other):
+        """Checks if the gate is the gate itself or one of its ancestors."""
+        if other == self.__gate:
+            return True
+        ranks = self.__core.ranks
+        if ranks[other] >= ranks[self.__gate]:
+            return False
+        queue = self.__queue
+        discovered = self.__discovered
+        while queue and -queue[0][0] > ranks[other]:
+            _, gate = heapq.heappop(queue)
+            for parent in self.__core.parents(GATE, gate):
+                if parent not in discovered:
+                    discovered.add(parent)
+                    heapq.heappush(queue, (-ranks[parent], parent))
+        return other in discovered
+
+
+class _NodeView:
+    """Light-weight view of a graph core node with the object model interface.
+
+    Views are created on demand and hold no state of their own.
+    """
+
+    KIND = None
+
+    __slots__ = ("tree", "node")
+
+    def __init__(self, tree, node):
+        """Views the node of the compact fault tree.
+
+        Args:
+            tree: The owner CompactFaultTree.
+            node: The id of the node.
+        """
+        self.tree = tree
+        self.node = node
+
+    def __str__(self):
+        return self.name
+
+    def __hash__(self):
+        return hash((self.KIND, self.node))
+
+    def __eq__(self, other):
+        return (isinstance(other, _NodeView) and self.KIND == other.KIND and
+                self.node == other.node)
+
+    def num_parents(self):
+        """Returns the number of unique parents."""
+        return self.tree.core.num_parents[self.KIND][self.node]
+
+    def is_common(self):
+        """Indicates if this node appears in several places."""
+        return self.num_parents() > 1
+
+    def is_orphan(self):
+        """Determines if the node has no parents."""
+        return not self.num_parents()
+
+
+class GateView(_NodeView):
+    """View of a graph core gate for the object model writers."""
+
+    KIND = GATE
+
+    __slots__ = ()
+
+    get_xml = Gate.get_xml
+    to_xml = Gate.to_xml
+    to_aralia = Gate.to_aralia
+
+    @property
+    def name(self):
+        """The unique name of the gate."""
+        if self.node == 0:
+            return self.tree.root_name
+        return "G" + str(self.node + 1)
+
+    @property
+    def operator(self):
+        """Logical operator of the gate formula."""
+        return OPERATORS[self.tree.core.operators[self.node]]
+
+    @property
+    def k_num(self):
+        """Min number for the combination operator."""
+        return self.tree.core.k_nums[self.node] or None
+
+    @k_num.setter
+    def k_num(self, value):
+        self.tree.core.k_nums[self.node] = value
+
+    def num_arguments(self):
+        """Returns the number of arguments."""
+        return self.tree.core.num_args[self.node]
+
+    def __arguments(self, kind):
+        """Collects views of arguments of the given kind."""
+        view = self.tree.VIEWS[kind]
+        return tuple(
+            view(self.tree, ref_node(x))
+            for x in self.tree.core.arguments(self.node)
+            if ref_kind(x) == kind)
+
+    @property
+    def g_arguments(self):
+        """Arguments that are gates."""
+        return self.__arguments(GATE)
+
+    @property
+    def b_arguments(self):
+        """Arguments that are basic events."""
+        return self.__arguments(BASIC)
+
+    @property
+    def h_arguments(self):
+        """Arguments that are house events."""
+        return self.__arguments(HOUSE)
+
+    @property
+    def u_arguments(self):
+        """Arguments that are undefined (never in the graph core)."""
+        return ()
+
+
+class BasicEventView(_NodeView):
+    """View of a graph core basic event for the object model writers."""
+
+    KIND = BASIC
+
+    __slots__ = ()
+
+    @property
+    def name(self):
+        """The unique name of the basic event."""
+        return "B" + str(self.node + 1)
+
+    def get_xml(self):
+        """Produces the Open-PSA MEF XML definition of the basic event."""
+        probability = PointEstimate(self.tree.core.probabilities[self.node])
+        return ('<define-basic-event name="' + self.name + '">\n' +
+                probability.get_xml() + '\n</define-basic-event>')
+
+    def to_xml(self, printer):
+        """Produces the Open-PSA MEF XML definition of the basic event."""
+        printer(self.get_xml())
+
+    def to_aralia(self, printer):
+        """Produces the Aralia definition of the basic event.
+
+        The probabilities of the graph core are point estimates.
+        """
+        printer('p(', self.name, ') = ',
+                str(self.tree.core.probabilities[self.node]))
+
+
+class HouseEventView(_NodeView):
+    """View of a graph core house event for the object model writers."""
+
+    KIND = HOUSE
+
+    __slots__ = ()
+
+    get_xml = HouseEvent.get_xml
+    to_xml = HouseEvent.to_xml
+    to_aralia = HouseEvent.to_aralia
+
+    @property
+    def name(self):
+        """The unique name of the house event."""
+        return "H" + str(self.node + 1)
+
+    @property
+    def state(self):
+        """Boolean state string of the constant."""
+        return "true" if self.tree.core.states[self.node] else "false"
+
+
+class NodeSequence:
+    """Read-only sequence of node views.
+
+    Args:
+        tree: The owner CompactFaultTree.
+        kind: The kind of the nodes.
+        nodes: An optional sequence of node ids (all nodes by default).
+    """
+
+    def __init__(self, tree, kind, nodes=None):
+        """Initializes the sequence view."""
+        self.__tree = tree
+        self.__view = tree.VIEWS[kind]
+        self.__nodes = nodes if nodes is not None else range(
+            tree.core.num_nodes(kind))
+
+    def __len__(self):
+        return len(self.__nodes)
+
+    def __getitem__(self, index):
+        return self.__view(self.__tree, self.__nodes[index])
+
+    def __iter__(self):
+        for node in self.__nodes:
+            yield self.__view(self.__tree, node)
+
+
+class CompactFaultTree:  # pylint: disable=too-many-instance-attributes
+    """Fault tree backed by the graph core.
+
+    The members of the fault tree are exposed as views
+    with the interface of the FaultTree containers.
+    The top gate is always the gate 0.
+
+    Attributes:
+        name: The name of the fault tree.
+        root_name: The name of the top gate.
+        factors: The fault tree generation factors.
+        core: The graph core with all the nodes.
+        ccf_groups: A list of created CCF groups.
+        non_ccf_events: Basic events that are not in CCF groups.
+        rng: The source of random numbers for this fault tree only.
+        house_targets: Gates that can get house events
+            (not the top gate and not NOT/XOR gates).
+        exhaustion_targets: Gates that can get gates
+            upon the exhaustion of the queue (not common or NOT/XOR gates).
+        stats: The running statistics of the generation if any.
+        profile: The optional profile of the generation and output phases.
+    """
+
+    VIEWS = (GateView, BasicEventView, HouseEventView)
+
+    to_xml = FaultTree.to_xml
+
+    def __init__(self, name, root_name, factors, rng=random):
+        """Initializes an empty fault tree.
+
+        Args:
+            name: The name of the system described by the fault tree container.
+            root_name: Unique name for the root gate.
+            factors: Fully configured generation factors.
+            rng: A random.Random instance (the shared random module if omitted).
+        """
+        self.name = name
+        self.root_name = root_name
+        self.factors = factors
+        self.core = GraphCore()
+        self.ccf_groups = []
+        self.non_ccf_events = NodeSequence(self, BASIC, ())
+        self.rng = rng
+        self.house_targets = array('i')
+        self.exhaustion_targets = array('i')
+        self.stats = GenerationStats()
+        self.core.stats = self.stats
+        self.profile = None
+
+    @property
+    def top_gate(self):
+        """The root gate of the fault tree."""
+        return GateView(self, 0)
+
+    @property
+    def top_node(self):
+        """The id of the root gate for the generation steps."""
+        return 0
+
+    @property
+    def gates(self):
+        """All the gates in the order of construction."""
+        return NodeSequence(self, GATE)
+
+    @property
+    def basic_events(self):
+        """All the basic events in the order of construction."""
+        return NodeSequence(self, BASIC)
+
+    @property
+    def house_events(self):
+        """All the house events in the order of construction."""
+        return NodeSequence(self, HOUSE)
+
+    def construct_gate(self, operator=None, common=False):
+        """Constructs a new gate.
+
+        Args:
+            operator: The gate operator (random by default).
+            common: True if the gate is going to be common.
+
+        Returns:
+            The id of the new gate with random attributes.
+        """
+        if operator is None:
+            operator = self.factors.get_random_operator(self.rng)
+        gate = self.core.add_gate(OPERATOR_CODES[operator])
+        self.stats.add_gate(operator)
+        if operator not in ("not", "xor"):
+            if gate:
+                self.house_targets.append(gate)
+            if not common:
+                self.exhaustion_targets.append(gate)
+        return gate
+
+    def construct_top_gate(self):
+        """Constructs the gate 0 suitable for being a root."""
+        assert not self.core.num_nodes(GATE)
+        operator = self.factors.get_random_operator(self.rng)
+        while operator in ("xor", "not"):
+            operator = self.factors.get_random_operator(self.rng)
+        self.construct_gate(operator)
+
+    def construct_basic_event(self):
+        """Constructs a basic event with a random probability.
+
+        Returns:
+            The id of the new basic event.
+        """
+        return self.core.add_basic_event(
+            self.factors.get_random_probability(self.rng))
+
+    def construct_house_event(self):
+        """Constructs a house event with a random state.
+
+        Returns:
+            The id of the new house event.
+        """
+        return self.core.add_house_event(
+            self.rng.choice(["true", "false"]) == "true")
+
+    def construct_ccf_group(self, members):
+        """Constructs a unique CCF group with factors.
+
+        Args:
+            members: A sequence of member basic event ids.
+
+        Returns:
+            A fully initialized CCF group with random factors.
+        """
+        assert len(members) > 1
+        ccf_group = CcfGroup("CCF" + str(len(self.ccf_groups) + 1))
+        self.ccf_groups.append(ccf_group)
+        ccf_group.members = [BasicEventView(self, x) for x in members]
+        ccf_group.prob = self.rng.uniform(self.factors.min_prob,
+                                          self.factors.max_prob)
+        ccf_group.model = "MGL"
+        levels = self.rng.randint(2, len(members))
+        ccf_group.factors = [
+            self.rng.uniform(0.1, 1) for _ in range(levels - 1)
+        ]
+        return ccf_group
+
+    def get_num_args(self, gate):
+        """Samples the number of arguments for the gate (see Factors)."""
+        return self.factors.get_num_args(GateView(self, gate), self.rng)
+
+    def num_arguments(self, gate):
+        """Returns the number of arguments of the gate."""
+        return self.core.num_args[gate]
+
+    def num_parents(self, gate):
+        """Returns the number of parents of the gate."""
+        return self.core.num_parents[GATE][gate]
+
+    def has_gate_argument(self, gate, arg):
+        """Checks if the gate has the other gate as an argument."""
+        return self.core.has_argument(gate, make_ref(GATE, arg))
+
+    def add_gate_argument(self, gate, arg):
+        """Adds the other gate into the arguments of the gate."""
+        self.core.add_argument(gate, make_ref(GATE, arg))
+
+    def add_basic_argument(self, gate, basic_event):
+        """Adds the basic event into the arguments of the gate."""
+        self.core.add_argument(gate, make_ref(BASIC, basic_event))
+
+    def add_house_argument(self, gate, house_event):
+        """Adds the house event into the arguments of the gate."""
+        self.core.add_argument(gate, make_ref(HOUSE, house_event))
+
+    def get_ancestors(self, gate):
+        """Provides lazy ancestors of the gate for cycle checks."""
+        return self.core.ancestors(gate)
+
+    def finalize_gate(self, gate):
+        """Processes the gate with all the arguments (see GraphCore.finalize).
+
+        Args:
+            gate: The id of the initialized gate.
+        """
+        self.core.finalize(gate)
+
+    def index_common_events(self, basic_events, gates):
+        """Tracks common basic events and gates by their number of parents.
+
+        Args:
+            basic_events: An iterable of common basic event ids.
+            gates: An iterable of common gate ids.
+
+        Returns:
+            Parent count indexes of the common basic events and gates
+            updated by the graph core.
+        """
+        core = self.core
+        common_basic = ParentCountIndex(basic_events,
+                                        core.num_parents[BASIC].__getitem__,
+                                        self.rng)
+        common_gate = ParentCountIndex(gates,
+                                       core.num_parents[GATE].__getitem__,
+                                       self.rng)
+        core.track(BASIC, common_basic)
+        core.track(GATE, common_gate)
+        return common_basic, common_gate
+
+    def basic_event_nodes(self):
+        """Returns a new array of all the basic event ids."""
+        return array('i', range(self.core.num_nodes(BASIC)))
+
+    def set_non_ccf_events(self, members):
+        """Assigns the basic events that are not in CCF groups.
+
+        Args:
+            members: A sequence of basic event ids.
+        """
+        self.non_ccf_events = NodeSequence(self, BASIC, members)
+
+    def freeze(self):
+        """Converts the graph core into the final read-only layout."""
+        self.core.freeze()
+
+    def to_aralia(self, printer):
+        """Produces the Aralia definition of the fault tree.
+
+        The output is the same as FaultTree.to_aralia
+        for the equivalent object model.
+
+        Args:
+            printer: The output stream.
+        """
+        printer(self.name)
+        printer()
+
+        with profiler.phase(self.profile, "toposort_gates"):
+            sorted_gates = self.core.toposort(0)
+        for gate in sorted_gates:
+            GateView(self, gate).to_aralia(printer)
+
+        printer()
+
+        for basic_event in self.basic_events:
+            basic_event.to_aralia(printer)
+
+        printer()
+
+        for house_event in self.house_events:
+            house_event.to_aralia(printer)
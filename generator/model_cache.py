@@ -0,0 +1,215 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Content-addressed on-disk cache of generated models.
+
+The models are stored under the SHA-256 hash
+of their generation setup and the generator version.
+The generator version includes the digest of the generator sources,
+so any change of the code invalidates the cache.
+
+The cache directory is bounded in size
+with the least recently used models evicted first
+(the modification time of the model file marks its last use).
+The hits are copied into the output
+rather than hard-linked,
+so that overwriting the output never corrupts the cache.
+The cache accesses are appended to the log of the directory
+to report the hits, misses, and the generation time saved.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+from generator import bulk_writer
+
+
+@functools.lru_cache(maxsize=None)
+def get_version():
+    """Provides the version of the generator for cache keys.
+
+    Returns:
+        The hex digest of the generator package sources.
+    """
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for root, dirs, files in os.walk(package_dir):
+        dirs.sort()
+        for file_name in sorted(x for x in files if x.endswith(".py")):
+            path = os.path.join(root, file_name)
+            digest.update(os.path.relpath(path, package_dir).encode())
+            with open(path, "rb") as source:
+                digest.update(source.read())
+    return digest.hexdigest()
+
+
+def make_key(setup):
+    """Computes the cache key of the model.
+
+    Args:
+        setup: A JSON-serializable dictionary
+            of everything that determines the output of the generation.
+
+    Returns:
+        The hex digest of the setup and the generator version.
+    """
+    data = json.dumps({"setup": setup, "version": get_version()},
+                      sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class ModelCache:
+    """On-disk cache of generated models with LRU eviction.
+
+    Attributes:
+        directory: The path to the cache directory.
+        max_size: The size limit of the cached models in bytes.
+    """
+
+    __LOG = "access.log"
+
+    def __init__(self, directory, max_size):
+        """Opens or creates the cache directory.
+
+        Args:
+            directory: The path to the cache directory.
+            max_size: The size limit of the cached models in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def __get_path(self, key):
+        """Provides the path to the cached model."""
+        return os.path.join(self.directory, key[:2], key + ".xml")
+
+    def __log(self, record):
+        """Appends the record of the cache access to the log."""
+        with open(os.path.join(self.directory, ModelCache.__LOG), "a") as log:
+            log.write(json.dumps(record) + "\n")
+
+    def __entries(self):
+        """Yields the path, size, and last use time of cached models."""
+        for root, _, files in os.walk(self.directory):
+            for file_name in files:
+                if file_name.endswith(".xml"):
+                    path = os.path.join(root, file_name)
+                    stat = os.stat(path)
+                    yield path, stat.st_size, stat.st_mtime
+
+    def __evict(self):
+        """Removes the least recently used models over the size limit."""
+        entries = sorted(self.__entries(), key=lambda x: x[2])
+        total_size = sum(x[1] for x in entries)
+        for path, size, _ in entries:
+            if total_size <= self.max_size:
+                break
+            total_size -= size
+            try:
+                os.remove(path)
+                os.remove(path + ".json")
+            except FileNotFoundError:
+                continue  # evicted concurrently
+            self.__log({"event": "evict", "size": size})
+
+    @staticmethod
+    def __deliver(model, out):
+        """Puts the open model file into the output file or stdout."""
+        if not out:
+            shutil.copyfileobj(model, sys.stdout)
+            return
+        with open(out, "w") as out_file:
+            shutil.copyfileobj(model, out_file)
+
+    def write_model(self, key, out, generate):
+        """Writes the cached model or generates and caches it.
+
+        Args:
+            key: The cache key of the model.
+            out: The output file path (None for stdout).
+            generate: The function to generate the model with a printer
+                returning the JSON-serializable metadata of the model.
+
+        Returns:
+            The metadata of the model.
+        """
+        path = self.__get_path(key)
+        try:
+            with open(path + ".json") as info_file:
+                info = json.load(info_file)
+            os.utime(path)
+            model = open(path)  # the open model survives eviction
+        except FileNotFoundError:
+            info = None  # not cached or evicted concurrently
+        if info:
+            with model:
+                self.__deliver(model, out)
+            self.__log({"event": "hit", "time": info["time"]})
+            return info["metadata"]
+
+        # The model is in place before its metadata marks it as cached.
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp%d" % os.getpid()
+        start_time = time.perf_counter()
+        with bulk_writer.open_writer(tmp_path) as printer:
+            metadata = generate(printer)
+        gen_time = time.perf_counter() - start_time
+        with open(tmp_path) as model:
+            self.__deliver(model, out)
+        os.replace(tmp_path, path)
+        tmp_path = path + ".json.tmp%d" % os.getpid()
+        with open(tmp_path, "w") as info_file:
+            json.dump({"time": gen_time, "metadata": metadata}, info_file)
+        os.replace(tmp_path, path + ".json")
+        self.__log({"event": "miss", "time": gen_time})
+        self.__evict()
+        return metadata
+
+    def get_stats(self):
+        """Summarizes the cache use.
+
+        Returns:
+            A dictionary with the number of hits, misses, evictions,
+            cached models, their size in bytes,
+            and the generation time saved by hits in seconds.
+        """
+        stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "entries": 0,
+            "size": 0,
+            "time_saved": 0
+        }
+        log_path = os.path.join(self.directory, ModelCache.__LOG)
+        if os.path.exists(log_path):
+            with open(log_path) as log:
+                for line in log:
+                    record = json.loads(line)
+                    if record["event"] == "hit":
+                        stats["hits"] += 1
+                        stats["time_saved"] += record["time"]
+                    elif record["event"] == "miss":
+                        stats["misses"] += 1
+                    else:
+                        stats["evictions"] += 1
+        for _, size, _ in self.__entries():
+            stats["entries"] += 1
+            stats["size"] += size
+        return stats
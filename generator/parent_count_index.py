@@ -0,0 +1,165 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Index of shared events bucketed by the number of their parents.
+
+The fault tree generator prefers orphan common events over single-parent ones,
+and single-parent ones over the rest.
+Rebuilding these groups by scanning all common events
+for every gate argument is quadratic in the size of the fault tree.
+This index keeps the groups up-to-date instead
+as gates gain arguments (see Gate.add_argument).
+"""
+
+import random
+
+
+class ParentCountIndex:
+    """Collection of events bucketed by their number of parents (0, 1, 2+).
+
+    Every bucket is a list with an auxiliary position map,
+    so that insertion, removal, and uniform random draws are O(1).
+    The order of events in a bucket is arbitrary.
+
+    Attributes:
+        MAX_BUCKET: The bucket number for events with 2 or more parents.
+    """
+
+    MAX_BUCKET = 2
+
+    def __init__(self, events=(), num_parents=None, rng=random):
+        """Initializes the index with the given events.
+
+        Args:
+            events: An iterable of events to be tracked.
+            num_parents: An optional function giving the number of parents
+                of a tracked event, for events without the parents attribute
+                (e.g., integer node ids of the graph core).
+                The owner of such events must call update() on its own.
+            rng: The source of random numbers for sampling.
+        """
+        self.__rng = rng
+        self.__buckets = tuple([] for _ in range(ParentCountIndex.MAX_BUCKET + 1))
+        self.__positions = {}  # event -> (bucket number, position in bucket)
+        self.__num_parents = num_parents
+        for event in events:
+            self.add(event)
+
+    def __len__(self):
+        """Returns the total number of tracked events."""
+        return len(self.__positions)
+
+    def __contains__(self, event):
+        """Checks if the event is tracked by this index."""
+        return event in self.__positions
+
+    def __bucket_number(self, event):
+        """Determines the bucket for the event by its parents."""
+        if self.__num_parents is None:
+            num_parents = len(event.parents)
+        else:
+            num_parents = self.__num_parents(event)
+        return min(num_parents, ParentCountIndex.MAX_BUCKET)
+
+    def __insert(self, event, bucket_num):
+        """Appends the event to the end of the bucket."""
+        bucket = self.__buckets[bucket_num]
+        self.__positions[event] = (bucket_num, len(bucket))
+        bucket.append(event)
+
+    def __remove(self, event):
+        """Removes the event from its bucket by swapping it with the last one."""
+        bucket_num, pos = self.__positions.pop(event)
+        bucket = self.__buckets[bucket_num]
+        last = bucket.pop()
+        if pos < len(bucket):  # the event was not the last one
+            bucket[pos] = last
+            self.__positions[last] = (bucket_num, pos)
+
+    def __swap(self, bucket, i, j):
+        """Swaps two events in the bucket along with their positions."""
+        bucket[i], bucket[j] = bucket[j], bucket[i]
+        bucket_num = self.__positions[bucket[i]][0]
+        self.__positions[bucket[i]] = (bucket_num, i)
+        self.__positions[bucket[j]] = (bucket_num, j)
+
+    def add(self, event):
+        """Starts tracking the event.
+
+        Unless the index has a custom parent counter,
+        the event gets a back-reference to this index
+        to notify about its new parents.
+
+        Args:
+            event: The event not yet in the index.
+        """
+        assert event not in self.__positions
+        if self.__num_parents is None:
+            event.parent_index = self
+        self.__insert(event, self.__bucket_number(event))
+
+    def update(self, event):
+        """Moves the event into the bucket matching its number of parents.
+
+        Args:
+            event: The tracked event with a possibly changed set of parents.
+        """
+        bucket_num = self.__bucket_number(event)
+        if self.__positions[event][0] != bucket_num:
+            self.__remove(event)
+            self.__insert(event, bucket_num)
+
+    def bucket(self, num_parents):
+        """Provides the read-only view of events with the number of parents.
+
+        Args:
+            num_parents: The number of parents (saturated at MAX_BUCKET).
+
+        Returns:
+            The bucket list that must not be modified by the caller.
+        """
+        return self.__buckets[min(num_parents, ParentCountIndex.MAX_BUCKET)]
+
+    def choice(self):
+        """Samples an event with the fewest parents.
+
+        Returns:
+            A uniformly chosen event from the first non-empty bucket.
+
+        Raises:
+            IndexError: The index is empty.
+        """
+        for bucket in self.__buckets:
+            if bucket:
+                return self.__rng.choice(bucket)
+        raise IndexError("Cannot choose from an empty index")
+
+    def candidates(self):
+        """Lazy generator of events in the order of preference.
+
+        Orphans come first, then single-parent events, then the rest.
+        Every bucket is yielded in a uniformly random order
+        with an in-place partial Fisher-Yates shuffle,
+        so every yielded candidate costs O(1).
+
+        The iteration must be abandoned
+        once any of the tracked events gains a new parent.
+
+        Yields:
+            A next event candidate.
+        """
+        for bucket in self.__buckets:
+            for i in range(len(bucket)):
+                self.__swap(bucket, i, self.__rng.randrange(i, len(bucket)))
+                yield bucket[i]
@@ -0,0 +1,281 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Dry-run planning of the fault tree generation.
+
+The shape of the fault tree is predicted
+from the analytic estimates of the generation factors
+without generating anything.
+The output sizes follow from the shape and the fixed output templates,
+and the peak memory and run times follow from the number of nodes
+with the constants calibrated by benchmarks.calibrate_planner.
+
+The constrained number of gates and the exhaustion of candidates
+may change the actual shape by a few percent,
+and the calibration is specific to the machine and the Python version.
+"""
+
+import copy
+import json
+
+# The models by the fault tree model (see benchmarks.calibrate_planner):
+# the peak memory in bytes per node over the interpreter RSS (base_bytes),
+# the generation time in seconds as a power law of the number of nodes,
+# and the writing time per output byte.
+# The defaults are measured with CPython 3.11 on x86-64 Linux.
+CALIBRATION = {
+    "standard": {
+        "base_bytes": 35.5e6,
+        "bytes_per_node": 505,
+        "time_coefficient": 5.28e-8,
+        "time_exponent": 1.53,
+        "seconds_per_byte": 5.9e-8
+    },
+    "compact": {
+        "base_bytes": 35.5e6,
+        "bytes_per_node": 66.7,
+        "time_coefficient": 1.96e-7,
+        "time_exponent": 1.44,
+        "seconds_per_byte": 1.03e-7
+    }
+}
+
+_OPERATORS = ("and", "or", "atleast", "not", "xor")
+_HEADER_BYTES = 1500  # the setup and summary comments in the XML output
+_FLOAT_LENGTH = 19  # the average length of a random probability repr
+
+
+def get_name_length(prefix, count):
+    """Computes the total length of the names of sequentially numbered nodes.
+
+    Args:
+        prefix: The prefix of the names (e.g., "G" for G1, G2, ...).
+        count: The number of nodes numbered from 1.
+
+    Returns:
+        The total number of characters in the names.
+    """
+    total = len(prefix) * count
+    first = 1
+    num_digits = 1
+    while first <= count:
+        total += (min(count, first * 10 - 1) - first + 1) * num_digits
+        first *= 10
+        num_digits += 1
+    return total
+
+
+def get_ccf_group_size(factors):
+    """Provides the average number of members in CCF groups."""
+    return (2 + int(2 * factors.num_args - 2)) / 2
+
+
+def get_shape(factors):
+    """Predicts the shape of the fault tree from the factors.
+
+    Args:
+        factors: Fully initialized Factors object.
+
+    Returns:
+        A dictionary of the expected numbers of nodes,
+        edges (gate arguments) by the argument type,
+        common nodes, and gates by the operator.
+    """
+    num_gate = max(1, factors.get_num_gate())
+    num_edges = factors.num_args * num_gate
+    percent_gate = factors.get_percent_gate()
+    weights = factors.get_gate_weights()
+    num_ccf = factors.num_ccf
+    if num_ccf:  # until the basic events run out
+        num_ccf = min(num_ccf,
+                      int(factors.num_basic / get_ccf_group_size(factors)))
+    return {
+        "num_basic": factors.num_basic,
+        "num_house": factors.num_house,
+        "num_ccf": num_ccf,
+        "num_gate": num_gate,
+        "gates": {
+            operator: num_gate * weight / sum(weights)
+            for operator, weight in zip(_OPERATORS, weights)
+        },
+        "num_gate_edges": num_edges * percent_gate,
+        "num_basic_edges": num_edges * (1 - percent_gate),
+        "num_house_edges": factors.num_house,
+        "num_common_basic": factors.get_num_common_basic(num_gate),
+        "num_common_gate": factors.get_num_common_gate(num_gate)
+    }
+
+
+def get_name_lengths(shape):
+    """Provides the average name lengths of the nodes by the node prefix."""
+    return {
+        prefix: get_name_length(prefix, count) / max(1, count)
+        for prefix, count in (("G", shape["num_gate"]),
+                              ("B", shape["num_basic"]),
+                              ("H", shape["num_house"]),
+                              ("CCF", shape["num_ccf"]))
+    }
+
+
+def get_xml_bytes(shape, factors, ft_name):
+    """Estimates the size of the Open-PSA MEF XML output.
+
+    Args:
+        shape: The predicted shape of the fault tree (see get_shape).
+        factors: Fully initialized Factors object.
+        ft_name: The name of the fault tree.
+
+    Returns:
+        The expected number of bytes.
+    """
+    name = get_name_lengths(shape)
+    size = _HEADER_BYTES + 100 + len(ft_name)  # with the container tags
+    for operator, count in shape["gates"].items():
+        size += count * (44 + 2 * len(operator) + 8 * (operator == "atleast"))
+    size += shape["num_gate"] * name["G"]
+    size += shape["num_gate_edges"] * (16 + name["G"])
+    size += shape["num_basic_edges"] * (23 + name["B"])
+    size += shape["num_house_edges"] * (23 + name["H"])
+    group_size = get_ccf_group_size(factors)  # with group_size / 2 factors
+    num_members = shape["num_ccf"] * group_size  # defined in the groups
+    size += (shape["num_basic"] - num_members) * (69 + name["B"] +
+                                                  _FLOAT_LENGTH)
+    size += shape["num_house"] * (76.5 + name["H"])
+    size += shape["num_ccf"] * (169 + name["CCF"] + _FLOAT_LENGTH + group_size *
+                                (23 + name["B"] + (66 + _FLOAT_LENGTH) / 2))
+    return int(size)
+
+
+def get_aralia_bytes(shape, ft_name):
+    """Estimates the size of the Aralia output.
+
+    The basic events are counted as p(B1) = 0.01 lines.
+
+    Args:
+        shape: The predicted shape of the fault tree (see get_shape).
+        ft_name: The name of the fault tree.
+
+    Returns:
+        The expected number of bytes.
+    """
+    name = get_name_lengths(shape)
+    num_edges = (shape["num_gate_edges"] + shape["num_basic_edges"] +
+                 shape["num_house_edges"])
+    size = len(ft_name) + 4
+    size += shape["num_gate"] * (name["G"] + 7)  # G1 := (...)
+    size += shape["gates"]["atleast"] * 6  # @(2, [...])
+    size += 3 * max(0, num_edges - shape["num_gate"])  # the separators
+    size += shape["num_gate_edges"] * name["G"]
+    size += shape["num_basic_edges"] * name["B"]
+    size += shape["num_house_edges"] * name["H"]
+    size += shape["num_basic"] * (7 + name["B"] + _FLOAT_LENGTH)
+    size += shape["num_house"] * (11.5 + name["H"])
+    return int(size)
+
+
+def load_calibration(file_path):
+    """Loads the calibration constants over the defaults.
+
+    Args:
+        file_path: The JSON file of the calibration constants
+            by the fault tree model.
+
+    Returns:
+        The calibration constants by the fault tree model.
+    """
+    calibration = copy.deepcopy(CALIBRATION)
+    with open(file_path) as calibration_file:
+        for model, constants in json.load(calibration_file).items():
+            calibration.setdefault(model, {}).update(constants)
+    return calibration
+
+
+def get_plan(factors, ft_name, compact=False, aralia=False, calibration=None):
+    """Plans the fault tree generation without generating anything.
+
+    Args:
+        factors: Fully initialized Factors object.
+        ft_name: The name of the fault tree.
+        compact: Generate into the compact graph core.
+        aralia: Write the output in the Aralia format instead of the XML.
+        calibration: The calibration constants by the fault tree model
+            (CALIBRATION if None).
+
+    Returns:
+        A dictionary of the plan (JSON-serializable)
+        with the expected counts of the fault tree,
+        the output bytes per format,
+        the peak memory in bytes, and the run times in seconds.
+    """
+    shape = get_shape(factors)
+    model = "compact" if compact else "standard"
+    constants = (calibration or CALIBRATION)[model]
+    num_nodes = shape["num_gate"] + shape["num_basic"] + shape["num_house"]
+    num_edges = (shape["num_gate_edges"] + shape["num_basic_edges"] +
+                 shape["num_house_edges"])
+    output_bytes = {
+        "xml": get_xml_bytes(shape, factors, ft_name),
+        "aralia": get_aralia_bytes(shape, ft_name)
+    }
+    return {
+        "model": model,
+        "num_basic": shape["num_basic"],
+        "num_house": shape["num_house"],
+        "num_ccf": shape["num_ccf"],
+        "num_gate": shape["num_gate"],
+        "gates": {x: round(y) for x, y in shape["gates"].items()},
+        "num_edges": round(num_edges),
+        "num_common_basic": shape["num_common_basic"],
+        "num_common_gate": shape["num_common_gate"],
+        "output_bytes": output_bytes,
+        "peak_memory": round(constants["base_bytes"] +
+                             constants["bytes_per_node"] * num_nodes),
+        "time": {
+            "generation": constants["time_coefficient"] *
+                          num_nodes**constants["time_exponent"],
+            "writing": constants["seconds_per_byte"] *
+                       output_bytes["aralia" if aralia else "xml"]
+        }
+    }
+
+
+def write_plan(plan, printer):
+    """Writes the summary of the plan.
+
+    Args:
+        plan: The plan of the fault tree generation (see get_plan).
+        printer: The output stream.
+    """
+    gate_count = plan["gates"]
+    printer('The expected number of basic events: ', plan["num_basic"])
+    printer('The expected number of house events: ', plan["num_house"])
+    printer('The expected number of CCF groups: ', plan["num_ccf"])
+    printer('The expected number of gates: ', plan["num_gate"])
+    printer('    AND gates: ', gate_count['and'])
+    printer('    OR gates: ', gate_count['or'])
+    printer('    K/N gates: ', gate_count['atleast'])
+    printer('    NOT gates: ', gate_count['not'])
+    printer('    XOR gates: ', gate_count['xor'])
+    printer('The expected number of gate arguments: ', plan["num_edges"])
+    printer('The expected number of common basic events: ',
+            plan["num_common_basic"])
+    printer('The expected number of common gates: ', plan["num_common_gate"])
+    printer('The expected size of the XML output (bytes): ',
+            plan["output_bytes"]["xml"])
+    printer('The expected size of the Aralia output (bytes): ',
+            plan["output_bytes"]["aralia"])
+    printer('The estimated peak memory (bytes): ', plan["peak_memory"])
+    printer('The estimated generation time (seconds): ',
+            plan["time"]["generation"])
+    printer('The estimated writing time (seconds): ', plan["time"]["writing"])
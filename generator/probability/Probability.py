@@ -7,6 +7,12 @@ class Probability:
     def to_xml(self, printer):
         raise NotImplementedError
 
+    def get_xml(self):
+        """Produces the Open-PSA MEF XML lines joined into one string."""
+        lines = []
+        self.to_xml(lambda *args: lines.append("".join(map(str, args))))
+        return "\n".join(lines)
+
     def to_openpra_json(self, printer):
         raise NotImplementedError
 
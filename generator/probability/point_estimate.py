@@ -30,4 +30,8 @@ class PointEstimate(Probability):
 
     def to_xml(self, printer):
         """Produces the Open-PSA MEF XML definition of a point estimate."""
-        printer('<float value="', self.value, '"/>')
+        printer(self.get_xml())
+
+    def get_xml(self):
+        """Produces the Open-PSA MEF XML definition of a point estimate."""
+        return '<float value="' + str(self.value) + '"/>'
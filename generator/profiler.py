@@ -0,0 +1,139 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Instrumentation of the phases and hot loops of fault tree generation.
+
+The profile is optional everywhere (None disables it).
+The phases are timed only at coarse-grained call sites,
+and the hot loops keep their counts in local variables
+reported once per call,
+so the instrumentation costs next to nothing when disabled.
+
+The phases may nest (e.g., init_gates within generation),
+so the phase times do not add up to the total time.
+"""
+
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+import time
+
+from generator.bulk_writer import write_many
+
+
+class Profile:
+    """Wall and CPU times of generation phases and counts of events.
+
+    Attributes:
+        phases: The total wall and CPU times (in seconds)
+            and the number of runs of every phase by its name.
+        counters: The counts of events by their names.
+    """
+
+    def __init__(self):
+        """Initializes an empty profile."""
+        self.phases = {}
+        self.counters = Counter()
+
+    @contextmanager
+    def phase(self, name):
+        """Times a run of the phase within the context.
+
+        Args:
+            name: The name of the phase.
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record = self.phases.setdefault(name, {
+                "wall": 0,
+                "cpu": 0,
+                "calls": 0
+            })
+            record["wall"] += time.perf_counter() - wall_start
+            record["cpu"] += time.process_time() - cpu_start
+            record["calls"] += 1
+
+    def count(self, name, value=1):
+        """Adds the value to the counter.
+
+        Args:
+            name: The name of the counter.
+            value: The number of events.
+        """
+        self.counters[name] += value
+
+    def wrap_printer(self, printer):
+        """Counts the bytes written with the printer.
+
+        Args:
+            printer: The output stream.
+
+        Returns:
+            The printer that updates the bytes_written counter
+            (also on the write_many path of the bulk writer).
+        """
+        counters = self.counters
+
+        def _print(*args):
+            line = "".join(str(x) for x in args)
+            counters["bytes_written"] += len(line.encode()) + 1
+            printer(*args)
+
+        def _count(lines):
+            for line in lines:
+                counters["bytes_written"] += len(line.encode()) + 1
+                yield line
+
+        _print.write_many = lambda lines: write_many(printer, _count(lines))
+        return _print
+
+    def get_report(self):
+        """Provides the JSON-serializable profile.
+
+        Returns:
+            A dictionary with the phases and counters.
+        """
+        return {"phases": self.phases, "counters": dict(self.counters)}
+
+
+def phase(profile, name):
+    """Times the phase if the profile is enabled.
+
+    Args:
+        profile: The profile or None.
+        name: The name of the phase.
+
+    Returns:
+        The context manager for the phase.
+    """
+    return profile.phase(name) if profile is not None else nullcontext()
+
+
+def count_tries(profile, num_tries, num_rejected, ancestors):
+    """Registers the search for common gate arguments in the profile.
+
+    Args:
+        profile: The generation profile.
+        num_tries: The number of tries to get a common gate.
+        num_rejected: The number of rejected common gates.
+        ancestors: The lazy ancestors of the gate if ever needed.
+    """
+    profile.count("gates_initialized")
+    profile.count("common_gate_tries", num_tries)
+    profile.count("common_gate_rejections", num_rejected)
+    if ancestors is not None:
+        profile.count("ancestor_searches")
+        profile.count("ancestors_discovered", ancestors.num_discovered())
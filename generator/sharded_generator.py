@@ -0,0 +1,197 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Parallel generation of a single fault tree from independent sub-trees.
+
+The fault tree is split into sub-trees (shards) of equal size
+that are generated in separate processes
+with seeds derived from the seed of the whole fault tree.
+The sub-trees are stitched under the root gate,
+and common basic events get parents across the shards
+with degree-preserving edge swaps:
+two gate arguments that are common basic events exchange their targets.
+The swaps keep the number of arguments of every gate,
+the number of common basic events per gate,
+and the number of parents of every basic event,
+so the Factors targets are preserved exactly.
+Common gates are shared only within shards.
+
+CCF groups are created for the whole fault tree in the end.
+
+The result is deterministic for the seed and the number of shards.
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import random
+
+from generator import generation_steps
+from generator.graph_core import (BASIC, GATE, HOUSE, OPERATOR_CODES,
+                                  CompactFaultTree, GraphCore, make_ref,
+                                  ref_kind, ref_node)
+
+
+def generate_shard(factors, seed):
+    """Generates the compact graph of one sub-tree.
+
+    Args:
+        factors: The factors of the shard (see Factors.split).
+        seed: The seed of the shard.
+
+    Returns:
+        The frozen graph core of the sub-tree with the root gate 0.
+    """
+    factors.calculate()
+    fault_tree = CompactFaultTree("shard", "root", factors,
+                                  random.Random(seed))
+    fault_tree.construct_top_gate()
+    return generation_steps.generate(fault_tree).core
+
+
+def sample_root_operator(factors, num_args, rng):
+    """Samples the operator and the min number for the stitching root.
+
+    Args:
+        factors: The factors of the whole fault tree.
+        num_args: The number of root arguments.
+        rng: The source of random numbers.
+
+    Returns:
+        The operator code and the min number (0 for non-K/N operators).
+    """
+    while True:
+        operator = factors.get_random_operator(rng)
+        if operator in ("xor", "not"):
+            continue
+        if operator == "atleast":
+            if num_args < 3:
+                continue
+            return OPERATOR_CODES[operator], rng.randint(2, num_args - 1)
+        return OPERATOR_CODES[operator], 0
+
+
+def stitch_shards(cores, operator, k_num):
+    """Merges sub-tree graphs under the new root gate.
+
+    The gates of the shards are numbered after the root gate 0,
+    and the other nodes follow the order of the shards.
+
+    Args:
+        cores: Frozen graph cores of the sub-trees.
+        operator: The operator code of the root gate.
+        k_num: The min number of the root gate.
+
+    Returns:
+        The operators, k_nums, probabilities, states, edge parents,
+        and edge children arrays of the stitched graph.
+    """
+    operators = array('b', [operator])
+    k_nums = array('i', [k_num])
+    probabilities = array('d')
+    states = array('b')
+    edge_parent = array('i')
+    edge_child = array('i')
+    for core in cores:
+        gate_offset = len(operators)
+        offsets = (gate_offset, len(probabilities), len(states))
+        edge_parent.append(0)
+        edge_child.append(make_ref(GATE, gate_offset))
+        for gate in range(core.num_nodes(GATE)):
+            for ref in core.arguments(gate):
+                edge_parent.append(gate_offset + gate)
+                edge_child.append(
+                    make_ref(ref_kind(ref),
+                             offsets[ref_kind(ref)] + ref_node(ref)))
+        operators.extend(core.operators)
+        k_nums.extend(core.k_nums)
+        probabilities.extend(core.probabilities)
+        states.extend(core.states)
+    return operators, k_nums, probabilities, states, edge_parent, edge_child
+
+
+def mix_common_basic_events(edge_parent, edge_child, num_basic, rng):
+    """Shuffles the common basic event arguments across the whole graph.
+
+    The targets of edges to common basic events are permuted
+    with swaps that do not introduce duplicate arguments.
+
+    Args:
+        edge_parent: The array of parent gate ids of edges.
+        edge_child: The array of argument references of edges (modified).
+        num_basic: The number of basic events.
+        rng: The source of random numbers.
+    """
+    num_parents = array('i', [0]) * num_basic
+    for ref in edge_child:
+        if ref_kind(ref) == BASIC:
+            num_parents[ref_node(ref)] += 1
+    edges = [
+        i for i, ref in enumerate(edge_child)
+        if ref_kind(ref) == BASIC and num_parents[ref_node(ref)] > 1
+    ]
+    common_args = {}  # gate -> common basic event arguments
+    for i in edges:
+        common_args.setdefault(edge_parent[i], set()).add(edge_child[i])
+
+    for i, edge in enumerate(edges):
+        other = edges[rng.randrange(i, len(edges))]
+        ref, other_ref = edge_child[edge], edge_child[other]
+        args = common_args[edge_parent[edge]]
+        other_args = common_args[edge_parent[other]]
+        if other_ref in args or ref in other_args:
+            continue  # also the same event or the same gate
+        args.remove(ref)
+        args.add(other_ref)
+        other_args.remove(other_ref)
+        other_args.add(ref)
+        edge_child[edge], edge_child[other] = other_ref, ref
+
+
+def generate_fault_tree(ft_name, root_name, factors, num_shards, rng=random):
+    """Generates a compact fault tree from sub-trees in parallel processes.
+
+    Args:
+        ft_name: The name of the fault tree.
+        root_name: The name for the root gate of the fault tree.
+        factors: Factors for fault tree generation.
+        num_shards: The number of sub-trees and worker processes.
+        rng: A random.Random instance or the shared random module.
+
+    Returns:
+        The frozen compact fault tree.
+
+    Raises:
+        FactorError: Too many shards for the number of basic events.
+    """
+    seeds = [rng.getrandbits(63) for _ in range(num_shards)]
+    shard_factors = [
+        factors.split(num_shards, i, seed) for i, seed in enumerate(seeds)
+    ]
+    with ProcessPoolExecutor(max_workers=num_shards) as executor:
+        cores = list(executor.map(generate_shard, shard_factors, seeds))
+
+    operator, k_num = sample_root_operator(factors, num_shards, rng)
+    (operators, k_nums, probabilities, states, edge_parent,
+     edge_child) = stitch_shards(cores, operator, k_num)
+    del cores
+    mix_common_basic_events(edge_parent, edge_child, len(probabilities), rng)
+
+    fault_tree = CompactFaultTree(ft_name, root_name, factors, rng)
+    fault_tree.stats = None  # the summary traverses the stitched graph
+    fault_tree.core = GraphCore.from_edges(operators, k_nums, probabilities,
+                                           states, edge_parent, edge_child)
+    assert fault_tree.core.num_nodes(BASIC) == factors.num_basic
+    assert fault_tree.core.num_nodes(HOUSE) == factors.num_house
+    generation_steps.generate_ccf_groups(fault_tree)
+    return fault_tree
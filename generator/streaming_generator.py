@@ -0,0 +1,231 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Generation of fault trees streamed into the Open-PSA MEF output.
+
+The fault tree is generated into the array-backed graph core,
+and the MEF definitions are written as soon as they are final,
+so the output is never accumulated in memory.
+All the definitions go into the fault tree definition in the order:
+
+    - basic and house events upon construction,
+    - CCF groups as soon as all their members are constructed,
+    - gates after their initialization
+      and a delay in the window of recent gates.
+
+Unlike the batch generation,
+which modifies the fault tree after the initialization of all gates,
+the streaming generation has to make the following decisions early:
+
+    - Basic events become CCF group members upon construction
+      with the probability to fill the requested number of groups.
+    - House events are attached to gates upon initialization
+      with the probability to reach the requested number of house events.
+      The remaining house events go into the window of recent gates.
+    - The corrections for the exhausted queue of gates
+      take gates from the window of recent gates.
+
+The NOT connective nesting and the Aralia format are not supported.
+"""
+
+from collections import deque
+import random
+
+from generator import generation_steps
+from generator.graph_core import (BASIC, GATE, HOUSE, OPERATOR_CODES,
+                                  BasicEventView, CompactFaultTree, GateView,
+                                  HouseEventView, make_ref)
+
+_NOT_XOR = (OPERATOR_CODES["not"], OPERATOR_CODES["xor"])
+
+
+class StreamingFaultTree(CompactFaultTree):  # pylint: disable=too-many-instance-attributes
+    """Compact fault tree writing its event definitions upon construction.
+
+    Attributes:
+        printer: The output stream.
+        window: A deque of recently initialized gates not yet written.
+    """
+
+    def __init__(self,
+                 name,
+                 root_name,
+                 factors,
+                 printer,
+                 rng=random,
+                 window_size=1024):
+        """Initializes an empty fault tree.
+
+        Args:
+            name: The name of the system described by the fault tree container.
+            root_name: Unique name for the root gate.
+            factors: Fully configured generation factors.
+            printer: The output stream.
+            rng: A random.Random instance (the shared random module if omitted).
+            window_size: The number of recent gates held back from the output.
+        """
+        super(StreamingFaultTree, self).__init__(name, root_name, factors, rng)
+        self.printer = printer
+        self.window = deque()
+        self.__window_size = window_size
+        self.__ccf_members = []  # members of the next CCF group
+        self.__ccf_size = 0  # the size of the next CCF group
+        self.__ccf_probability = 0
+        if factors.num_ccf:
+            max_args = int(2 * factors.num_args - 2)
+            self.__ccf_probability = min(
+                1, factors.num_ccf * (2 + max_args) / 2 / factors.num_basic)
+            self.__ccf_size = rng.randint(2, max_args)
+        weights = factors.get_gate_weights()
+        num_eligible = (factors.get_num_gate() * sum(weights[:3]) /
+                        sum(weights))
+        self.__house_probability = min(1, factors.num_house /
+                                       max(num_eligible, 1))
+
+    def construct_basic_event(self):
+        """Constructs a basic event and writes or holds it for CCF groups.
+
+        Returns:
+            The id of the new basic event.
+        """
+        basic_event = super(StreamingFaultTree, self).construct_basic_event()
+        if (len(self.ccf_groups) < self.factors.num_ccf and
+                self.rng.random() < self.__ccf_probability):
+            self.__ccf_members.append(basic_event)
+            if len(self.__ccf_members) == self.__ccf_size:
+                self.construct_ccf_group(self.__ccf_members).to_xml(
+                    self.printer)
+                self.__ccf_members = []
+                max_args = int(2 * self.factors.num_args - 2)
+                self.__ccf_size = self.rng.randint(2, max_args)
+        else:
+            BasicEventView(self, basic_event).to_xml(self.printer)
+        return basic_event
+
+    def construct_house_event(self):
+        """Constructs and writes a house event.
+
+        Returns:
+            The id of the new house event.
+        """
+        house_event = super(StreamingFaultTree, self).construct_house_event()
+        HouseEventView(self, house_event).to_xml(self.printer)
+        return house_event
+
+    def is_house_target(self, gate):
+        """Checks if house events can be added to the gate."""
+        return gate != 0 and self.core.operators[gate] not in _NOT_XOR
+
+    def add_house_event(self, gate):
+        """Adds a new house event to the gate."""
+        self.core.add_argument(gate, make_ref(HOUSE,
+                                              self.construct_house_event()))
+
+    def finalize_gate(self, gate):
+        """Processes the initialized gate and writes the delayed gates.
+
+        Args:
+            gate: The id of the gate with all the arguments.
+        """
+        if (self.core.num_nodes(HOUSE) < self.factors.num_house and
+                self.is_house_target(gate) and
+                self.rng.random() < self.__house_probability):
+            self.add_house_event(gate)
+        super(StreamingFaultTree, self).finalize_gate(gate)
+        if gate == 0:
+            return  # The root is written in the end.
+        self.window.append(gate)
+        if len(self.window) > self.__window_size:
+            GateView(self, self.window.popleft()).to_xml(self.printer)
+
+    def correct_for_exhaustion(self, gates_queue, common_gate):
+        """Corrects the generation for queue exhaustion with recent gates.
+
+        Args:
+            gates_queue: A deque of gate ids to be initialized.
+            common_gate: A parent count index of common gate ids.
+        """
+        if gates_queue:
+            return
+        if self.core.num_nodes(BASIC) < self.factors.num_basic:
+            candidates = [
+                x for x in self.window
+                if self.core.operators[x] not in _NOT_XOR and
+                x not in common_gate
+            ] or [0]
+            new_gate = self.construct_gate()
+            self.core.add_argument(self.rng.choice(candidates),
+                                   make_ref(GATE, new_gate))
+            gates_queue.append(new_gate)
+
+    def finish(self):
+        """Distributes the remaining events and writes the held-back gates."""
+        while self.core.num_nodes(HOUSE) < self.factors.num_house:
+            candidates = [x for x in self.window if self.is_house_target(x)]
+            self.add_house_event(self.rng.choice(candidates or [0]))
+        for basic_event in self.__ccf_members:
+            BasicEventView(self, basic_event).to_xml(self.printer)
+        self.__ccf_members = []
+        GateView(self, 0).to_xml(self.printer)
+        while self.window:
+            GateView(self, self.window.popleft()).to_xml(self.printer)
+
+
+def generate_fault_tree(ft_name,
+                        root_name,
+                        factors,
+                        printer,
+                        rng=random,
+                        window_size=1024,
+                        write_header=None):
+    """Generates a fault tree and streams it in the Open-PSA MEF.
+
+    Args:
+        ft_name: The name of the fault tree.
+        root_name: The name for the root gate of the fault tree.
+        factors: Factors for fault tree generation.
+        printer: The output stream.
+        rng: A random.Random instance or the shared random module.
+        window_size: The number of recent gates held back from the output.
+        write_header: An optional function
+            to write the document header for the fault tree
+            before the MEF elements.
+
+    Returns:
+        The generated compact fault tree (already written)
+        with the nodes only, for the edges are released.
+    """
+    fault_tree = StreamingFaultTree(ft_name, root_name, factors, printer, rng,
+                                    window_size)
+    fault_tree.construct_top_gate()
+    if write_header:
+        write_header(fault_tree)
+    printer('<opsa-mef>')
+    printer('<define-fault-tree name="', ft_name, '">')
+    common_basic, common_gate = generation_steps.construct_common_events(
+        fault_tree)
+
+    gates_queue = deque()
+    gates_queue.append(0)
+    while gates_queue:
+        fault_tree.finalize_gate(
+            generation_steps.init_gates(gates_queue, common_basic,
+                                        common_gate, fault_tree))
+        fault_tree.correct_for_exhaustion(gates_queue, common_gate)
+
+    fault_tree.finish()
+    printer('</define-fault-tree>')
+    printer('</opsa-mef>')
+    fault_tree.core.release()
+    return fault_tree
@@ -18,6 +18,7 @@ setuptools.setup(
         "Programming Language :: Python :: 3",
     ],
     install_requires=['argparse', 'setuptools'],
+    extras_require={'batch': ['numpy']},
     test_suite='nose.collector',
     tests_require=['nose', 'typing', 'argparse', 'coverage', 'lxml', 'pytest'],
 )
@@ -1,11 +1,47 @@
 import xml.etree.ElementTree as ET
 import xml.dom.minidom
-import html
+from xml.sax.saxutils import quoteattr
 import logging
+import re
+
+from bulk_writer import BulkWriter
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# The tags with the text content (kept on one line), the other tags, and the text
+_XML_TOKEN = re.compile(r'<[^/!?>][^>]*(?<!/)>[^<]*</[^>]+>|<[^>]+>|[^<]+')
+
+
+def indent_xml(xml_string, indent, level=0):
+    """
+    Split trusted XML text into indented lines, one tag per line.
+
+    The tags are only matched, not parsed,
+    so the indentation takes linear time without building the document tree.
+
+    Args:
+        xml_string (str): Well-formed XML fragment.
+        indent (str): Indentation of one nesting level.
+        level (int): Nesting level of the fragment.
+
+    Returns:
+        generator: Lines without the newlines.
+    """
+    for match in _XML_TOKEN.finditer(xml_string):
+        token = match.group().strip()
+        if not token:
+            continue
+        if token.endswith(' />'):  # ElementTree style of empty elements
+            token = token[:-3] + '/>'
+        if token.startswith('</'):
+            level -= 1
+        yield indent * level + token
+        if (token[0] == '<' and token[1] not in '/?!' and not token.endswith('/>')
+                and '</' not in token):
+            level += 1
+
+
 class XMLDumper:
     def __init__(self, name, event_tree_name):
         self.name = name
@@ -55,13 +91,49 @@ class XMLDumper:
             # Beautify XML
             beautified_xml = dom.toprettyxml()
 
-            # Unescape XML entities
-            unescaped_xml = html.unescape(beautified_xml)
-
-            # Write unescaped XML to file
+            # Write XML to file
             with open(file_path, "w") as xml_file:
-                xml_file.write(unescaped_xml)
+                xml_file.write(beautified_xml)
                 logging.info(f"XML file successfully written to: {file_path}")
 
         except Exception as e:
             logging.error(f"Error dumping XML object to file {file_path}: {e}")
+
+    def stream_object_to_xml(self, generated_objects, file_path, indent='\t'):
+        """
+        Write the model into the file piece by piece without the whole document in memory.
+
+        The initiating event, event tree(s), fault tree definitions, and model data
+        are written in order.
+        The fault tree logic and model data may be any iterables of XML strings or elements,
+        so only the largest single piece is held in memory.
+
+        Args:
+            generated_objects (Element or list): Event tree element(s).
+            file_path (str): Path of the output XML file.
+            indent (str or None): Indentation of one nesting level (no indentation if None).
+        """
+        try:
+            logging.info(f"Starting XML stream to file: {file_path}")
+            if not isinstance(generated_objects, (list, tuple)):
+                generated_objects = [generated_objects]
+            with open(file_path, "w", encoding="utf-8") as xml_file, BulkWriter(xml_file) as printer:
+                printer('<?xml version="1.0" encoding="utf-8"?>')
+                printer('<opsa-mef>')
+                initiating_event = (f'<define-initiating-event name={quoteattr(self.name)} '
+                                    f'event-tree={quoteattr(self.event_tree_name)}/>')
+                for pieces in ([initiating_event], generated_objects,
+                               self.fault_tree_logic_list, self.model_data_list):
+                    for piece in pieces:
+                        if not isinstance(piece, str):
+                            logging.debug(f"Writing element to XML: {piece.tag}")
+                            piece = ET.tostring(piece, encoding="unicode")
+                        if indent is None:
+                            printer(piece)
+                        else:
+                            printer.write_many(indent_xml(piece, indent, 1))
+                printer('</opsa-mef>')
+            logging.info(f"XML file successfully written to: {file_path}")
+
+        except Exception as e:
+            logging.error(f"Error streaming XML object to file {file_path}: {e}")
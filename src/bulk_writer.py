@@ -0,0 +1,87 @@
+# Copyright (C) 2014-2018 Olzhas Rakhimov
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Buffered output of the fault tree writers.
+
+The copy of generator.bulk_writer for the scripts
+that import their modules from this directory.
+"""
+
+from itertools import islice
+
+_BUFFER_LINES = 2**16  # a few MB of the XML output
+
+
+class BulkWriter:
+    """Printer that writes the output lines in bulk.
+
+    The writer is called like the print() built-in with sep=''.
+    The output reaches the destination only on flush,
+    so the writer must be flushed or closed
+    before the destination is read or closed.
+
+    Attributes:
+        destination: The text stream to write into.
+    """
+
+    def __init__(self, destination, buffer_lines=_BUFFER_LINES, close=False):
+        """Initializes the empty buffer.
+
+        Args:
+            destination: The text stream to write into.
+            buffer_lines: The number of lines to accumulate before writing.
+            close: Close the destination with the writer.
+        """
+        self.destination = destination
+        self.__lines = []
+        self.__buffer_lines = buffer_lines
+        self.__close = close
+
+    def __call__(self, *args):
+        """Adds the line of the fragments to the buffer."""
+        lines = self.__lines
+        lines.append("".join(map(str, args)))
+        if len(lines) >= self.__buffer_lines:
+            self.flush()
+
+    def write_many(self, lines):
+        """Adds the complete lines (without the newlines) to the buffer."""
+        lines = iter(lines)
+        buffer = self.__lines
+        while True:  # without the whole iterable in memory
+            buffer.extend(islice(lines, self.__buffer_lines - len(buffer)))
+            if len(buffer) < self.__buffer_lines:
+                break
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered lines into the destination."""
+        lines = self.__lines
+        if lines:
+            lines.append("")  # the newline of the last line
+            self.destination.write("\n".join(lines))
+            lines.clear()
+        self.destination.flush()
+
+    def close(self):
+        """Flushes the writer and closes the owned destination."""
+        self.flush()
+        if self.__close:
+            self.destination.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,6 +1,5 @@
 import xml.etree.ElementTree as ET
 from collections import deque
-from xml.sax.saxutils import escape
 
 class EventTree:
     def __init__(self, name):
@@ -20,7 +19,7 @@ class EventTree:
             functional_event_element = ET.SubElement(event_tree_element, 'define-functional-event',
                                                      {'name': functional_event})
             label_element = ET.SubElement(functional_event_element, 'label')
-            label_element.text = escape(functional_event_name)  # Set label text from the corresponding name list
+            label_element.text = functional_event_name  # Set label text from the corresponding name list (escaped on output)
 
         for sequence in self.sequences:
             sequence_element = ET.SubElement(event_tree_element, 'define-sequence', {'name': sequence})
@@ -16,9 +16,88 @@
 
 from collections import deque
 from math import comb
-import json
 from fractions import Fraction
 from decimal import Decimal
+
+# The OpenPRA JSON references to the gate arguments by the argument name.
+_OPENPRA_GATE_REF = ('{\n"name":"%s",\n"reference_type": "gates",\n'
+                     '"tree_id": null,\n"path": "",\n'
+                     '"_proxy": "EventReference"\n}')
+_OPENPRA_BASIC_REF = ('{\n"name":"%s",\n"reference_type": "basic_events",\n'
+                      '"tree_id": null,\n"path": "",\n'
+                      '"_proxy": "EventReference"\n}')
+
+
+def get_json_id(event):
+    """Provides the integer id of the event for the SAPHSOLVE JSON.
+
+    The id is the number at the end of the event name
+    (e.g., 12 for G12 and B12, 80000 for root80000)
+    or 0 for the names without the number (e.g., root),
+    which the generated gates and basic events never use.
+
+    Args:
+        event: The gate or basic event.
+
+    Returns:
+        The integer id.
+    """
+    name = event.name
+    return int(name[len(name.rstrip("0123456789")):] or 0)
+
+
+def print_SAPHIRE_event(printer, event_id, name, value, calctype="1"):
+    """Produces the SAPHSOLVE JSON definition of an event without the closing brace.
+
+    Args:
+        printer: The output stream.
+        event_id: The integer id of the event.
+        name: The name of the event.
+        value: The probability of the event.
+        calctype: The calculation type of the event.
+    """
+    printer('{')
+    printer('"id": "', event_id, '",')
+    printer('"corrgate": 0,')
+    printer('"name": "', name, '",')
+    printer('"evworkspacepair": {')
+    printer('"ph": 1,')
+    printer('"mt": 1')
+    printer('},')
+    printer('"value": ', value, ',')
+    printer('"initf": "",')
+    printer('"processf": "",')
+    printer('"calctype": "', calctype, '"')
+
+
+def get_SAPHIRE_event(event_id, name, value, calctype="1", initf=" "):
+    """Produces the SAPHSOLVE JSON object of an event.
+
+    Args:
+        event_id: The integer id of the event.
+        name: The name of the event.
+        value: The probability of the event.
+        calctype: The calculation type of the event.
+        initf: The initiating event flag.
+
+    Returns:
+        The dictionary of the event definition.
+    """
+    return {
+        "id": str(event_id),
+        "corrgate": 0,
+        "name": name,
+        "evworkspacepair": {
+            "ph": 1,
+            "mt": 1
+        },
+        "value": value,
+        "initf": initf,
+        "processf": " ",
+        "calctype": calctype
+    }
+
+
 class Event:
     """Representation of a base class for an event in a fault tree.
 
@@ -90,84 +169,37 @@ class BasicEvent(Event):
         printer('p(', self.name, ') = ', self.prob)
 
 
-    def to_SAPHIRE_json_printer(self, printer):
-
-        """Produces SaphSolver JSON definition of the basic event"""
-        printer('{')
-        printer('"id": "', self.name.strip('B'), '",')
-        printer('"corrgate": "0",')
-        printer('"name": "', self.name, '",')
-        printer('"evworkspacepair": {')
-        printer('"ph": 1,')
-        printer('"mt": 1')
-        printer('},')
-        printer('"value": ', self.prob, ',')
-        printer('"initf": "",')
-        printer('"processf": "",')
-        printer('"calctype": "1"')
-        if int(self.name.strip('B')) == self.num_basic:
-              printer('}')
-        else:
-              printer('},')
-
-
-    def to_SAPHIRE_json_object(self, base):
-
-        """Produces SaphSolver JSON definition of the basic event using json-python library"""
-
-        eventList = base['saphiresolveinput']['eventlist']
-        eventList[4]['id'] = int(self.name.strip('B'))
-        eventList[4]['corrgate'] = 0
-        eventList[4]['name'] = self.name
-        eventList[4]['evworkspacepair']['ph'] = 1
-        eventList[4]['evworkspacepair']['mt'] = 1
-        eventList[4]['value'] = self.prob
-        eventList[4]['initf'] = " "
-        eventList[4]['processf'] = " "
-        eventList[4]['calctype'] = "1"
-        dictCopy = eventList[4].copy()
-        eventList.append(dictCopy)
+    def to_SAPHIRE_json_printer(self, printer, event_id):
+        """Produces SaphSolver JSON definition of the basic event.
 
+        The closing brace is left to the caller
+        to put the separator between the events.
 
-    def to_OpenPRA_json_printer(self, printer):
-        """Produces OpenPRA JSON definition of the basic event."""
-        printer('"', self.name, '": {')
-        printer('"role": "public",')
-        printer('"label": {')
-        printer('"name": "Basic Event:', self.name, '",')
-        printer('"description": ""')
-        printer('},')
-        printer('"expression": {')
-        printer('"value": ', self.prob, ',')
-        printer('"_proxy": "Float"')
-        printer('},')
-        printer('"source_type": "hcl"')
-        if int(self.name.strip('B')) == self.num_basic:
-              printer('}')
-        else:
-              printer('},')
+        Args:
+            printer: The output stream.
+            event_id: The integer id of the basic event.
+        """
+        print_SAPHIRE_event(printer, event_id, self.name, self.prob)
 
 
-    def to_SAPHIRE_json_object(self, base):
+    def to_SAPHIRE_json_object(self, event_id):
+        """Produces the SAPHSOLVE JSON object of the basic event.
 
-        """Produces SaphSolver JSON definition of the basic event using json-python library"""
+        Args:
+            event_id: The integer id of the basic event.
 
-        eventList = base['saphiresolveinput']['eventlist']
-        eventList[4]['id'] = int(self.name.strip('B'))
-        eventList[4]['corrgate'] = 0
-        eventList[4]['name'] = self.name
-        eventList[4]['evworkspacepair']['ph'] = 1
-        eventList[4]['evworkspacepair']['mt'] = 1
-        eventList[4]['value'] = self.prob
-        eventList[4]['initf'] = " "
-        eventList[4]['processf'] = " "
-        eventList[4]['calctype'] = "1"
-        dictCopy = eventList[4].copy()
-        eventList.append(dictCopy)
+        Returns:
+            The dictionary of the event definition.
+        """
+        return get_SAPHIRE_event(event_id, self.name, self.prob)
 
 
     def to_OpenPRA_json_printer(self, printer):
-        """Produces OpenPRA JSON definition of the basic event."""
+        """Produces OpenPRA JSON definition of the basic event.
+
+        The closing brace is left to the caller
+        to put the separator between the events.
+        """
         printer('"', self.name, '": {')
         printer('"role": "public",')
         printer('"label": {')
@@ -179,10 +211,6 @@ class BasicEvent(Event):
         printer('"_proxy": "Float"')
         printer('},')
         printer('"source_type": "hcl"')
-        if int(self.name.strip('B')) == self.num_basic:
-              printer('}')
-        else:
-              printer('},')
 
 
 class HouseEvent(Event):
@@ -346,250 +374,73 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
         printer(convert_formula(self, nest))
         printer('</define-gate>')
 
-    def to_SAPHIRE_JSON_printer(self, printer, last=True):
-        """Produces the JSON definition of the gate.
+    def to_SAPHIRE_JSON_printer(self, printer, ids):
+        """Produces the SAPHSOLVE JSON definition of the gate.
+
+        The K/N gates get the "K/N" gate type.
+        The closing brace is left to the caller
+        to put the separator between the gates.
 
         Args:
             printer: The output stream.
-            nest: Nesting of NOT connectives in formulas.
+            ids: The integer ids of the gates and basic events.
         """
-
-        def arg_to_JSON(type_str, arg):
-            """Produces JSON string representation of an argument."""
-            return "%s\":%s,\n" % (type_str, arg.name)
-        def args_to_JSON(type_str,args):
-            """Produces JSON string representation of arguments."""
-            return "".join(arg_to_JSON(type_str, arg) for arg in args)
-
-        def gate_name_to_number(arg):
-            return "%s,\n" % (arg.name.strip('G'))
-        def gate_name_to_number_last(arg):
-            return "%s\n" % (arg.name.strip('G'))
-
-        def basic_name_to_number(arg):
-            return "%s,\n" % (arg.name.strip('B'))
-        def basic_name_to_number_last(arg):
-            return "%s\n" % (arg.name.strip('B'))
-
-
-        def convert_formula(gate, last=False):
-            """Converts the formula of a gate into SAPHIRE JSON representation."""
-            JSON_format = ""
-            if gate.operator != "null":
-                JSON_format += "\"gatetype\":\"" + gate.operator
-                if gate.operator == "atleast":
-                    JSON_format += " min=\"" + str(gate.k_num) + "\""
-                JSON_format += "\",\n"
-            num_g = int(str(len(gate.g_arguments)))
-            num_b = int(str(len(gate.b_arguments)))
-            total_num = num_g + num_b
-
-            JSON_format += '"numinputs":"' + str(total_num) + "\",\n"
-            if gate.g_arguments:
-                JSON_format += "\"gateinput\": [\n"
-                for i in gate.g_arguments:
-                    num = list(gate.g_arguments)
-                    if i == num[-1]:
-                        JSON_format += gate_name_to_number_last(i)
-                    else:
-                        JSON_format += gate_name_to_number( i)
-                if gate.b_arguments:
-                    JSON_format += "],\n"
-                else:
-                    JSON_format += "]"
-
-            if gate.b_arguments:
-                JSON_format += "\"eventinput\": [\n"
-                for i in gate.b_arguments:
-                    num = list(gate.b_arguments)
-                    if i == num[-1]:
-                        JSON_format += basic_name_to_number_last(i)
-                    else:
-                        JSON_format += basic_name_to_number( i)
-                JSON_format += "]"
-            return JSON_format
-
-
+        num_inputs = len(self.g_arguments) + len(self.b_arguments)
+        gate_type = self.operator
+        if gate_type == "atleast":
+            gate_type = str(self.k_num) + "/" + str(num_inputs)
         printer('{')
-        printer('\"gateid\":', self.name.strip('Groot'), ",")
-        printer(convert_formula(self, last))
+        printer('"gateid": ', ids[self], ',')
+        printer('"gatetype": "', gate_type, '",')
+        printer('"numinputs": ', num_inputs, ',')
+        printer('"gateinput": [',
+                ', '.join([str(ids[x]) for x in self.g_arguments]), '],')
+        printer('"eventinput": [',
+                ', '.join([str(ids[x]) for x in self.b_arguments]), ']')
 
-
-    def to_SAPHIRE_JSON_object(self, base, last=True):
-        """Produces the SAPHSOLVE JSON object definition of the gate.
+    def to_SAPHIRE_JSON_object(self, ids):
+        """Produces the SAPHSOLVE JSON object of the gate.
 
         Args:
-            printer: The output stream.
-            nest: Nesting of NOT connectives in formulas.
-        """
-
-        def arg_to_JSON(type_str, arg):
-            """Produces JSON string representation of an argument."""
-            return "%s\":%s,\n" % (type_str, arg.name)
-        def args_to_JSON(type_str,args):
-            """Produces JSON string representation of arguments."""
-            return "".join(arg_to_JSON(type_str, arg) for arg in args)
-
-        def gate_name_to_number(arg):
-            return arg.name.strip('\"G')
-        def basic_name_to_number(arg):
-            return arg.name.strip('\"B')
-
-
-        def convert_formula(gate,arg, last=False):
-            """Converts the formula of a gate into SAPHIRE JSON representation."""
-            gateList = base['saphiresolveinput']['faulttreelist'][0]['gatelist']
-
+            ids: The integer ids of the gates and basic events.
 
-            num_g = len(gate.g_arguments)
-            num_b = len(gate.b_arguments)
-            total_num = num_g + num_b
-            # print(total_num)
-            # JSON_format = ""
-            if gate.operator != "null":
-                gateList[1]['gatetype'] = gate.operator
-                if gate.operator == "atleast":
-                    fraction_value = f"{gate.k_num}/{total_num}"
-                    gateList[1]['gatetype'] = fraction_value
-
-            gateList[1]['numinputs'] = total_num
-            gate_list = list()
-            if gate.g_arguments:
-
-                for i in gate.g_arguments:
-                    gate_list.append(int(gate_name_to_number(i)))
-                    gateList[1]['gateinput'] = gate_list
-
-            else:
-                    gateList[1]['gateinput'] = 0
-                    del gateList[1]['gateinput']
-
-            event_list = list()
-            if gate.b_arguments:
-
-                for i in gate.b_arguments:
-                    event_list.append(int(basic_name_to_number(i)))
-                    gateList[1]['eventinput']= event_list
-
-            else:
-                gateList[1]['eventinput'] = 0
-                del gateList[1]['eventinput']
-            return gateList
-
-
-        gateList = base['saphiresolveinput']['faulttreelist'][0]['gatelist']
-
-        gateList[1]['gateid'] = int(self.name.strip('Groot'))
-        convert_formula(self, last)
-
-        dictCopy = gateList[1].copy()
-        gateList.append(dictCopy)
-
-
-    def to_OpenPRA_JSON_printer(self, printer, last=True):
+        Returns:
+            The dictionary of the gate definition.
+        """
+        num_inputs = len(self.g_arguments) + len(self.b_arguments)
+        gate_type = self.operator
+        if gate_type == "atleast":
+            gate_type = str(self.k_num) + "/" + str(num_inputs)
+        return {
+            "gateid": ids[self],
+            "gatetype": gate_type,
+            "numinputs": num_inputs,
+            "gateinput": [ids[x] for x in self.g_arguments],
+            "eventinput": [ids[x] for x in self.b_arguments]
+        }
+
+    def to_OpenPRA_JSON_printer(self, printer):
         """Produces the OpenPRA JSON definition of the gate.
 
+        The closing braces are left to the caller
+        to put the separator between the gates.
+
         Args:
             printer: The output stream.
-            nest: Nesting of NOT connectives in formulas.
         """
-
-        def arg_to_JSON(type_str, arg):
-            """Produces JSON string representation of an argument."""
-            return "%s\":%s,\n" % (type_str, arg.name)
-        def args_to_JSON(type_str,args):
-            """Produces JSON string representation of arguments."""
-            return "".join(arg_to_JSON(type_str, arg) for arg in args)
-
-        def gate_name_to_number(arg):
-            return "%s" % (arg.name)
-        def gate_name_to_number_last(arg):
-            return "%s" % (arg.name)
-
-        def basic_name_to_number(arg):
-            return "%s" % (arg.name)
-        def basic_name_to_number_last(arg):
-            return "%s" % (arg.name)
-
-
-        def convert_formula(gate, last=False):
-            """Converts the formula of a gate into SAPHIRE JSON representation."""
-            # capital_gate = upper(gate.opertaor)
-            OpenPRA_JSON_format = ""
-            if gate.operator != "null":
-                OpenPRA_JSON_format += "\"name\":\"" + str.upper(gate.operator) + " Gate:" + self.name.strip('root') + "\",\n" + '"description":""\n },'
-                if gate.operator == "k/n":
-                    OpenPRA_JSON_format += " min=\"" + str(gate.k_num) + "\""
-                OpenPRA_JSON_format += "\n"
-            num_g = int(str(len(gate.g_arguments)))
-            num_b = int(str(len(gate.b_arguments)))
-            num_g + num_b
-
-            OpenPRA_JSON_format += '"formula": {\n'
-            OpenPRA_JSON_format += '"formulas": [\n'
-            # OpenPRA_JSON_format += '{\n'
-
-            if gate.g_arguments:
-                # OpenPRA_JSON_format += "\"gateinput\": [\n"
-                for i in gate.g_arguments:
-                    num = list(gate.g_arguments)
-                    if i == num[-1]:
-                        OpenPRA_JSON_format += "{\n"
-                        OpenPRA_JSON_format += "\"name\":" + "\"" + gate_name_to_number_last(i) + "\",\n"
-                        OpenPRA_JSON_format += '"reference_type": "gates",\n'
-                        OpenPRA_JSON_format += '"tree_id": null,\n'
-                        OpenPRA_JSON_format += '"path": "",\n'
-                        OpenPRA_JSON_format += '"_proxy": "EventReference"\n'
-                        if gate.b_arguments:
-                            OpenPRA_JSON_format += "},\n"
-                        else:
-                            OpenPRA_JSON_format += "}\n"
-                    else:
-                        OpenPRA_JSON_format += "{\n"
-                        OpenPRA_JSON_format += "\"name\":" + "\"" + gate_name_to_number(i) + "\",\n"
-                        OpenPRA_JSON_format += '"reference_type": "gates",\n'
-                        OpenPRA_JSON_format += '"tree_id": null,\n'
-                        OpenPRA_JSON_format += '"path": "",\n'
-                        OpenPRA_JSON_format += '"_proxy": "EventReference"\n'
-                        OpenPRA_JSON_format += "},\n"
-                if not gate.b_arguments:
-                    OpenPRA_JSON_format += "],"
-                # else:
-                #     OpenPRA_JSON_format += "],"
-
-            if gate.b_arguments:
-                # OpenPRA_JSON_format += "\"eventinput\": [\n"
-                for i in gate.b_arguments:
-                    num = list(gate.b_arguments)
-                    if i == num[-1]:
-                        OpenPRA_JSON_format += "{\n"
-                        OpenPRA_JSON_format += "\"name\":" + "\"" + basic_name_to_number_last(i) + "\",\n"
-                        OpenPRA_JSON_format += '"reference_type": "basic_events",\n'
-                        OpenPRA_JSON_format += '"tree_id": null,\n'
-                        OpenPRA_JSON_format += '"path": "",\n'
-                        OpenPRA_JSON_format += '"_proxy": "EventReference"\n'
-                        OpenPRA_JSON_format += "}\n"
-                    else:
-                        OpenPRA_JSON_format += "{\n"
-                        OpenPRA_JSON_format += "\"name\":" + "\"" + basic_name_to_number(i) + "\",\n"
-                        OpenPRA_JSON_format += '"reference_type": "basic_events",\n'
-                        OpenPRA_JSON_format += '"tree_id": null,\n'
-                        OpenPRA_JSON_format += '"path": "",\n'
-                        OpenPRA_JSON_format += '"_proxy": "EventReference"\n'
-                        OpenPRA_JSON_format += "},\n"
-                OpenPRA_JSON_format += "],"
-
-            OpenPRA_JSON_format += "\n\"expr\"" + ':"' + gate.operator + '",\n'
-            OpenPRA_JSON_format += '"_proxy": "LogicalExpression"\n'
-            # OpenPRA_JSON_format += "}," # to close every gate
-
-            return OpenPRA_JSON_format
-        printer('"',self.name.strip('root'),'":', "{")
+        refs = [
+            _OPENPRA_GATE_REF % x.name for x in self.g_arguments
+        ] + [_OPENPRA_BASIC_REF % x.name for x in self.b_arguments]
+        label = ""
+        if self.operator != "null":
+            label = ('"name":"' + self.operator.upper() + " Gate:" +
+                     self.name.strip('root') + '",\n"description":""\n },\n')
+        printer('"', self.name.strip('root'), '":', "{")
         printer('"role": "public",')
         printer('"label": {')
-        printer(convert_formula(self, last))
-
-
+        printer(label, '"formula": {\n"formulas": [\n', ',\n'.join(refs),
+                '\n],\n"expr":"', self.operator,
+                '",\n"_proxy": "LogicalExpression"\n')
 
     def to_aralia(self, printer):
         """Produces the Aralia definition of the gate.
@@ -686,23 +537,27 @@ class CcfGroup:  # pylint: disable=too-few-public-methods
 
         printer('</define-CCF-group>')
 
-    def to_SAPHIRE_json_object(self, base):
+    def to_SAPHIRE_json_object(self, ids):
+        """Produces the SAPHSOLVE JSON objects of the CCF group members.
 
-        """Produces SaphSolver JSON definition of common cause failures (alpha-factor model) using json-python library"""
-        for member in self.members:
-            if self.model == "alpha-factor":
-                eventList = base['saphiresolveinput']['eventlist']
-                eventList[4]['id'] = int(member.name.strip('B'))
-                eventList[4]['corrgate'] = 0
-                eventList[4]['name'] = member.name + "_cc"
-                eventList[4]['evworkspacepair']['ph'] = 1
-                eventList[4]['evworkspacepair']['mt'] = 1
-                eventList[4]['value'] = self.prob
-                eventList[4]['initf'] = " "
-                eventList[4]['processf'] = " "
-                eventList[4]['calctype'] = "1"
-                dictCopy = eventList[4].copy()
-                eventList.append(dictCopy)
+        Only the alpha-factor model is supported.
+
+        Args:
+            ids: The integer ids of the gates and basic events.
+
+        Returns:
+            The list of the member event definitions.
+        """
+        if self.model != "alpha-factor":
+            return []
+        return [
+            get_SAPHIRE_event(ids[x], x.name + "_cc", self.prob)
+            for x in self.members
+        ]
+
+    def get_SAPHIRE_json_id(self):
+        """Provides the integer id of the CCF event (e.g., 12001 for CCF12)."""
+        return get_json_id(self) * 1000 + 1
 
     def to_SAPHIRE_json_ccf_BE(self):
      # """this function calculate the ccf basic event probability value for SAPHIRE json """
@@ -727,25 +582,16 @@ class CcfGroup:  # pylint: disable=too-few-public-methods
         return returned_ccf_values
 
 
-    def to_SAPHIRE_json_ccf(self,base):
+    def to_SAPHIRE_json_ccf(self):
+        """Produces the SAPHSOLVE JSON object of the CCF event.
+
+        Returns:
+            The dictionary of the event definition.
+        """
         if not hasattr(self, "values"):
             self.values = CcfGroup.to_SAPHIRE_json_ccf_BE(self)
-        # counter = 0
-        eventList = base['saphiresolveinput']['eventlist']
-        eventList[4]['id'] = int(self.name.strip("CCF") + "001")
-        eventList[4]['corrgate'] = 0
-        eventList[4]['name'] = self.name
-        eventList[4]['evworkspacepair']['ph'] = 1
-        eventList[4]['evworkspacepair']['mt'] = 1
-        eventList[4]['value'] = self.values.pop(0)
-        eventList[4]['initf'] = " "
-        eventList[4]['processf'] = " "
-        eventList[4]['calctype'] = "R"
-        dictCopy = eventList[4].copy()
-        eventList.append(dictCopy)
-        # counter +=1
-
-        # print("counter", counter)
+        return get_SAPHIRE_event(self.get_SAPHIRE_json_id(), self.name,
+                                 self.values.pop(0), calctype="R")
 
 
 class FaultTree:  # pylint: disable=too-many-instance-attributes
@@ -873,80 +719,44 @@ class FaultTree:  # pylint: disable=too-many-instance-attributes
         The fault tree is produced breadth-first.
         The output SAPHIRE JSON representation is not formatted for human readability.
         The fault tree must be valid and well-formed.
+        The gate list continues the header of write_info_JSON_printer.
 
         Args:
             printer: The output stream.
             nest: A nesting factor for the Boolean formulae.
         """
-
+        del nest  # the SAPHSOLVE formulas are not nested
         sorted_gates = toposort_gates(self.top_gates or [self.top_gate],
                                       self.gates)
+        ids = {x: get_json_id(x) for x in self.gates}
+        ids.update((x, get_json_id(x)) for x in self.basic_events)
+        separator = None
         for gate in sorted_gates:
-            gate.to_SAPHIRE_JSON_printer(printer, nest)
-            if gate == sorted_gates[-1]:
-                printer("}")
-            else:
-                printer("},")
+            if separator:
+                printer(separator)
+            gate.to_SAPHIRE_JSON_printer(printer, ids)
+            separator = "},"
+        printer("}")
 
         printer(']')
         printer('}')
         printer('],')
+        printer('"sequencelist": [],')
         printer('"eventlist": [')
-        printer('{')
-        printer('"id":', '"99999"', ',')
-        printer('"corrgate": "0",')
-        printer('"name": "', '<TRUE>', '",')
-        printer('"evworkspacepair": {')
-        printer('"ph": 1,')
-        printer('"mt": 1')
-        printer('},')
-        printer('"value": ', 1.00000E+00, ',')
-        printer('"initf": "",')
-        printer('"processf": "",')
-        printer('"calctype": "1"')
-        printer('},')
-        printer('{')
-        printer('"id":', '"99998"', ',')
-        printer('"corrgate": "0",')
-        printer('"name": "', '<FALSE>', '",')
-        printer('"evworkspacepair": {')
-        printer('"ph": 1,')
-        printer('"mt": 1')
-        printer('},')
-        printer('"value": ', 0.00000E+00, ',')
-        printer('"initf": "",')
-        printer('"processf": "",')
-        printer('"calctype": "1"')
-        printer('},')
-        printer('{')
-        printer('"id":', '"99997"', ',')
-        printer('"corrgate": "0",')
-        printer('"name": "', '<PASS>', '",')
-        printer('"evworkspacepair": {')
-        printer('"ph": 1,')
-        printer('"mt": 1')
-        printer('},')
-        printer('"value": ', 1.00000E+00, ',')
-        printer('"initf": "",')
-        printer('"processf": "",')
-        printer('"calctype": "1"')
-        printer('},')
-        printer('{')
-        printer('"id":', '"99996"', ',')
-        printer('"corrgate": "0",')
-        printer('"name": "', "AUTOGENERATED", '",')
-        printer('"evworkspacepair": {')
-        printer('"ph": 1,')
-        printer('"mt": 1')
-        printer('},')
-        printer('"value": ', 1.00000E+00, ',')
-        printer('"initf": "",')
-        printer('"processf": "",')
-        printer('"calctype": "1"')
-        printer('},')
+        for event_id, name, value in ((99999, "<TRUE>", 1.0),
+                                      (99998, "<FALSE>", 0.0),
+                                      (99997, "<PASS>", 1.0),
+                                      (99996, "AUTOGENERATED", 1.0)):
+            print_SAPHIRE_event(printer, event_id, name, value)
+            printer('},')
+        separator = None
         for basic_event in (self.non_ccf_events
         if self.ccf_groups else self.basic_events):
-            basic_event.to_SAPHIRE_json_printer(printer)
+            if separator:
+                printer(separator)
+            basic_event.to_SAPHIRE_json_printer(printer, ids[basic_event])
+            separator = "},"
+        printer('}')
         printer(']')
         printer('}')
         printer('}')
@@ -962,26 +772,31 @@ class FaultTree:  # pylint: disable=too-many-instance-attributes
             printer: The output stream.
             nest: A nesting factor for the Boolean formulae.
         """
+        del nest  # the OpenPRA formulas are not nested
         printer('"basic_events": {')
+        separator = None
         for basic_event in (self.non_ccf_events
                             if self.ccf_groups else self.basic_events):
+            if separator:
+                printer(separator)
             basic_event.to_OpenPRA_json_printer(printer)
+            separator = "},"
+        printer('}')
         printer('},')
         printer('"house_events": {},')
         printer('"gates": {')
 
         sorted_gates = toposort_gates(self.top_gates or [self.top_gate],
                                       self.gates)
+        separator = None
         for gate in sorted_gates:
-            gate.to_OpenPRA_JSON_printer(printer, nest)
-            if gate == sorted_gates[-1]:
-                printer("}")
-                printer("}")
-                printer("},")
-            else:
-                printer("}")
-                printer("},")
-        # printer('}')
+            if separator:
+                printer(separator)
+            gate.to_OpenPRA_JSON_printer(printer)
+            separator = "}\n},"
+        printer("}")
+        printer("}")
+        printer("},")
         printer('"components": {},')
         printer('"top_node": {')
         printer('"name": "80000",')
@@ -999,157 +814,46 @@ class FaultTree:  # pylint: disable=too-many-instance-attributes
         printer('}')
 
     def to_SAPHIRE_json_object(self, base, nest=False):
-        """Produces SAPHIRE JSON definition of the fault tree using the JSON python library.
+        """Produces the SAPHSOLVE JSON object definition of the fault tree.
 
-        The fault tree is produced breadth-first.
-        The output SAPHIRE JSON representation is not formatted for human readability.
+        The gates and events are added to the document in one pass.
+        The CCF events are added to the gates of the CCF group members
+        (once per gate) through the parents of the members.
         The fault tree must be valid and well-formed.
 
         Args:
+            base: The document with the header
+                (see write_info_SAPHSOLVE_JSON_object).
             nest: A nesting factor for the Boolean formulae.
         """
-
-        with open("output.json", "r") as f:
-             base = json.load(f)
-
+        del nest  # the SAPHSOLVE formulas are not nested
         sorted_gates = toposort_gates(self.top_gates or [self.top_gate],
                                       self.gates)
-        for gate in sorted_gates:
-            gateList = base['saphiresolveinput']['faulttreelist'][0]['gatelist']
-
-            gate.to_SAPHIRE_JSON_object(base, nest)
-
-
-        # for basic_event in (self.non_ccf_events
-        #                     if self.ccf_groups else self.basic_events):
-        #     basic_event.to_SAPHIRE_json_object(base)
-
-        for basic_event in (self.non_ccf_events
-                            if self.ccf_groups else self.basic_events):
-            basic_event.to_SAPHIRE_json_object(base)
-
-        for ccf_group in self.ccf_groups:
-            ccf_group.to_SAPHIRE_json_object(base)
-            ccf_group.to_SAPHIRE_json_ccf(base)
-        #     # print("CCF",self.name)
-
-        eventList = base['saphiresolveinput']['eventlist']
-        with open("SAPHSOLVE_INPUT.JSInp", "w") as f:
-            del gateList[1]
-            del gateList[0]
-            del eventList[4]
-            json.dump(base, f, indent=4)
-
-        with open("SAPHSOLVE_INPUT.JSInp", 'r') as f:
-                base = json.load(f)
-        def check_and_add_number(obj, num, add_num):
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    if key == 'eventinput' and num in value:
-                        value.append(add_num)
-                        obj['numinputs'] += 1
-                    else:
-                        check_and_add_number(value, num, add_num)
-            elif isinstance(obj, list):
-                for item in obj:
-                    check_and_add_number(item, num, add_num)
-
-
-        # instance = CcfGroup()
-        # ccf_instance = ccf_instance.to_SAPHIRE_json_ccf(base)
-        member_list =[]
-        counter = []
-        i = 1
+        ids = {x: get_json_id(x) for x in self.gates}
+        ids.update((x, get_json_id(x)) for x in self.basic_events)
+        gate_objects = {x: x.to_SAPHIRE_JSON_object(ids) for x in sorted_gates}
+        base['saphiresolveinput']['faulttreelist'][0]['gatelist'].extend(
+            gate_objects.values())
+
+        event_list = base['saphiresolveinput']['eventlist']
+        event_list.extend((
+            get_SAPHIRE_event(99999, "<TRUE>", 1.0),
+            get_SAPHIRE_event(99998, "<FALSE>", 0.0),
+            get_SAPHIRE_event(99997, "<PASS>", 1.0),
+            get_SAPHIRE_event(99996, "AUTOGENERATED", 1.0, calctype="N",
+                              initf="I")))
+        event_list.extend(
+            x.to_SAPHIRE_json_object(ids[x])
+            for x in (self.non_ccf_events if self.ccf_groups else
+                      self.basic_events))
         for ccf_group in self.ccf_groups:
-
-            # ccf_group.to_SAPHIRE_json_object(base)
-            # ccf_group.to_SAPHIRE_json_ccf(base)
-
-            # first_group = self.ccf_groups[0]
-            for member in ccf_group.members:
-            # for member in first_group.members:
-            #     print(member.name)
-                check_and_add_number(base, int(member.name.strip("B")), int(ccf_group.name.strip("\"CCF") + "001"))
-            # first_group = self.ccf_groups[]
-            # for member in ccf_group.members[0]:
-            #     print(member.name)
-            # for ccf_g in ccf_group:
-            #     print (ccf_g, member.name)
-            # counter.append(i)
-            # # i +=1
-            # for i in ccf_group.name:
-            #     print(i)
-        # print("members", ccf_group.members.name)
-        # print("counter", counter)
-                # member_list=[member.name]
-                # print(f"Index {member}: {ccf_g.name}")
-                # print(member_list)
-        # for i in counter:
-        #     # check_and_add_number(base, member_list, int(ccf_group.name.strip("\"CCF") + "00000"))
-        #     check_and_add_number(base, member_list, i + int("00000"))
-
-        with open("SAPHSOLVE_INPUT.JSInp", 'w') as f:
-            json.dump(base, f, indent = 4)
-
-        with open("SAPHSOLVE_INPUT.JSInp", 'r') as f:
-            contents = f.read()
-            print(contents)
-
-
-
-    def to_OpenPRA_json_printer(self, printer, nest=False):
-        """Produces SAPHIRE JSON definition of the fault tree.
-
-        The fault tree is produced breadth-first.
-        The output SAPHIRE JSON representation is not formatted for human readability.
-        The fault tree must be valid and well-formed.
-
-        Args:
-            printer: The output stream.
-            nest: A nesting factor for the Boolean formulae.
-        """
-        printer('"basic_events": {')
-        for basic_event in (self.non_ccf_events
-                            if self.ccf_groups else self.basic_events):
-            basic_event.to_OpenPRA_json_printer(printer)
-        printer('},')
-        printer('"house_events": {},')
-        printer('"gates": {')
-
-        sorted_gates = toposort_gates(self.top_gates or [self.top_gate],
-                                      self.gates)
-        for gate in sorted_gates:
-            gate.to_OpenPRA_JSON_printer(printer, nest)
-            if gate == sorted_gates[-1]:
-                printer("}")
-                printer("}")
-                printer("},")
-            else:
-                printer("}")
-                printer("},")
-        # printer('}')
-        printer('"components": {},')
-        printer('"top_node": {')
-        printer('"name": "80000",')
-        printer('"reference_type": "gates",')
-        printer('"tree_id": null,')
-        printer('"path": "",')
-        printer('"_proxy": "EventReference"')
-        printer('},')
-        printer('"name": "test2",')
-        printer('"model_tree_id": null,')
-        printer('"label": {')
-        printer('"name": "test2",')
-        printer('"description": ""')
-        printer('}')
-        printer('}')
-
-
-
-
-
-
-
+            event_list.extend(ccf_group.to_SAPHIRE_json_object(ids))
+            event_list.append(ccf_group.to_SAPHIRE_json_ccf())
+            ccf_id = ccf_group.get_SAPHIRE_json_id()
+            for gate in set().union(*(x.parents for x in ccf_group.members)):
+                gate_object = gate_objects[gate]
+                gate_object['eventinput'].append(ccf_id)
+                gate_object['numinputs'] += 1
 
 
 def toposort_gates(root_gates, gates):
@@ -13,7 +13,8 @@ from itertools import combinations
 from math import factorial
 from math import comb
 
-from fault_tree import BasicEvent, HouseEvent, Gate, CcfGroup, FaultTree
+from bulk_writer import BulkWriter
+from fault_tree import BasicEvent, HouseEvent, Gate, CcfGroup, FaultTree, get_json_id
 
 class FactorError(Exception):
     """Errors in configuring factors for the fault tree generation."""
@@ -911,11 +912,11 @@ def write_info_JSON_printer(fault_tree, printer, seed):
     printer('{')
     printer('"name":','\"',fault_tree.name,'\",')
     printer('"id": 139,')
-    printer('"gateid":', fault_tree.top_gate.name.strip('root'),",")
-    printer('"gateorig":', fault_tree.top_gate.name.strip('root'),",")
+    printer('"gateid":', get_json_id(fault_tree.top_gate),",")
+    printer('"gateorig":', get_json_id(fault_tree.top_gate),",")
     printer('"gatepos": 0,')
     printer('"eventid": 99996,')
-    printer('"gatecomp":', fault_tree.top_gate.name.strip('root'),",")
+    printer('"gatecomp":', get_json_id(fault_tree.top_gate),",")
     printer('"comppos": 0,')
     printer('"compflag": " ",')
     printer('"gateflag": " ",')
@@ -928,70 +929,99 @@ def write_info_JSON_printer(fault_tree, printer, seed):
     printer('{')
     printer('"ftheader": {')
     printer('"ftid": 139,')
-    printer('"gtid":', fault_tree.top_gate.name.strip('root'),',')
+    printer('"gtid":', get_json_id(fault_tree.top_gate),',')
     printer('"evid": 99996,')
     printer('"defflag": 0,')
     printer('"numgates":',len(fault_tree.gates), "")
     printer('},')
     printer('"gatelist": [')
 
-def write_info_SAPHSOLVE_JSON_object(fault_tree, base, seed):
-    # with open("base-json.json", "r") as f:
-    #     base = json.load(f)
-    with open("base-json.json", "r") as f:
-        base = json.load(f)
+def write_info_SAPHSOLVE_JSON_object(fault_tree, seed):
+    """Produces the SAPHSOLVE JSON document with the setup of the fault tree.
+
+    The gate and event lists are left empty
+    for FaultTree.to_SAPHIRE_json_object.
+
+    Args:
+        fault_tree: A full, valid, well-formed fault tree.
+        seed: The seed of the pseudo-random number generator.
+
+    Returns:
+        The JSON-serializable document.
+    """
+    del seed  # not recorded in the SAPHSOLVE input
     factors = fault_tree.factors
-        # @BasicEvent(event)
-    test = False
-    base['saphiresolveinput']['header'][
-        'projectpath'] = '"projectpath": "Edatadrive82NCState-NEUPModelsGenericPWR Model-debug",'
-    base['saphiresolveinput']['header']['eventtree']['name'] = '"",'
-    base['saphiresolveinput']['header']['eventtree']['number'] = 0
-    base['saphiresolveinput']['header']['eventtree']['initevent'] = 0
-    base['saphiresolveinput']['header']['eventtree']['seqphase'] = 1
-    base['saphiresolveinput']['header']['flagnum'] = 0
-    base['saphiresolveinput']['header']['ftcount'] = 1
-    base['saphiresolveinput']['header']['fthigh'] = 139
-    base['saphiresolveinput']['header']['sqcount'] = 0
-    base['saphiresolveinput']['header']['sqhigh'] = 0
-    base['saphiresolveinput']['header']['becount'] = 4 + factors.num_basic + factors.num_ccf
-    base['saphiresolveinput']['header']['behigh'] = 99996
-    base['saphiresolveinput']['header']['mthigh'] = 1
-    base['saphiresolveinput']['header']['phhigh'] = 1
-    base['saphiresolveinput']['header']['truncparam']['ettruncopt'] = 'NormalProbCutOff'
-    base['saphiresolveinput']['header']['truncparam']['fttruncopt'] = 'GlobalProbCutOff'
-    base['saphiresolveinput']['header']['truncparam']['sizeopt'] = 'ENoTrunc'
-    base['saphiresolveinput']['header']['truncparam']['ettruncval'] = 1.000E-14
-    base['saphiresolveinput']['header']['truncparam']['fttruncval'] = 1.000E-14
-    base['saphiresolveinput']['header']['truncparam']['sizeval'] = 99
-    base['saphiresolveinput']['header']['truncparam']['transrepl'] = test
-    base['saphiresolveinput']['header']['truncparam']['transzones'] = test
-    base['saphiresolveinput']['header']['truncparam']['translevel'] = 0
-    base['saphiresolveinput']['header']['truncparam']['usedual'] = test
-    base['saphiresolveinput']['header']['truncparam']['dualcutoff'] = 0.000E+00
-    base['saphiresolveinput']['header']['workspacepair']['ph'] = 1
-    base['saphiresolveinput']['header']['workspacepair']['mt'] = 1
-    base['saphiresolveinput']['header']['iworkspacepair']['ph'] = 1
-    base['saphiresolveinput']['header']['iworkspacepair']['mt'] = 1
-    """sysgatelist"""
-    base['saphiresolveinput']['sysgatelist'][0]['name'] = fault_tree.name
-    base['saphiresolveinput']['sysgatelist'][0]['id'] = 139
-    base['saphiresolveinput']['sysgatelist'][0]['gateid'] = int(fault_tree.top_gate.name.strip('"root'))
-    base['saphiresolveinput']['sysgatelist'][0]['gateorig'] = int(fault_tree.top_gate.name.strip('root'))
-    base['saphiresolveinput']['sysgatelist'][0]['gatepos'] = 0
-    base['saphiresolveinput']['sysgatelist'][0]['eventid'] = 99996
-    base['saphiresolveinput']['sysgatelist'][0]['gatecomp'] = int(fault_tree.top_gate.name.strip('root'))
-    base['saphiresolveinput']['sysgatelist'][0]['comppos'] = 0
-    base['saphiresolveinput']['sysgatelist'][0]['bddsuccess'] = test
-    base['saphiresolveinput']['sysgatelist'][0]['done'] = test
-    """faulttreelist"""
-    base['saphiresolveinput']['faulttreelist'][0]['ftheader']['ftid'] = 139
-    base['saphiresolveinput']['faulttreelist'][0]['ftheader']['gtid'] = int(fault_tree.top_gate.name.strip('root'))
-    base['saphiresolveinput']['faulttreelist'][0]['ftheader']['evid'] = 99996
-    base['saphiresolveinput']['faulttreelist'][0]['ftheader']['defflag'] = 0
-    base['saphiresolveinput']['faulttreelist'][0]['ftheader']['numgates'] = len(fault_tree.gates)
-    with open("output.json", "w") as f:
-         json.dump(base, f, indent=4)
+    top_gate_id = get_json_id(fault_tree.top_gate)
+    workspace = {"ph": 1, "mt": 1}
+    header = {
+        "projectpath": "Edatadrive82NCState-NEUPModelsGenericPWR Model-debug",
+        "eventtree": {
+            "name": "",
+            "number": 0,
+            "initevent": 0,
+            "seqphase": 1
+        },
+        "flagnum": 0,
+        "ftcount": 1,
+        "fthigh": 139,
+        "sqcount": 0,
+        "sqhigh": 0,
+        "becount": 4 + factors.num_basic + factors.num_ccf,
+        "behigh": 99996,
+        "mthigh": 1,
+        "phhigh": 1,
+        "truncparam": {
+            "ettruncopt": "NormalProbCutOff",
+            "fttruncopt": "GlobalProbCutOff",
+            "sizeopt": "ENoTrunc",
+            "ettruncval": 1.000E-14,
+            "fttruncval": 1.000E-14,
+            "sizeval": 99,
+            "transrepl": False,
+            "transzones": False,
+            "translevel": 0,
+            "usedual": False,
+            "dualcutoff": 0.000E+00
+        },
+        "workspacepair": dict(workspace),
+        "iworkspacepair": dict(workspace)
+    }
+    sys_gate = {
+        "name": fault_tree.name,
+        "id": 139,
+        "gateid": top_gate_id,
+        "gateorig": top_gate_id,
+        "gatepos": 0,
+        "eventid": 99996,
+        "gatecomp": top_gate_id,
+        "comppos": 0,
+        "compflag": " ",
+        "gateflag": " ",
+        "gatet": " ",
+        "bddsuccess": False,
+        "done": False
+    }
+    fault_tree_header = {
+        "ftid": 139,
+        "gtid": top_gate_id,
+        "evid": 99996,
+        "defflag": 0,
+        "numgates": len(fault_tree.gates)
+    }
+    return {
+        "version": "1.0",
+        "saphiresolveinput": {
+            "header": header,
+            "sysgatelist": [sys_gate],
+            "faulttreelist": [{
+                "ftheader": fault_tree_header,
+                "gatelist": []
+            }],
+            "sequencelist": [],
+            "eventlist": []
+        }
+    }
+
 
 def write_info_OpenPRA_JSON_printer(fault_tree, printer, seed):
     """Writes the information about the setup for fault tree generation in OpenPRA Json format.
@@ -1286,12 +1316,14 @@ def fault_tree_generator(argv=None):
     printer, captured_object = get_printer(args.out)
     if args.event_tree_generator:
         fault_tree.to_fault_tree_logic(printer, args.nest)
+        printer.close()
         return captured_object.getvalue()
     elif args.aralia:
         fault_tree.to_aralia(printer)
     elif args.SAPHIRE_json_object:
-         write_info_SAPHSOLVE_JSON_object(fault_tree, printer, args.seed)
-         fault_tree.to_SAPHIRE_json_object(args.nest)
+        base = write_info_SAPHSOLVE_JSON_object(fault_tree, args.seed)
+        fault_tree.to_SAPHIRE_json_object(base, args.nest)
+        printer(json.dumps(base, indent=4))
     elif args.OpenPRA_json_printer:
         write_info_OpenPRA_JSON_printer(fault_tree, printer, args.seed)
         fault_tree.to_OpenPRA_json_printer(printer, args.nest)
@@ -1303,6 +1335,7 @@ def fault_tree_generator(argv=None):
         write_info(fault_tree, printer, args.seed)
         write_summary(fault_tree, printer)
         fault_tree.to_fault_tree_logic(printer, args.nest)
+    printer.close()
 
 # def get_printer(file_path=None):
 #     """Returns printer to stream output."""
@@ -1321,11 +1354,11 @@ def get_printer(file_path=None):
         # Use StringIO to capture output in a string
         destination = io.StringIO()
 
-    def _print(*args):
-        print(*args, file=destination, sep='')
+    # The printer buffers the output until it is closed.
+    printer = BulkWriter(destination, close=bool(file_path))
 
     # Return both the print function and the captured content
-    return _print, destination
+    return printer, destination
 
 
 # if __name__ == "__main__":
@@ -92,7 +92,7 @@ def generate_et(arguments):
     xml_dumper.fault_tree_name_list = fault_tree_name_list
     xml_dumper.fault_tree_logic_list = fault_tree_logic_list
     xml_dumper.model_data_list = [model_data_list[-1]]  # Temporary approach for model data
-    xml_dumper.dump_object_to_xml(event_tree_xml, open_psa_et_model_directory)
+    xml_dumper.stream_object_to_xml(event_tree_xml, open_psa_et_model_directory)
 
 
 def generate_fault_trees(arguments):
@@ -0,0 +1,7 @@
+"""Shared configuration of the tests."""
+
+
+def pytest_configure(config):
+    """Registers the custom markers."""
+    config.addinivalue_line(
+        "markers", "complexity: empirical time complexity tests (slow)")
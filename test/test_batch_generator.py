@@ -0,0 +1,66 @@
+"""Tests for the generation of fault tree corpora."""
+
+import os
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+import argparse as ap
+import pytest
+
+from generator.batch_generator import generate_many
+
+CONFIGS = [
+    {"num-basic": 200, "seed": 1},
+    {"num_basic": 300, "seed": 2, "weights-g": [1, 1, 1, 0.1, 0.1]},
+    {"num-basic": 250, "seed": 3, "compact": True, "num-house": 5},
+    {"num-basic": 250, "seed": 4, "stream": True, "num-ccf": 4},
+    {"num-basic": 150, "seed": 5, "num-args": 3, "common-g": "0.2",
+     "parents-b": 3},
+]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_many(workers):
+    """Tests that the corpus models match the single-model output."""
+    with TemporaryDirectory() as out_dir:
+        manifest = generate_many(iter(CONFIGS), workers, out_dir)
+        assert [x["index"] for x in manifest] == list(range(len(CONFIGS)))
+        for entry, config in zip(manifest, CONFIGS):
+            argv = []
+            for option, value in config.items():
+                option = "--" + option.replace("_", "-")
+                if value is True:
+                    argv.append(option)
+                elif isinstance(value, list):
+                    argv += [option] + [str(x) for x in value]
+                else:
+                    argv += [option, str(value)]
+            expected = os.path.join(out_dir, "expected.xml")
+            subprocess.check_call([sys.executable, "-m", "generator"] +
+                                  argv + ["-o", expected])
+            with open(entry["path"]) as model, open(expected) as reference:
+                assert model.read() == reference.read()
+            assert entry["seed"] == config["seed"]
+            assert entry["metrics"]["num_basic"] == config.get(
+                "num-basic", config.get("num_basic"))
+
+
+def test_generate_many_unknown_option():
+    """Tests the rejection of unknown generator options."""
+    with pytest.raises(ap.ArgumentTypeError):
+        generate_many([{"num-bsic": 200}])
+
+
+def test_generate_many_invalid_value():
+    """Tests the rejection of values the command line would not accept."""
+    with pytest.raises(ap.ArgumentTypeError):
+        generate_many([{"common-g": "abc"}])
+
+
+@pytest.mark.parametrize("option",
+                         ["cache-dir", "stats-json", "profile-json", "plan"])
+def test_generate_many_corpus_option(option):
+    """Tests the rejection of options that apply to the corpus only."""
+    with pytest.raises(ap.ArgumentTypeError):
+        generate_many([{"num-basic": 200, option: "out.json"}])
@@ -0,0 +1,62 @@
+"""Tests for the batched sampling of node attributes."""
+
+from collections import Counter
+import random
+
+import pytest
+
+from generator.event.gate import Gate
+from generator.fault_tree_generator import (FactorError, Factors,
+                                            generate_fault_tree)
+
+pytest.importorskip("numpy")
+
+
+def get_factors(seed, block_size=64):
+    """Creates factors with batch sampling of node attributes."""
+    factors = Factors()
+    factors.set_min_max_prob(0.01, 0.1)
+    factors.set_common_event_factors(0.1, 0.1, 2, 2)
+    factors.set_num_factors(4, 1000)
+    factors.set_gate_weights([1, 2, 1, 0])
+    factors.set_batch_sampling(seed, block_size)
+    factors.calculate()
+    return factors
+
+
+def test_set_batch_sampling_fail():
+    """Tests invalid batch sizes."""
+    with pytest.raises(FactorError):
+        Factors().set_batch_sampling(123, -1)
+
+
+def test_distributions():
+    """Tests the batched values against the factor distributions."""
+    factors = get_factors(123)
+    operators = Counter(factors.get_random_operator() for _ in range(8000))
+    assert set(operators) == {"and", "or", "atleast"}
+    assert abs(operators["or"] / 8000 - 0.5) < 0.03
+
+    for operator in ("and", "or", "atleast"):
+        gate = Gate("G1", operator)
+        for _ in range(100):
+            num_args = factors.get_num_args(gate)
+            assert num_args >= (3 if operator == "atleast" else 2)
+            if operator == "atleast":
+                assert 2 <= gate.k_num < num_args
+
+    probabilities = [factors.get_random_probability() for _ in range(200)]
+    assert all(0.01 <= x <= 0.1 for x in probabilities)
+
+
+def test_deterministic_generation():
+    """Tests that the batch sampler seed determines the fault tree."""
+    fault_trees = []
+    for _ in range(2):
+        random.seed(123)
+        fault_trees.append(
+            generate_fault_tree("TestingTree", "root", get_factors(42)))
+    assert ([x.operator for x in fault_trees[0].gates] ==
+            [x.operator for x in fault_trees[1].gates])
+    assert ([x.num_arguments() for x in fault_trees[0].gates] ==
+            [x.num_arguments() for x in fault_trees[1].gates])
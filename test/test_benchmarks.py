@@ -0,0 +1,57 @@
+"""Tests for the scaling benchmark of the generator."""
+
+import pytest
+
+from benchmarks import calibrate_planner
+from benchmarks import memory_usage
+from benchmarks.generator_scaling import (REGIMES, find_regressions,
+                                          get_sizes, run_benchmarks)
+
+
+def test_sizes():
+    """Tests the powers of ten up to the maximum size."""
+    assert get_sizes(1e2) == [100]
+    assert get_sizes(5e4) == [100, 1000, 10000]
+    assert get_sizes(1e9)[-1] == 10**7
+
+
+def test_regressions():
+    """Tests the benchmark results against themselves and a faster baseline."""
+    document = run_benchmarks(list(REGIMES), [100], repeat=1)
+    assert [x["regime"] for x in document["results"]] == list(REGIMES)
+    assert all(x["num_gates"] for x in document["results"])
+    assert not find_regressions(document, document, 0)
+
+    baseline = {"results": [dict(x) for x in document["results"]]}
+    baseline["results"][0]["best"] /= 2
+    regressions = find_regressions(baseline, document, 0.2)
+    assert [x["regime"] for x in regressions] == ["default"]
+
+
+def test_memory_usage():
+    """Tests the memory reports of both fault tree models."""
+    reports = memory_usage.run_benchmarks(
+        memory_usage.MODELS, [300], [3.0],
+        ["--num-house", "5", "--num-ccf", "5"])
+    assert [x["model"] for x in reports] == list(memory_usage.MODELS)
+    for report in reports:
+        assert report["num_basic"] == 300
+        assert set(report["phases"]) == set(memory_usage.PHASES)
+        assert all(x["peak_traced"] > 0 and x["peak_rss"] > 0
+                   for x in report["phases"].values())
+        assert (report["phases"]["serialization"]["peak_traced"] >=
+                report["retained_traced"])
+
+
+def test_calibration():
+    """Tests the fits and the calibration of the planner."""
+    assert calibrate_planner.fit_per_node([(10, 20), (20, 40)]) == 2
+    coefficient, exponent = calibrate_planner.fit_power_law([(10, 300),
+                                                             (100, 30000)])
+    assert exponent == pytest.approx(2)
+    assert coefficient == pytest.approx(3)
+    calibration = calibrate_planner.calibrate([500, 2000], [3.0], repeat=1)
+    assert calibration["base_bytes"] > 0
+    assert calibration["bytes_per_node"] > 0
+    assert calibration["time_coefficient"] > 0
+    assert calibration["seconds_per_byte"] > 0
@@ -0,0 +1,73 @@
+"""Tests for the buffered output of the fault tree writers."""
+
+import io
+
+from generator import fault_tree_generator
+from generator.bulk_writer import BulkWriter, open_writer, write_many
+from generator.profiler import Profile
+
+
+def test_print_protocol():
+    """Tests that the writer prints the lines like print() with sep=''."""
+    expected = io.StringIO()
+    stream = io.StringIO()
+    with BulkWriter(stream, buffer_lines=2) as printer:
+        for args in (("<float value=\"", 0.25, "\"/>"), (), ("G", 1, None)):
+            print(*args, file=expected, sep='')
+            printer(*args)
+    assert stream.getvalue() == expected.getvalue()
+    assert not stream.closed
+
+
+def test_buffering():
+    """Tests that the lines reach the destination only in bulk."""
+    stream = io.StringIO()
+    printer = BulkWriter(stream, buffer_lines=3)
+    printer("a")
+    printer("b")
+    assert not stream.getvalue()
+    printer.write_many(["c", "d"])
+    assert stream.getvalue() == "a\nb\nc\n"
+    printer("e")
+    printer.flush()
+    assert stream.getvalue() == "a\nb\nc\nd\ne\n"
+
+
+def test_write_many():
+    """Tests the bulk path with and without the bulk writer."""
+    lines = []
+    write_many(lines.append, (x for x in "abc"))
+    assert lines == ["a", "b", "c"]
+    profile = Profile()
+    stream = io.StringIO()
+    with BulkWriter(stream) as printer:
+        wrapped = profile.wrap_printer(printer)
+        wrapped("G", 1)
+        write_many(wrapped, ["B1", "B2"])
+    assert stream.getvalue() == "G1\nB1\nB2\n"
+    assert profile.counters["bytes_written"] == len(stream.getvalue())
+
+
+def test_open_writer(tmp_path):
+    """Tests that the writer owns the output file."""
+    file_path = str(tmp_path / "out.txt")
+    with open_writer(file_path) as printer:
+        printer("line")
+    assert printer.destination.closed
+    with open(file_path) as out_file:
+        assert out_file.read() == "line\n"
+
+
+def test_main_output(tmp_path):
+    """Tests that the XML output matches the unbuffered printer."""
+    file_path = str(tmp_path / "ft.xml")
+    fault_tree_generator.main(
+        ["-b", "200", "--num-ccf", "5", "--seed", "7", "-o", file_path])
+    args = fault_tree_generator.manage_cmd_args(["-b", "200", "--num-ccf",
+                                                 "5", "--seed", "7"])
+    stream = io.StringIO()
+    fault_tree_generator.write_fault_tree(
+        args, fault_tree_generator.setup_factors(args),
+        lambda *x: print(*x, file=stream, sep=''))
+    with open(file_path) as out_file:
+        assert out_file.read() == stream.getvalue()
@@ -0,0 +1,198 @@
+"""Empirical time complexity tests for the generator and writers.
+
+The best run times at geometrically growing sizes are fitted
+with a power law, and the fitted exponent (the log-log slope)
+must stay roughly linear.
+The deep fault trees are generated with the default number of arguments,
+and the wide fault trees have a few gates with many arguments each
+to catch the work quadratic in the number of gate arguments.
+
+These tests take several seconds;
+deselect them with -m "not complexity" for quick runs.
+"""
+
+import functools
+import math
+import os
+import random
+import sys
+import time
+
+import pytest
+
+from generator import fault_tree_generator
+from generator.fault_tree import toposort_gates
+from generator.graph_core import CompactFaultTree
+
+pytest.importorskip("numpy")  # for the src scripts
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+import fault_tree_generator as src_generator  # pylint: disable=wrong-import-position
+
+pytestmark = pytest.mark.complexity
+
+# The upper bound for linear time with noise and cache effects
+# (the generation time per basic event also grows slowly with the size);
+# the quadratic work shows slopes about 1.65 at these sizes.
+MAX_SLOPE = 1.5
+SIZES = (2000, 4000, 8000, 16000)
+
+
+def _discard(*args):
+    """Prints nothing."""
+    del args
+
+
+def get_best_time(function):
+    """Measures the best run time of the function.
+
+    Fast functions are run in loops of at least 50 ms.
+
+    Args:
+        function: The function without arguments.
+
+    Returns:
+        The best time of a single run in seconds.
+    """
+    number = 1
+    while True:
+        times = []
+        for _ in range(5):
+            start_time = time.perf_counter()
+            for _ in range(number):
+                function()
+            times.append(time.perf_counter() - start_time)
+        if min(times) >= 0.05:
+            return min(times) / number
+        number *= 2
+
+
+def get_slope(sizes, times):
+    """Fits the exponent of the power law to the run times.
+
+    Args:
+        sizes: The sizes of the problems.
+        times: The run times for the sizes.
+
+    Returns:
+        The least squares slope of the log-log data.
+    """
+    log_sizes = [math.log(x) for x in sizes]
+    log_times = [math.log(x) for x in times]
+    mean_size = sum(log_sizes) / len(sizes)
+    mean_time = sum(log_times) / len(times)
+    return (sum((x - mean_size) * (y - mean_time)
+                for x, y in zip(log_sizes, log_times)) /
+            sum((x - mean_size)**2 for x in log_sizes))
+
+
+def get_factors(module, num_basic):
+    """Sets up the default factors of the generator module."""
+    factors = module.Factors()
+    factors.set_min_max_prob(0.01, 0.1)
+    factors.set_common_event_factors(0.1, 0.1, 2, 2)
+    factors.set_num_factors(3, num_basic)
+    factors.set_gate_weights([1, 1, 0, 0, 0])
+    factors.calculate()
+    return factors
+
+
+@functools.lru_cache(maxsize=None)
+def get_deep_tree(module, num_basic):
+    """Generates the fault tree with the default factors."""
+    random.seed(num_basic)  # the src scripts use the shared random
+    return module.generate_fault_tree("DeepTree", "root",
+                                      get_factors(module, num_basic))
+
+
+@functools.lru_cache(maxsize=None)
+def get_wide_tree(module, num_basic, num_gates=4):
+    """Constructs the fault tree of a few gates with many basic events."""
+    random.seed(num_basic)
+    fault_tree = module.GeneratorFaultTree("WideTree",
+                                           get_factors(module, num_basic))
+    fault_tree.construct_top_gate("root")
+    gates = [fault_tree.construct_gate() for _ in range(num_gates)]
+    for gate in gates:
+        fault_tree.top_gate.add_argument(gate)
+    for i in range(num_basic):
+        gates[i % num_gates].add_argument(fault_tree.construct_basic_event())
+    return fault_tree
+
+
+def write_aralia_gates(fault_tree):
+    """Writes the Aralia gates (basic events are not supported)."""
+    for gate in toposort_gates([fault_tree.top_gate], fault_tree.gates):
+        gate.to_aralia(_discard)
+
+
+WRITERS = {
+    "to_xml": (fault_tree_generator, lambda x: x.to_xml(_discard)),
+    "to_aralia": (fault_tree_generator, write_aralia_gates),
+    "src.to_xml": (src_generator, lambda x: x.to_xml(_discard)),
+    "src.to_aralia": (src_generator, lambda x: x.to_aralia(_discard)),
+    "src.to_SAPHIRE_json_printer":
+        (src_generator, lambda x: x.to_SAPHIRE_json_printer(_discard)),
+    "src.to_OpenPRA_json_printer":
+        (src_generator, lambda x: x.to_OpenPRA_json_printer(_discard)),
+}
+
+
+def test_generation():
+    """Tests the generation time of the fault trees."""
+    factors = {x: get_factors(fault_tree_generator, x) for x in SIZES}
+    times = [
+        get_best_time(lambda x=x: fault_tree_generator.generate_fault_tree(
+            "DeepTree", "root", factors[x], rng=random.Random(x)))
+        for x in SIZES
+    ]
+    assert get_slope(SIZES, times) < MAX_SLOPE
+
+
+def build_wide_gate(compact, num_basic):
+    """Constructs the top gate with many gate arguments sharing a basic event.
+
+    The arguments are checked and added through the node interface
+    of the generation steps, and every argument gets the same basic event
+    twice, so the shared basic event has as many parents as the top gate
+    has arguments.
+    """
+    factors = get_factors(fault_tree_generator, num_basic)
+    rng = random.Random(num_basic)
+    if compact:
+        fault_tree = CompactFaultTree("WideGate", "root", factors, rng)
+        fault_tree.construct_top_gate()
+    else:
+        fault_tree = fault_tree_generator.GeneratorFaultTree(
+            "WideGate", factors, rng)
+        fault_tree.construct_top_gate("root")
+    top_gate = fault_tree.top_node
+    shared = fault_tree.construct_basic_event()
+    for _ in range(num_basic):
+        gate = fault_tree.construct_gate()
+        if not fault_tree.has_gate_argument(top_gate, gate):
+            fault_tree.add_gate_argument(top_gate, gate)
+        fault_tree.add_basic_argument(gate, shared)
+        fault_tree.add_basic_argument(gate, shared)
+    assert fault_tree.num_arguments(top_gate) == num_basic
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_wide_gate_construction(compact):
+    """Tests the argument checks for gates and events with many edges."""
+    times = [
+        get_best_time(lambda x=x: build_wide_gate(compact, x)) for x in SIZES
+    ]
+    assert get_slope(SIZES, times) < MAX_SLOPE
+
+
+@pytest.mark.parametrize("get_tree,writer",
+                         [(get_tree, writer)
+                          for get_tree in (get_deep_tree, get_wide_tree)
+                          for writer in WRITERS])
+def test_writer(get_tree, writer):
+    """Tests the writing time of the fault trees."""
+    module, write = WRITERS[writer]
+    trees = [get_tree(module, x) for x in SIZES]
+    times = [get_best_time(lambda x=x: write(x)) for x in trees]
+    assert get_slope(SIZES, times) < MAX_SLOPE
@@ -16,6 +16,9 @@
 
 from __future__ import division, absolute_import
 
+from argparse import ArgumentTypeError
+from concurrent.futures import ThreadPoolExecutor
+import json
 import random
 from subprocess import call
 from tempfile import NamedTemporaryFile
@@ -24,7 +27,17 @@ from unittest import TestCase
 from lxml import etree
 import pytest
 
+from generator.event.basic_event import BasicEvent
+from generator.event.gate import Gate, LazyAncestors
+from generator.event.house_event import HouseEvent
+from generator.exact_generator import get_deviations
 from generator.fault_tree_generator import FactorError, Factors, generate_fault_tree, write_info, write_summary, main
+from generator.fault_tree_generator import GeneratorFaultTree, get_metrics
+from generator.fault_tree_generator import manage_cmd_args, setup_factors, write_fault_tree
+from generator.fault_tree import toposort_gates
+from generator.generation_steps import distribute_house_events
+from generator.planner import CALIBRATION, get_name_length, get_plan
+from generator.profiler import Profile
 
 # pylint: disable=redefined-outer-name
 
@@ -189,9 +202,13 @@ class FaultTreeGeneratorTestCase(TestCase):
         self.factors.num_basic = 200
         self.factors.constrain_num_gate(200)
         self.factors.calculate()
-        fault_tree = generate_fault_tree("TestingTree", "root", self.factors)
-        assert fault_tree is not None
-        assert abs(1 - len(fault_tree.gates) / 200) < 0.1
+        num_gates = []
+        for _ in range(10):  # the number varies by 8% on average
+            fault_tree = generate_fault_tree("TestingTree", "root",
+                                             self.factors)
+            assert fault_tree is not None
+            num_gates.append(len(fault_tree.gates))
+        assert abs(1 - sum(num_gates) / len(num_gates) / 200) < 0.1
 
 
 def test_main():
@@ -210,3 +227,290 @@ def test_main():
         NamedTemporaryFile(mode="w+").name
     ]
     assert call(cmd) == 0
+
+
+def test_lazy_ancestors():
+    """Compares rank-bounded ancestor checks with the full traversal."""
+    random.seed(123)
+    factors = Factors()
+    factors.set_common_event_factors(0.1, 0.4, 2, 2)
+    factors.set_num_factors(3, 2000)
+    factors.set_gate_weights([1, 1, 0, 0, 0])
+    factors.calculate()
+    fault_tree = generate_fault_tree("TestingTree", "root", factors)
+    gates = list(fault_tree.gates)
+    assert all(x.rank < y.rank for x in gates for y in x.g_arguments)
+    for gate in random.sample(gates, 20):
+        ancestors = gate.get_ancestors()
+        lazy_ancestors = LazyAncestors(gate)
+        for other in random.sample(gates, 100):
+            assert (other in lazy_ancestors) == (other in ancestors)
+
+
+def test_concurrent_generation():
+    """Tests that per-instance PRNGs make concurrent generation reproducible."""
+    factors = Factors()
+    factors.set_common_event_factors(0.1, 0.1, 2, 2)
+    factors.set_num_factors(3, 500, 10, 10)
+    factors.set_gate_weights([1, 1, 1, 0.1, 0.1])
+    factors.calculate()
+
+    def get_signature(seed):
+        """Generates a fault tree and summarizes its structure."""
+        fault_tree = generate_fault_tree("TestingTree", "root", factors,
+                                         rng=random.Random(seed))
+        return [(x.operator, [y.name for y in x.b_arguments],
+                 [y.name for y in x.g_arguments]) for x in fault_tree.gates]
+
+    seeds = list(range(8)) * 2
+    expected = [get_signature(x) for x in seeds]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(get_signature, seeds)) == expected
+
+
+def test_eligible_gates():
+    """Tests the indexes of gates for exhaustion and house events."""
+    factors = Factors()
+    factors.set_common_event_factors(0.1, 0.1, 2, 2)
+    factors.set_num_factors(3, 100, 5)
+    factors.set_gate_weights([1, 0, 0, 1, 1])
+    factors.calculate()
+    fault_tree = GeneratorFaultTree("TestingTree", factors, random.Random(1))
+    fault_tree.construct_top_gate("root")
+    distribute_house_events(fault_tree)  # only the top gate is available
+    assert len(fault_tree.top_gate.h_arguments) == 5
+
+    common = [fault_tree.construct_gate(common=True) for _ in range(20)]
+    others = [fault_tree.construct_gate() for _ in range(20)]
+    eligible = [
+        x for x in fault_tree.gates[1:] if x.operator not in ("not", "xor")
+    ]
+    assert fault_tree.house_targets == eligible
+    assert fault_tree.exhaustion_targets == [fault_tree.top_gate] + [
+        x for x in others if x in eligible
+    ]
+    assert not set(common) & set(fault_tree.exhaustion_targets)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_running_metrics(compact):
+    """Tests the metrics from the running statistics against the traversal."""
+    factors = Factors()
+    factors.set_common_event_factors(0.3, 0.2, 3, 2)
+    factors.set_num_factors(3, 2000, 20, 30)
+    factors.set_gate_weights([1, 1, 1, 0.1, 0.1])
+    factors.calculate()
+    fault_tree = generate_fault_tree("TestingTree", "root", factors, compact,
+                                     random.Random(5))
+    metrics = get_metrics(fault_tree)
+    fault_tree.stats = None
+    expected = get_metrics(fault_tree)
+    assert metrics.keys() == expected.keys()
+    for key, value in expected.items():
+        assert metrics[key] == pytest.approx(value, rel=1e-12), key
+
+
+def test_frozen_arguments():
+    """Tests the argument containers of the generated fault tree."""
+    factors = Factors()
+    factors.set_common_event_factors(0.1, 0.1, 2, 2)
+    factors.set_num_factors(3, 500, 10)
+    factors.set_gate_weights([1, 1, 1, 0.1, 0.1])
+    factors.calculate()
+    fault_tree = generate_fault_tree("TestingTree", "root", factors,
+                                     rng=random.Random(7))
+    for gate in fault_tree.gates:
+        args = (gate.g_arguments, gate.b_arguments, gate.h_arguments,
+                gate.u_arguments)
+        assert all(isinstance(x, tuple) for x in args)
+        assert isinstance(gate.parents, tuple)
+        assert gate.num_arguments() == sum(len(x) for x in args)
+        assert all(len(set(x)) == len(x) for x in args)
+        for arg in gate.g_arguments + gate.b_arguments + gate.h_arguments:
+            assert arg.parents.count(gate) == 1
+
+
+def test_duplicate_arguments():
+    """Tests that duplicates are ignored for arguments with many parents."""
+    basic_event = BasicEvent("B1", None)
+    gates = [Gate("G%d" % i, "or") for i in range(1000)]
+    for gate in gates:
+        gate.add_argument(basic_event)
+        gate.add_argument(basic_event)
+    assert basic_event.parents == gates
+    assert all(x.num_arguments() == 1 for x in gates)
+    gates[0].remove_argument(basic_event)
+    gates[0].add_argument(basic_event)
+    assert basic_event.parents == gates[1:] + gates[:1]
+    assert gates[0].b_arguments == [basic_event]
+
+
+
+@pytest.mark.parametrize("nest,expected", [
+    (False, '<define-gate name="G1">\n<atleast min="2">\n'
+     '<house-event name="H1"/>\n<basic-event name="B1"/>\n'
+     '<basic-event name="B2"/>\n<gate name="G2"/>\n<gate name="G3"/>\n'
+     '</atleast>\n</define-gate>'),
+    (True, '<define-gate name="G1">\n<atleast min="2">\n'
+     '<house-event name="H1"/>\n<basic-event name="B1"/>\n'
+     '<basic-event name="B2"/>\n<not>\n<basic-event name="B3"/>\n'
+     '</not><gate name="G3"/>\n</atleast>\n</define-gate>'),
+])
+def test_gate_xml(nest, expected):
+    """Tests the MEF XML templates of the gate formulas."""
+    gate = Gate("G1", "atleast", 2)
+    not_gate = Gate("G2", "not")
+    not_gate.add_argument(BasicEvent("B3", None))
+    gate.add_argument(HouseEvent("H1", True))
+    gate.add_argument(BasicEvent("B1", None))
+    gate.add_argument(BasicEvent("B2", None))
+    gate.add_argument(not_gate)
+    gate.add_argument(Gate("G3", "and"))
+    assert gate.get_xml(nest) == expected
+    lines = []
+    gate.to_xml(lines.append, nest)
+    assert lines == [expected]
+    assert not_gate.get_xml(nest) == ('<define-gate name="G2">\n<not>\n'
+                                      '<basic-event name="B3"/>\n'
+                                      '</not>\n</define-gate>')
+
+@pytest.mark.parametrize("options", [[], ["--compact"], ["--stream"]])
+def test_profile(options):
+    """Tests that the profile does not change the output."""
+    args = manage_cmd_args(["-b", "1000", "--common-g", "0.3"] + options)
+
+    def generate(profile):
+        lines = []
+        write_fault_tree(args, setup_factors(args),
+                         lambda *x: lines.append("".join(str(y) for y in x)),
+                         profile)
+        return lines
+
+    profile = Profile()
+    lines = generate(profile)
+    assert lines == generate(None)
+    report = profile.get_report()
+    assert report["phases"]["generation"]["calls"] == 1
+    assert report["counters"]["bytes_written"] == sum(
+        len(x) + 1 for x in lines)
+    if not args.stream:
+        assert report["phases"]["init_gates"]["calls"] == 1
+        assert report["counters"]["gates_initialized"] > 1
+        assert (report["counters"]["common_gate_rejections"] <=
+                report["counters"]["common_gate_tries"])
+
+
+def test_name_length():
+    """Tests the lengths of the sequential names across the digit counts."""
+    for count in (0, 1, 9, 10, 99, 100, 12345):
+        assert get_name_length("G", count) == sum(
+            len("G" + str(i)) for i in range(1, count + 1))
+
+
+@pytest.mark.parametrize("options", [
+    [], ["-a", "5"], ["--num-house", "200", "--num-ccf", "100"],
+    ["--weights-g", "1", "1", "1", "0.1", "0.1", "--common-g", "0.3"],
+    ["--num-gate", "3000", "--weights-g", "1", "1", "1", "0.1", "0.1"]
+])
+def test_plan(options):
+    """Tests the plan against the generated fault tree."""
+    args = manage_cmd_args(["-b", "5000"] + options)
+    factors = setup_factors(args)
+    plan = get_plan(factors, args.ft_name)
+    lines = []
+    fault_tree = write_fault_tree(
+        args, factors, lambda *x: lines.append("".join(str(y) for y in x)))
+    metrics = get_metrics(fault_tree)
+    for key in ("num_basic", "num_house", "num_ccf", "num_gate"):
+        assert plan[key] == pytest.approx(metrics[key], rel=0.05)
+    assert plan["num_edges"] == pytest.approx(
+        sum(x.num_arguments() for x in fault_tree.gates), rel=0.05)
+    assert plan["output_bytes"]["xml"] == pytest.approx(
+        sum(len(x) + 1 for x in lines), rel=0.05)
+    assert plan["peak_memory"] > 0 and plan["time"]["generation"] > 0
+
+
+def test_plan_main(tmp_path):
+    """Tests the dry run on the command line."""
+    out = tmp_path / "tree.xml"
+    stats = tmp_path / "plan.json"
+    calibration = tmp_path / "calibration.json"
+    calibration.write_text(json.dumps({"standard": {"bytes_per_node": 0}}))
+    main(["-b", "1000", "--plan", "-o", str(out), "--stats-json",
+          str(stats), "--plan-calibration", str(calibration)])
+    assert not out.exists()
+    plan = json.loads(stats.read_text())
+    assert plan["model"] == "standard"
+    assert plan["num_basic"] == 1000
+    assert plan["peak_memory"] == CALIBRATION["standard"]["base_bytes"]
+    assert plan["time"]["writing"] > 0
+
+
+@pytest.mark.parametrize("options", [
+    ["-b", "3000"], ["-b", "3000", "--num-gate", "1000"],
+    ["-b", "1000", "--num-gate", "400"], ["-b", "300", "--num-gate", "900"],
+    ["-b", "2000", "-a", "5", "--weights-g", "1", "1", "1", "0.1", "0.1",
+     "--num-house", "50", "--num-ccf", "20"],
+    ["-b", "3", "--num-gate", "50", "--common-g", "0.5"]
+])
+def test_exact(options):
+    """Tests the exact numbers of gates and basic events."""
+    args = manage_cmd_args(options + ["--exact"])
+    factors = setup_factors(args)
+    fault_tree = generate_fault_tree("ExactTree", "root", factors,
+                                     rng=random.Random(42), exact=True)
+    num_gate = args.num_gate or factors.get_num_gate()
+    assert len(fault_tree.gates) == num_gate
+    assert len(fault_tree.basic_events) == args.num_basic
+    assert len(fault_tree.house_events) == args.num_house
+    assert len(toposort_gates([fault_tree.top_gate],
+                              fault_tree.gates)) == num_gate
+    min_args = {"and": 2, "or": 2, "atleast": 3, "not": 1, "xor": 2}
+    for gate in fault_tree.gates:
+        assert gate.parents or gate is fault_tree.top_gate
+        assert gate.num_arguments() >= min_args[gate.operator]
+        if gate.operator in ("not", "xor"):
+            assert gate.num_arguments() == min_args[gate.operator]
+        elif gate.operator == "atleast":
+            assert 2 <= gate.k_num < gate.num_arguments()
+    assert all(x.parents for x in fault_tree.basic_events)
+    deviations = get_deviations(factors, get_metrics(fault_tree))
+    assert deviations["num_gate"]["achieved"] == num_gate
+    if not args.num_gate:  # consistent factors
+        for name in ("num_args", "common_b", "common_g", "parents_b",
+                     "parents_g"):
+            assert deviations[name]["achieved"] == pytest.approx(
+                deviations[name]["requested"], rel=0.1)
+
+
+def test_exact_main(tmp_path):
+    """Tests the report of the exact generation on the command line."""
+    out = tmp_path / "tree.xml"
+    stats = tmp_path / "stats.json"
+    main(["-b", "1000", "--num-gate", "400", "--exact", "-o", str(out),
+          "--stats-json", str(stats)])
+    assert "The achieved factors" in out.read_text()
+    metrics = json.loads(stats.read_text())
+    assert metrics["num_gate"] == 400
+    assert metrics["deviations"]["num_gate"] == {
+        "requested": 400,
+        "achieved": 400
+    }
+    with pytest.raises(ArgumentTypeError):
+        main(["-b", "1000", "--exact", "--compact"])
+
+
+@pytest.mark.parametrize("options", [
+    ["-b", "3", "--num-gate", "1"],
+    ["-b", "5", "-a", "5", "--weights-g", "0", "0", "1"]
+])
+def test_exact_single_gate(tmp_path, options):
+    """Tests the report of the exact trees without common or gate arguments."""
+    out = tmp_path / "tree.xml"
+    stats = tmp_path / "stats.json"
+    main(options + ["--exact", "-o", str(out), "--stats-json", str(stats)])
+    assert out.read_text().count("<define-gate") == 1
+    metrics = json.loads(stats.read_text())
+    assert metrics["num_gate"] == 1
+    assert metrics["common_b"] == 0
+    assert metrics["common_g"] == 0
@@ -0,0 +1,111 @@
+"""Tests for the array-backed fault tree graph core."""
+
+import io
+import random
+from subprocess import call
+from tempfile import NamedTemporaryFile
+
+import pytest
+
+from generator.fault_tree import toposort_gates
+from generator.fault_tree_generator import Factors, generate_fault_tree
+from generator.graph_core import BASIC, GATE, GraphCore, make_ref
+
+
+def test_arguments_and_parents_in_insertion_order():
+    """Tests the linked edge lists before and after freezing."""
+    core = GraphCore()
+    gates = [core.add_gate(0) for _ in range(3)]
+    events = [core.add_basic_event(0.5) for _ in range(2)]
+    core.add_argument(gates[0], make_ref(BASIC, events[1]))
+    core.add_argument(gates[0], make_ref(GATE, gates[2]))
+    core.add_argument(gates[0], make_ref(BASIC, events[0]))
+    core.add_argument(gates[1], make_ref(BASIC, events[1]))
+    assert not core.add_argument(gates[1], make_ref(BASIC, events[1]))
+    core.add_argument(gates[1], make_ref(GATE, gates[2]))
+    expected_args = [
+        make_ref(BASIC, events[1]),
+        make_ref(GATE, gates[2]),
+        make_ref(BASIC, events[0])
+    ]
+    for _ in range(2):
+        assert list(core.arguments(gates[0])) == expected_args
+        assert list(core.parents(BASIC, events[1])) == [gates[0], gates[1]]
+        assert list(core.parents(GATE, gates[2])) == [gates[0], gates[1]]
+        assert core.num_args[gates[1]] == 2
+        assert core.num_parents[BASIC][events[1]] == 2
+        assert core.ranks[gates[2]] > core.ranks[gates[0]]
+        assert core.has_argument(gates[1], make_ref(GATE, gates[2]))
+        assert not core.has_argument(gates[1], make_ref(BASIC, events[0]))
+        if not core.is_frozen():
+            core.freeze()
+    assert core.num_edges() == 5
+
+
+def get_factors(num_house=0, num_ccf=0):
+    """Creates fully configured factors for generation."""
+    factors = Factors()
+    factors.set_min_max_prob(0.01, 0.1)
+    factors.set_common_event_factors(0.3, 0.4, 2, 3)
+    factors.set_num_factors(3, 2000, num_house, num_ccf)
+    factors.set_gate_weights([1, 1, 1, 0.1, 0.1])
+    factors.calculate()
+    return factors
+
+
+@pytest.mark.parametrize("nest", [False, True])
+def test_compact_xml_output(nest):
+    """Compares the compact fault tree output with the object model one."""
+    outputs = []
+    for compact in (False, True):
+        random.seed(123)
+        fault_tree = generate_fault_tree("TestingTree", "root",
+                                         get_factors(10, 10), compact)
+        stream = io.StringIO()
+        fault_tree.to_xml(lambda *args: print(*args, file=stream, sep=''),
+                          nest)
+        outputs.append(stream.getvalue())
+    assert outputs[0] == outputs[1]
+
+
+def test_compact_aralia_output():
+    """Checks if the compact Aralia format output passes validation."""
+    random.seed(123)
+    fault_tree = generate_fault_tree("TestingTree", "root",
+                                     get_factors(10, 10), True)
+    with NamedTemporaryFile(mode="w+") as tmp:
+        fault_tree.to_aralia(lambda *args: print(*args, file=tmp, sep=''))
+        tmp.flush()
+        tmp.seek(0)
+        assert "p(B1) = " in tmp.read()
+        out = NamedTemporaryFile(mode="w+")
+        assert call(["./translators/aralia.py", tmp.name, "-o",
+                     out.name]) == 0
+
+
+def test_compact_toposort():
+    """Compares the graph core toposort with the object model one."""
+    random.seed(123)
+    fault_tree = generate_fault_tree("TestingTree", "root", get_factors())
+    random.seed(123)
+    compact_tree = generate_fault_tree("TestingTree", "root", get_factors(),
+                                       True)
+    expected = [
+        x.name for x in toposort_gates([fault_tree.top_gate], fault_tree.gates)
+    ]
+    assert [compact_tree.gates[x].name
+            for x in compact_tree.core.toposort(0)] == expected
+
+
+def test_wide_gate_duplicates():
+    """Tests the duplicate checks of gates with many arguments."""
+    core = GraphCore()
+    gate = core.add_gate(0)
+    refs = [make_ref(BASIC, core.add_basic_event(0.5)) for _ in range(100)]
+    for ref in refs:
+        assert core.add_argument(gate, ref)
+        assert not core.add_argument(gate, ref)
+    core.finalize(gate)
+    assert all(core.has_argument(gate, x) for x in refs)
+    assert not core.add_argument(gate, refs[50])
+    assert core.num_args[gate] == 100
@@ -0,0 +1,71 @@
+"""Tests for the on-disk cache of generated models."""
+
+import os
+from tempfile import TemporaryDirectory
+
+from generator.fault_tree_generator import main
+from generator.model_cache import ModelCache, make_key
+
+
+def test_cached_main():
+    """Tests that the cached models are identical to the generated ones."""
+    with TemporaryDirectory() as tmp_dir:
+        cache_dir = os.path.join(tmp_dir, "cache")
+        outputs = []
+        for i, extra in enumerate([[], [], ["--nest"], ["--seed", "7"], []]):
+            out = os.path.join(tmp_dir, "out%d.xml" % i)
+            main(["-b", "200", "--weights-g", "1", "1", "0", "0.1", "-o", out,
+                  "--cache-dir", cache_dir] + extra)
+            with open(out) as model:
+                outputs.append(model.read())
+        assert outputs[0] == outputs[1] == outputs[4]
+        assert outputs[0] != outputs[2] and outputs[0] != outputs[3]
+
+        out = os.path.join(tmp_dir, "reference.xml")
+        main(["-b", "200", "--weights-g", "1", "1", "0", "0.1", "--nest",
+              "-o", out])
+        with open(out) as model:
+            assert model.read() == outputs[2]
+
+        stats = ModelCache(cache_dir, 0).get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 3
+        assert stats["entries"] == 3
+        assert stats["evictions"] == 0
+
+
+def test_eviction():
+    """Tests that the least recently used models are evicted."""
+    with TemporaryDirectory() as cache_dir:
+        cache = ModelCache(cache_dir, 250)
+        keys = [make_key({"model": i}) for i in range(3)]
+        for key in keys[:2]:
+            cache.write_model(key, os.path.join(cache_dir, "out"),
+                              lambda printer: printer("x" * 99))
+        os.utime(os.path.join(cache_dir, keys[0][:2], keys[0] + ".xml"),
+                 (0, 0))  # the least recently used
+        cache.write_model(keys[1], None, None)
+        cache.write_model(keys[2], os.path.join(cache_dir, "out"),
+                          lambda printer: printer("y" * 99))
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 1
+        assert not os.path.exists(
+            os.path.join(cache_dir, keys[0][:2], keys[0] + ".xml"))
+
+
+def test_evicted_model():
+    """Tests that the metadata without the model is a miss."""
+    with TemporaryDirectory() as cache_dir:
+        cache = ModelCache(cache_dir, 1000)
+        key = make_key({"model": 0})
+        out = os.path.join(cache_dir, "out")
+        cache.write_model(key, out, lambda printer: printer("x" * 99))
+        os.remove(os.path.join(cache_dir, key[:2], key + ".xml"))
+        assert cache.write_model(key, out, lambda printer: printer("y")) is None
+        with open(out) as model:
+            assert model.read() == "y\n"
+        stats = cache.get_stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 0
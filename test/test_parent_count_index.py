@@ -0,0 +1,53 @@
+"""Tests for the parent count index of common events."""
+
+import random
+
+from generator.event.basic_event import BasicEvent
+from generator.event.gate import Gate
+from generator.parent_count_index import ParentCountIndex
+
+
+def test_buckets_follow_add_argument():
+    """Tests that events move between buckets as they gain parents."""
+    events = [BasicEvent("B" + str(i), None) for i in range(3)]
+    index = ParentCountIndex(events)
+    assert len(index) == 3
+    assert len(index.bucket(0)) == 3
+
+    gates = [Gate("G" + str(i), "and") for i in range(3)]
+    gates[0].add_argument(events[0])
+    assert events[0] in index.bucket(1)
+    assert len(index.bucket(0)) == 2
+
+    gates[1].add_argument(events[0])
+    gates[2].add_argument(events[0])
+    assert index.bucket(2) == [events[0]]
+    assert events[0] not in index.bucket(1)
+
+
+def test_choice_prefers_fewer_parents():
+    """Tests the orphan -> single-parent -> multi-parent preference."""
+    random.seed(123)
+    events = [BasicEvent("B" + str(i), None) for i in range(2)]
+    index = ParentCountIndex(events)
+    gate = Gate("G1", "or")
+    chosen = index.choice()
+    gate.add_argument(chosen)
+    assert index.choice() is not chosen
+    gate.add_argument(index.choice())
+    assert not index.bucket(0)
+    assert index.choice() in events
+
+
+def test_candidates_priority_order():
+    """Tests that candidates are yielded bucket by bucket without repeats."""
+    random.seed(123)
+    gates = [Gate("G" + str(i), "and") for i in range(6)]
+    index = ParentCountIndex(gates[2:])
+    gates[0].add_argument(gates[2])
+    gates[0].add_argument(gates[3])
+    gates[1].add_argument(gates[3])
+    candidates = list(index.candidates())
+    assert len(candidates) == 4
+    assert set(candidates[:2]) == {gates[4], gates[5]}
+    assert candidates[2:] == [gates[2], gates[3]]
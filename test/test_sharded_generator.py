@@ -0,0 +1,64 @@
+"""Tests for the parallel generation of fault trees from sub-trees."""
+
+from array import array
+import random
+
+from generator.fault_tree_generator import Factors, generate_fault_tree
+from generator.graph_core import BASIC, GATE, HOUSE, make_ref
+from generator.sharded_generator import mix_common_basic_events
+
+
+def get_factors():
+    """Creates fully configured factors for generation."""
+    factors = Factors()
+    factors.set_min_max_prob(0.01, 0.1)
+    factors.set_common_event_factors(0.3, 0.2, 3, 2)
+    factors.set_num_factors(3, 3000, 20, 30)
+    factors.set_gate_weights([1, 1, 1, 0.1, 0.1])
+    factors.calculate()
+    return factors
+
+
+def test_sharded_generation():
+    """Tests the sizes, determinism, and validity of stitched trees."""
+    factors = get_factors()
+    fault_trees = [
+        generate_fault_tree("TestingTree", "root", factors,
+                            rng=random.Random(123), workers=3)
+        for _ in range(2)
+    ]
+    core = fault_trees[0].core
+    assert core.num_nodes(BASIC) == 3000
+    assert core.num_nodes(HOUSE) == 20
+    assert len(fault_trees[0].ccf_groups) == 30
+    assert core.num_args[0] == 3
+    assert all(core.num_parents[BASIC]) and all(core.num_parents[GATE][1:])
+    assert len(core.toposort(0)) == core.num_nodes(GATE)
+    for gate in range(core.num_nodes(GATE)):
+        args = list(core.arguments(gate))
+        assert len(args) == len(set(args))
+    other_core = fault_trees[1].core
+    assert core.num_edges() == other_core.num_edges()
+    assert all(
+        list(core.arguments(x)) == list(other_core.arguments(x))
+        for x in range(core.num_nodes(GATE)))
+
+
+def test_mix_common_basic_events():
+    """Tests that the mixing preserves degrees and avoids duplicates."""
+    rng = random.Random(123)
+    edge_parent = array('i')
+    edge_child = array('i')
+    for gate in range(40):
+        for event in rng.sample(range(30), 3):
+            edge_parent.append(gate)
+            edge_child.append(make_ref(BASIC, event))
+    original = list(edge_child)
+    mix_common_basic_events(edge_parent, edge_child, 30, rng)
+    assert list(edge_child) != original
+    assert sorted(edge_child) == sorted(original)
+    args = {}
+    for gate, ref in zip(edge_parent, edge_child):
+        assert ref not in args.setdefault(gate, set())
+        args[gate].add(ref)
+    assert all(len(x) == 3 for x in args.values())
@@ -0,0 +1,94 @@
+"""Tests for the JSON output of the src scripts."""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")  # for the src scripts
+jsonschema = pytest.importorskip("jsonschema")
+ROOT = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import fault_tree_generator as src_generator  # pylint: disable=wrong-import-position
+
+
+def get_output(write_info, argv, root="root80000"):
+    """Generates the fault tree and writes it with the header."""
+    args = src_generator.manage_cmd_args(argv)
+    fault_tree = src_generator.generate_fault_tree(
+        args.ft_name, root, src_generator.setup_factors(args))
+    stream = io.StringIO()
+
+    def _print(*x):
+        print(*x, file=stream, sep='')
+
+    write_info(fault_tree, _print, 1)
+    if write_info is src_generator.write_info_JSON_printer:
+        fault_tree.to_SAPHIRE_json_printer(_print)
+    else:
+        fault_tree.to_OpenPRA_json_printer(_print)
+    return fault_tree, json.loads(stream.getvalue())
+
+
+@pytest.mark.parametrize("argv", [["-b", "200"],
+                                  ["-b", "200", "--weights-g", "1", "1", "1"],
+                                  ["-b", "400", "-a", "3", "--num-ccf", "4",
+                                   "--ccf-size", "3"]])
+def test_saphsolve_schema(argv):
+    """Tests that the SAPHSOLVE JSON output conforms to the schema."""
+    with open(os.path.join(ROOT, "schema", "saphsolve",
+                           "input_schema.json")) as schema_file:
+        schema = json.load(schema_file)
+    fault_tree, output = get_output(src_generator.write_info_JSON_printer,
+                                    argv)
+    jsonschema.validate(output, schema)
+    gates = output["saphiresolveinput"]["faulttreelist"][0]["gatelist"]
+    assert len(gates) == len(fault_tree.gates)
+    ids = [x["gateid"] for x in gates]
+    assert len(set(ids)) == len(ids)
+
+
+def test_saphsolve_root_name():
+    """Tests the gate id of the top gate without the number in the name."""
+    fault_tree, output = get_output(src_generator.write_info_JSON_printer,
+                                    ["-b", "200"], root="root")
+    gates = output["saphiresolveinput"]["faulttreelist"][0]["gatelist"]
+    assert gates[0]["gateid"] == 0
+    assert fault_tree.top_gate.name == "root"
+
+
+def test_openpra_json():
+    """Tests that the OpenPRA JSON output is valid with CCF groups."""
+    fault_tree, output = get_output(
+        src_generator.write_info_OpenPRA_JSON_printer,
+        ["-b", "400", "-a", "3", "--num-ccf", "4", "--ccf-size", "3"])
+    assert fault_tree.ccf_groups
+    assert output
+
+
+def test_saphsolve_object(tmp_path):
+    """Tests the SAPHSOLVE JSON object with the CCF events."""
+    file_path = str(tmp_path / "ft.JSInp")
+    src_generator.fault_tree_generator([
+        "-b", "400", "-a", "3", "--num-ccf", "4", "--ccf-size", "3",
+        "--SAPHIRE_json_object", "-o", file_path
+    ])
+    assert os.listdir(str(tmp_path)) == ["ft.JSInp"]
+    with open(os.path.join(ROOT, "schema", "saphsolve",
+                           "input_schema.json")) as schema_file:
+        schema = json.load(schema_file)
+    with open(file_path) as out_file:
+        output = json.load(out_file)
+    jsonschema.validate(output, schema)
+    events = {x["id"]: x for x in output["saphiresolveinput"]["eventlist"]}
+    ccf_ids = [int(x) for x, y in events.items() if y["calctype"] == "R"]
+    assert len(ccf_ids) == 4
+    gates = output["saphiresolveinput"]["faulttreelist"][0]["gatelist"]
+    for gate in gates:
+        assert gate["numinputs"] == (len(gate["gateinput"]) +
+                                     len(gate["eventinput"]))
+        assert len(set(gate["eventinput"])) == len(gate["eventinput"])
+    for ccf_id in ccf_ids:
+        assert any(ccf_id in x["eventinput"] for x in gates)
@@ -0,0 +1,41 @@
+"""Tests for the streaming generation of fault trees."""
+
+from collections import Counter
+import io
+import os
+import random
+
+from lxml import etree
+
+from generator.fault_tree_generator import Factors
+from generator.streaming_generator import generate_fault_tree
+
+SCHEMA = os.path.join(os.path.dirname(__file__), os.pardir, "schema",
+                      "open-psa", "schema_2.0.d", "input.rng")
+
+
+def test_streamed_output():
+    """Tests that the streamed output is valid and complete."""
+    factors = Factors()
+    factors.set_min_max_prob(0.01, 0.1)
+    factors.set_common_event_factors(0.1, 0.2, 2, 2)
+    factors.set_num_factors(3, 2000, 10, 10)
+    factors.set_gate_weights([1, 1, 1, 0.1, 0.1])
+    factors.calculate()
+    stream = io.StringIO()
+    fault_tree = generate_fault_tree(
+        "TestingTree",
+        "root",
+        factors,
+        lambda *args: print(*args, file=stream, sep=''),
+        random.Random(123),
+        window_size=16)
+
+    doc = etree.fromstring(stream.getvalue())
+    assert etree.RelaxNG(etree.parse(SCHEMA)).validate(doc)
+    tags = Counter(x.tag for x in doc.find("define-fault-tree"))
+    assert tags["define-gate"] == len(fault_tree.gates)
+    assert tags["define-house-event"] == 10
+    assert tags["define-CCF-group"] == 10
+    num_members = sum(len(x.members) for x in fault_tree.ccf_groups)
+    assert tags["define-basic-event"] + num_members == 2000
@@ -0,0 +1,69 @@
+"""Tests for the event tree model assembly of the src scripts."""
+
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+# pylint: disable=wrong-import-position
+from event_tree import EventTree
+from XML_dumper import XMLDumper, indent_xml
+
+FAULT_TREE = ('<define-fault-tree name="FT1"><define-gate name="TOP">'
+              '<and><basic-event name="B1"/><basic-event name="B2"/></and>'
+              '</define-gate></define-fault-tree>')
+MODEL_DATA = ('<model-data><define-basic-event name="B1">'
+              '<float value="0.1"/></define-basic-event></model-data>')
+
+
+def get_dumper(label):
+    """Sets up the dumper of the event tree with one functional event."""
+    event_tree = EventTree("ET")
+    event_tree.functional_events_id = ["FE1"]
+    event_tree.functional_events_name = [label]
+    event_tree.sequences = ["S1", "S2"]
+    dumper = XMLDumper("INIT", "ET")
+    dumper.fault_tree_logic_list = [FAULT_TREE]
+    dumper.model_data_list = [MODEL_DATA]
+    return dumper, event_tree.to_xml()
+
+
+def test_indent_xml():
+    """Tests the indentation of tags without parsing."""
+    assert list(indent_xml(FAULT_TREE, "  ")) == [
+        '<define-fault-tree name="FT1">', '  <define-gate name="TOP">',
+        '    <and>', '      <basic-event name="B1"/>',
+        '      <basic-event name="B2"/>', '    </and>', '  </define-gate>',
+        '</define-fault-tree>'
+    ]
+    assert list(indent_xml('<a><b>text</b><c /></a>', "\t", 1)) == [
+        '\t<a>', '\t\t<b>text</b>', '\t\t<c/>', '\t</a>'
+    ]
+
+
+def test_stream_object_to_xml(tmp_path):
+    """Tests that the streamed model matches the pretty-printed one."""
+    dumper, event_tree = get_dumper("FE1")
+    dumper.dump_object_to_xml(event_tree, str(tmp_path / "dom.xml"))
+    expected = ET.canonicalize(from_file=str(tmp_path / "dom.xml"),
+                               strip_text=True)
+    file_path = str(tmp_path / "stream.xml")
+    for indent in (None, "\t"):
+        dumper.stream_object_to_xml(event_tree, file_path, indent=indent)
+        assert ET.canonicalize(from_file=file_path,
+                               strip_text=True) == expected
+    with open(str(tmp_path / "dom.xml")) as dom_file:
+        with open(file_path) as stream_file:  # but the XML declaration
+            assert (stream_file.read().splitlines()[1:] ==
+                    dom_file.read().splitlines()[1:])
+
+
+def test_special_characters(tmp_path):
+    """Tests that the labels are escaped once by both dump methods."""
+    dumper, event_tree = get_dumper("Pumps A & B <1>")
+    for dump in (dumper.dump_object_to_xml, dumper.stream_object_to_xml):
+        file_path = str(tmp_path / (dump.__name__ + ".xml"))
+        dump(event_tree, file_path)
+        assert (ET.parse(file_path).find(".//label").text ==
+                "Pumps A & B <1>")